@@ -1,9 +1,9 @@
 import streamlit as st
-import pandas as pd
 import subprocess
 import os
 import datetime
 import sqlite3
+import sys
 
 # --- Configuración de la App ---
 st.set_page_config(page_title="Cargador de Datos Académicos", layout="centered")
@@ -15,48 +15,24 @@ PROCESSED_DATA_DIR = os.path.join(BASE_DIR, 'data', 'procesados')
 DB_SCRIPTS_DIR = os.path.join(BASE_DIR, 'db_scripts')
 DB_PATH = os.path.join(BASE_DIR, 'data', 'base_de_datos', 'academica.db')
 
+sys.path.append(BASE_DIR)
+from utils.pipeline_carga import ejecutar_pipeline
+from utils.validacion import hay_errores
+from utils.conexion import checkpoint, conectar, consultar
+from utils.archivo import ruta_archivo
+from utils.versiones import leer_puntero, publicar_version
+
 # --- Rutas a Scripts ---
 # Cursadas
 CLEANER_CURSADAS_PATH = os.path.join(BASE_DIR, 'limpiadores', 'limpiador_inscripciones.py')
 IMPORTER_CURSADAS_PATH = os.path.join(DB_SCRIPTS_DIR, 'inscripciones_cursadas.py')
-# Carreras
-CLEANER_CARRERAS_PATH = os.path.join(BASE_DIR, 'limpiadores', 'limpiador_inscripciones_carreras.py')
-IMPORTER_CARRERAS_PATH = os.path.join(DB_SCRIPTS_DIR, 'importador_inscripciones_carreras.py')
-# Preinscripciones
-CLEANER_PREINSCR_PATH = os.path.join(BASE_DIR, 'limpiadores', 'limpiador_preinscriptos.py')
-IMPORTER_PREINSCR_PATH = os.path.join(DB_SCRIPTS_DIR, 'importador_preinscriptos.py')
 
 
 # --- Funciones de Utilidad ---
-def ejecutar_proceso(comando):
-    """Ejecuta un comando de subproceso y muestra la salida en Streamlit."""
-    st.write(f"Ejecutando: `{ ' '.join(comando)}`")
-    # Usar la python del venv para asegurar consistencia
-    comando[0] = os.path.join(BASE_DIR, '.venv', 'bin', 'python')
-    
-    process = subprocess.Popen(comando, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8')
-    
-    stdout_placeholder = st.empty()
-    stderr_placeholder = st.empty()
-    stdout_output = ""
-    stderr_output = ""
-
-    for line in iter(process.stdout.readline, ''):
-        stdout_output += line
-        stdout_placeholder.info(f"Salida del script:\n{stdout_output}")
-
-    for line in iter(process.stderr.readline, ''):
-        stderr_output += line
-        stderr_placeholder.error(f"Errores del script:\n{stderr_output}")
-        
-    process.wait() 
-    
-    if process.returncode == 0:
-        st.success("El script se ejecutó correctamente.")
-        return True, stdout_output
-    else:
-        st.error(f"El script finalizó con un error (código: {process.returncode}).")
-        return False, stderr_output
+def mostrar_log(etapa, texto):
+    """Muestra en Streamlit la salida de una etapa del pipeline de carga."""
+    if texto.strip():
+        st.info(f"Salida de la {etapa}:\n{texto}")
 
 def ejecutar_comando_shell(comando, cwd, check=True):
     """Ejecuta un comando de shell y muestra la salida en Streamlit.
@@ -97,14 +73,33 @@ def ejecutar_comando_shell(comando, cwd, check=True):
         st.error(error_details)
         return e
 
+def volcar_wal(db_path):
+    """Pasa todo el WAL al archivo principal de la base (checkpoint TRUNCATE).
+
+    Returns:
+        bool: True si el archivo principal quedó con todos los datos confirmados.
+    """
+    try:
+        conn = conectar(db_path)
+        try:
+            resultado = checkpoint(conn, 'TRUNCATE')
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        st.error(f"No se pudo hacer el checkpoint de '{db_path}': {e}")
+        return False
+    if resultado and (resultado[0] or resultado[2] < resultado[1]):
+        st.error(f"El checkpoint de '{db_path}' no pudo terminar porque otra conexión está usando la base "
+                 f"({resultado[2]} de {resultado[1]} páginas copiadas). Vuelve a intentarlo en unos minutos.")
+        return False
+    return True
+
 # --- Funciones de Resumen ---
 def mostrar_resumen(nombre_tabla, columna_grupo, titulo, nombre_col_grupo, nombre_col_total):
     st.subheader(titulo)
     try:
-        conn = sqlite3.connect(DB_PATH)
         query = f"SELECT {columna_grupo}, COUNT(*) as total FROM {nombre_tabla} GROUP BY {columna_grupo} ORDER BY {columna_grupo} DESC"
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = consultar(DB_PATH, query)
         
         if not df.empty:
             st.write(f"Total de registros por {columna_grupo} en la base de datos:")
@@ -150,25 +145,22 @@ archivo_subido = st.file_uploader(
 
 # --- Paso 4: Ejecutar Proceso ---
 st.header("Paso 4: Ejecutar Proceso")
+guardar_csv = st.checkbox("Guardar también el CSV procesado en `data/procesados/`", value=True)
 if st.button("Procesar y Cargar Datos"):
     if not all([tipo_importacion, info_paso_2, archivo_subido]):
         st.warning("Por favor, completa todos los pasos anteriores.")
     else:
         st.info("Iniciando el proceso de carga... No cierres esta ventana.")
         
-        # Determinar qué scripts y nombres de archivo usar
+        # Determinar qué pipeline y nombres de archivo usar
         if tipo_importacion == "Inscripciones a Carreras":
-            CLEANER_PATH = CLEANER_CARRERAS_PATH
-            IMPORTER_PATH = IMPORTER_CARRERAS_PATH
+            tipo_pipeline = 'carreras'
             temp_filename_base = "inscripciones_carreras_temp"
-            processed_filename_base = "inscripciones_carreras_procesado"
             resumen_func = lambda: mostrar_resumen('inscripciones_carreras', 'anio', 'Resumen de Inscripciones a Carreras', 'Año', 'Total Inscripciones')
         
         elif tipo_importacion == "Preinscripciones":
-            CLEANER_PATH = CLEANER_PREINSCR_PATH
-            IMPORTER_PATH = IMPORTER_PREINSCR_PATH
+            tipo_pipeline = 'preinscriptos'
             temp_filename_base = "preinscripciones_temp"
-            processed_filename_base = "preinscriptos_procesado"
             resumen_func = lambda: mostrar_resumen('preinscriptos', 'estado', 'Resumen de Preinscripciones por Estado', 'Estado', 'Total')
 
         # Lógica de ejecución común
@@ -179,30 +171,33 @@ if st.button("Procesar y Cargar Datos"):
             f.write(archivo_subido.getbuffer())
         st.success(f"Archivo temporal guardado en: `{temp_filepath}`")
 
-        st.subheader("Ejecutando script de limpieza...")
-        processed_filename = f"{processed_filename_base}_{info_paso_2}.csv"
-        processed_filepath = os.path.join(PROCESSED_DATA_DIR, processed_filename)
-
-        comando_limpieza = [
-            "python", CLEANER_PATH,
-            "--archivo-entrada", temp_filepath,
-            "--archivo-salida", processed_filepath,
-            "--anio", str(info_paso_2)
-        ]
-        limpieza_exitosa, _ = ejecutar_proceso(comando_limpieza)
-
-        if limpieza_exitosa:
-            st.subheader("Ejecutando script de importación a la base de datos...")
-            comando_importacion = ["python", IMPORTER_PATH, "--archivo-csv", processed_filepath]
-            importacion_exitosa, _ = ejecutar_proceso(comando_importacion)
-
-            if importacion_exitosa:
-                st.balloons()
-                st.success(f"¡Proceso de importación completado con éxito!")
-                # Mostrar el resumen correspondiente
-                resumen_func()
+        # La limpieza y la importación corren en este mismo proceso: el resultado del
+        # limpiador pasa en lotes al importador, sin releer el CSV procesado.
+        st.subheader("Limpiando e importando los datos...")
+        with st.spinner("Procesando..."):
+            resultado = ejecutar_pipeline(
+                tipo_pipeline, temp_filepath, info_paso_2, guardar_csv=guardar_csv, db_filepath=DB_PATH, log=mostrar_log
+            )
+        tiempos = ", ".join(f"{etapa}: {segundos}s" for etapa, segundos in resultado['segundos'].items())
+
+        reporte = resultado['validacion']
+        if reporte is not None and not reporte.empty:
+            st.subheader("Control de calidad")
+            st.dataframe(reporte, hide_index=True)
+
+        if resultado['ok']:
+            st.balloons()
+            st.success(f"¡Proceso de importación completado con éxito! {resultado['filas']} registros ({tiempos}).")
+            if resultado['csv']:
+                st.info(f"CSV procesado guardado en: `{resultado['csv']}`")
+            # Mostrar el resumen correspondiente
+            resumen_func()
+        elif reporte is not None and hay_errores(reporte):
+            st.error("Los datos no pasaron el control de calidad: no se importó ningún registro. Corrija los errores indicados y vuelva a intentarlo.")
+        elif 'importacion' in resultado['segundos']:
+            st.error("El proceso se detuvo debido a un error en la importación a la base de datos.")
         else:
-            st.error("El proceso se detuvo debido a un error en el script de limpieza.")
+            st.error("El proceso se detuvo debido a un error en la limpieza.")
 
         if os.path.exists(temp_filepath):
             os.remove(temp_filepath)
@@ -213,10 +208,41 @@ st.header("Paso 5: Finalizar Actualización")
 st.warning("Asegúrate de que todos los datos se hayan cargado correctamente antes de finalizar.")
 
 if st.button("Finalizar actualización"):
+    # Si hay años archivados, se reubican las filas cargadas (no hace nada sin archivo).
+    archivo_path = os.path.join(DB_SCRIPTS_DIR, 'archivar_anios.py')
+    archivo_process = ejecutar_comando_shell(f'"{sys.executable}" "{archivo_path}" --reaplicar --sin-vacuum --db "{DB_PATH}"', cwd=BASE_DIR)
+    if not isinstance(archivo_process, subprocess.CompletedProcess):
+        st.error("No se pudieron reubicar las filas de los años archivados; no se publica ni se guarda la base.")
+        st.stop()
+
+    # Integridad, estadísticas del planificador y VACUUM si quedaron muchas páginas libres.
+    st.subheader("Mantenimiento de la base de datos")
+    mantenimiento_path = os.path.join(DB_SCRIPTS_DIR, 'mantenimiento_base.py')
+    mantenimiento_process = ejecutar_comando_shell(f'"{sys.executable}" "{mantenimiento_path}" --db "{DB_PATH}"', cwd=BASE_DIR)
+    if not isinstance(mantenimiento_process, subprocess.CompletedProcess):
+        st.error("El mantenimiento de la base falló (ej: no pasó la verificación de integridad); no se publica ni se guarda la base.")
+        st.stop()
+
+    # Si el dashboard lee versiones publicadas, se publica una con los datos cargados.
+    if leer_puntero(DB_PATH):
+        st.subheader("Publicando la nueva versión de la base para el dashboard")
+        version = publicar_version(DB_PATH)
+        if version:
+            st.success(f"Versión {version} publicada.")
+        else:
+            st.error("La nueva versión no pasó la validación; el dashboard sigue con la anterior.")
+
     st.info("Iniciando el proceso para guardar los cambios en el repositorio...")
 
-    # Determinar la ruta relativa de la DB para el comando git
+    # Determinar la ruta relativa de la DB (y de su archivo de años cerrados) para el comando git
     db_relative_path = os.path.relpath(DB_PATH, BASE_DIR)
+    if os.path.exists(ruta_archivo(DB_PATH)):
+        db_relative_path += f" {os.path.relpath(ruta_archivo(DB_PATH), BASE_DIR)}"
+
+    # git solo guarda el archivo principal: lo que siga en el WAL no llegaría al repositorio.
+    rutas_db = [DB_PATH] + ([ruta_archivo(DB_PATH)] if os.path.exists(ruta_archivo(DB_PATH)) else [])
+    if not all(volcar_wal(ruta) for ruta in rutas_db):
+        st.stop()
 
     # --- 1. Git Add ---
     st.subheader("Paso 5.1: Agregando la base de datos al área de preparación (git add)")
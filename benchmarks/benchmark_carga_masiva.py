@@ -0,0 +1,137 @@
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.intercambio import leer_procesado
+from utils.lotes import iterar_lotes, insertar_lotes, carga_masiva
+
+PROCESADOS_DIR = os.path.join(BASE_DIR, 'data', 'procesados')
+
+# Tablas a medir, con el mismo esquema e INSERT que sus importadores. 'documento' es la
+# columna de la llave que se modifica al escalar, para que las copias no se pisen.
+TABLAS = {
+    'estudiantes': {
+        'archivos': 'Grado_pregrado_procesado.csv',
+        'dataset': 'estudiantes',
+        'documento': 'tipo_y_n_documento',
+        'crear': """CREATE TABLE estudiantes (
+            apellido_y_nombre TEXT, tipo_y_n_documento TEXT, fecha_de_nacimiento TEXT, email TEXT,
+            telefono TEXT, legajo TEXT, plan TEXT, ano_ingreso INTEGER, fecha_ingreso TEXT,
+            ultimo_examen TEXT, ultima_reinscripcion TEXT, prom_con_aplazos REAL, prom_sin_aplazos REAL,
+            actividades_aprobadas INTEGER, total_actividades INTEGER, estado_inscripcion TEXT, carrera TEXT,
+            PRIMARY KEY (tipo_y_n_documento, carrera))""",
+        'insertar': 'INSERT OR REPLACE',
+    },
+    'inscripciones_cursadas': {
+        'archivos': 'inscripciones_procesado_*.csv',
+        'dataset': 'inscripciones_cursadas',
+        'columnas': ['alumno', 'identificacion', 'comision', 'estado_insc', 'fecha_inscripcion', 'carrera', 'periodo'],
+        'documento': 'identificacion',
+        'crear': """CREATE TABLE inscripciones_cursadas (
+            alumno TEXT, identificacion TEXT, comision TEXT, estado_insc TEXT, fecha_inscripcion DATE,
+            carrera TEXT, periodo TEXT, PRIMARY KEY (identificacion, comision, carrera, periodo))""",
+        'insertar': 'INSERT OR REPLACE',
+    },
+    'egresados': {
+        'archivos': 'Egresados_todos.csv',
+        'dataset': None,
+        'columnas': ['apellido_y_nombres', 'documento', 'legajo', 'fecha_inscripcion', 'fecha_ingreso',
+                     'fecha_egreso', 'certificado', 'propuesta', 'plan'],
+        'documento': 'documento',
+        'crear': """CREATE TABLE egresados (
+            apellido_y_nombres TEXT, documento TEXT, legajo TEXT, fecha_inscripcion DATE, fecha_ingreso DATE,
+            fecha_egreso DATE, certificado TEXT, propuesta TEXT, plan TEXT,
+            PRIMARY KEY (documento, propuesta, plan))""",
+        'insertar': 'INSERT OR IGNORE',
+    },
+}
+
+
+def leer_tabla(config):
+    """Lee y concatena los CSV procesados de la tabla, con los nombres de columna de la base."""
+    archivos = sorted(glob.glob(os.path.join(PROCESADOS_DIR, config['archivos'])))
+    if not archivos:
+        return None
+    if config['dataset']:
+        df = pd.concat([leer_procesado(a, config['dataset']) for a in archivos], ignore_index=True)
+    else:
+        df = pd.concat([pd.read_csv(a, encoding='utf-8') for a in archivos], ignore_index=True)
+    if 'columnas' in config:
+        df.columns = config['columnas']
+    return df
+
+
+def escalar(df, columna, escala):
+    """Repite los datos `escala` veces cambiando el documento de cada copia."""
+    copias = [df]
+    for i in range(1, escala):
+        copia = df.copy()
+        copia[columna] = copia[columna].astype(str) + f'-{i}'
+        copias.append(copia)
+    return pd.concat(copias, ignore_index=True)
+
+
+def cargar_anterior(conn, tabla, sql, df):
+    """Lo que hacían los importadores: la lista completa de registros y un solo executemany."""
+    registros = list(df.itertuples(index=False, name=None))
+    conn.execute("BEGIN TRANSACTION")
+    conn.cursor().executemany(sql, registros)
+    conn.commit()
+
+
+def cargar_masiva(conn, tabla, sql, df):
+    """La rutina compartida: lotes, índices diferidos y una sola transacción."""
+    with carga_masiva(conn, tabla) as cursor:
+        insertar_lotes(cursor, sql, iterar_lotes(df, como_texto=False))
+
+
+VARIANTES = {'anterior': cargar_anterior, 'carga_masiva': cargar_masiva}
+
+
+def medir(tabla, config, df, variante, indice):
+    """Carga `df` en una base nueva y devuelve los segundos de la carga."""
+    with tempfile.TemporaryDirectory() as directorio:
+        conn = sqlite3.connect(os.path.join(directorio, 'benchmark.db'))
+        try:
+            conn.execute(config['crear'])
+            if indice:
+                conn.execute(f"CREATE INDEX idx_benchmark ON {tabla} ({config['documento']})")
+            columnas = ', '.join(f'"{c}"' for c in df.columns)
+            sql = f"{config['insertar']} INTO {tabla} ({columnas}) VALUES ({', '.join(['?'] * len(df.columns))})"
+            inicio = time.perf_counter()
+            VARIANTES[variante](conn, tabla, sql, df)
+            return time.perf_counter() - inicio
+        finally:
+            conn.close()
+
+
+def correr_benchmark(escalas, indice):
+    print(f"{'Tabla':<24} {'Escala':>6} {'Variante':<14} {'Filas':>9} {'Segundos':>9} {'Filas/s':>10}")
+    for tabla, config in TABLAS.items():
+        base = leer_tabla(config)
+        if base is None:
+            print(f"{tabla:<24} sin archivos procesados ({config['archivos']}); se omite.")
+            continue
+        for escala in escalas:
+            df = escalar(base, config['documento'], escala)
+            for variante in VARIANTES:
+                segundos = medir(tabla, config, df, variante, indice)
+                print(f"{tabla:<24} {escala:>5}x {variante:<14} {len(df):>9} {segundos:>9.3f} {len(df) / segundos:>10.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mide la velocidad de carga (filas por segundo) de los importadores.')
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10], help='Veces que se repiten los datos.')
+    parser.add_argument('--indice', action='store_true', help='Crea un índice secundario sobre el documento antes de cargar.')
+    args = parser.parse_args()
+
+    correr_benchmark(args.escalas, args.indice)
@@ -0,0 +1,82 @@
+import argparse
+import glob
+import os
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.fechas import normalizar_fechas, detectar_formato
+
+PROCESADOS_DIR = os.path.join(BASE_DIR, 'data', 'procesados')
+COLUMNA = 'Fecha inscripción'
+
+
+def _inferencia(serie):
+    """Lo que hacían los importadores: pandas infiere el formato a partir de la primera fila."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return pd.to_datetime(serie, errors='coerce').dt.strftime('%Y-%m-%d')
+
+
+def _formato_explicito(serie):
+    """Formato explícito, pero parseando y formateando cada fila."""
+    return pd.to_datetime(serie, format=detectar_formato(serie), errors='coerce').dt.strftime('%Y-%m-%d')
+
+
+VARIANTES = {
+    'inferencia': _inferencia,
+    'formato_explicito': _formato_explicito,
+    'normalizar_fechas': normalizar_fechas,
+}
+
+
+def medir(funcion, serie, repeticiones=3):
+    """Devuelve el resultado y el mejor tiempo de `repeticiones` ejecuciones."""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(serie)
+        segundos = time.perf_counter() - inicio
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return resultado, mejor
+
+
+def correr_benchmark(patron, escala):
+    """Compara las variantes sobre la columna de fecha de cada CSV de cursadas."""
+    archivos = sorted(glob.glob(patron))
+    if not archivos:
+        print(f"Error: No se encontraron archivos con el patrón: {patron}")
+        return
+
+    print(f"{'Archivo':<40} {'Variante':<18} {'Filas':>8} {'Únicos':>7} {'Segundos':>9} {'Distintas':>10}")
+    totales = {v: 0.0 for v in VARIANTES}
+    for archivo in archivos:
+        serie = pd.read_csv(archivo, encoding='utf-8', usecols=[COLUMNA])[COLUMNA]
+        if escala > 1:
+            serie = pd.concat([serie] * escala, ignore_index=True)
+        # Referencia: cada fila parseada con el formato de la columna. 'Distintas' cuenta
+        # las filas en las que la variante obtiene otra fecha (o ninguna).
+        referencia = _formato_explicito(serie).fillna('')
+        for variante, funcion in VARIANTES.items():
+            resultado, segundos = medir(funcion, serie)
+            totales[variante] += segundos
+            distintas = int((resultado.fillna('') != referencia).sum())
+            print(f"{os.path.basename(archivo):<40} {variante:<18} {len(serie):>8} {serie.nunique():>7} {segundos:>9.4f} {distintas:>10}")
+
+    print("\nTiempo total por variante:")
+    for variante, segundos in totales.items():
+        print(f"  {variante:<18} {segundos:.3f}s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compara el parseo de fechas de las inscripciones a cursadas.')
+    parser.add_argument('--patron', default=os.path.join(PROCESADOS_DIR, 'inscripciones_procesado_*.csv'), help='Patrón glob de los CSV de cursadas.')
+    parser.add_argument('--escala', type=int, default=1, help='Repite cada columna N veces para simular archivos más grandes.')
+    args = parser.parse_args()
+
+    correr_benchmark(args.patron, args.escala)
@@ -0,0 +1,77 @@
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.lector_excel import iterar_filas, motor_disponible
+
+CRUDOS_DIR = os.path.join(BASE_DIR, 'data', 'crudos')
+
+# Variantes a comparar: los motores de pandas y el iterador de filas en streaming.
+VARIANTES = ['openpyxl', 'openpyxl_streaming', 'calamine']
+
+
+def medir_lectura(filepath, variante):
+    """
+    Lee el archivo con la variante indicada y devuelve el tiempo de lectura, la
+    cantidad de filas y el pico de memoria residente (RSS) del proceso en MB.
+    Se ejecuta en un proceso aparte para que el pico de memoria sea el de esta
+    lectura y no el de lecturas anteriores.
+    """
+    import resource
+    import pandas as pd
+
+    inicio = time.perf_counter()
+    if variante == 'openpyxl_streaming':
+        filas = sum(1 for _ in iterar_filas(filepath))
+    else:
+        filas = len(pd.read_excel(filepath, header=None, engine=variante))
+    segundos = time.perf_counter() - inicio
+
+    # En Linux ru_maxrss está en KB.
+    pico_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {'filas': filas, 'segundos': round(segundos, 3), 'pico_rss_mb': round(pico_mb, 1)}
+
+
+def correr_benchmark(patron):
+    """Mide cada variante disponible sobre cada archivo y muestra una tabla comparativa."""
+    archivos = sorted(glob.glob(patron, recursive=True))
+    if not archivos:
+        print(f"Error: No se encontraron archivos con el patrón: {patron}")
+        return
+
+    variantes = [v for v in VARIANTES if motor_disponible(v.replace('_streaming', ''))]
+    print(f"Comparando {variantes} sobre {len(archivos)} archivos...\n")
+    print(f"{'Archivo':<45} {'Variante':<20} {'Filas':>7} {'Segundos':>9} {'Pico RSS (MB)':>14}")
+
+    for archivo in archivos:
+        nombre = os.path.relpath(archivo, CRUDOS_DIR)
+        for variante in variantes:
+            proceso = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--medir', archivo, '--variante', variante],
+                capture_output=True, text=True, encoding='utf-8'
+            )
+            if proceso.returncode != 0:
+                print(f"{nombre:<45} {variante:<20} Error: {proceso.stderr.strip().splitlines()[-1]}")
+                continue
+            r = json.loads(proceso.stdout)
+            print(f"{nombre:<45} {variante:<20} {r['filas']:>7} {r['segundos']:>9.3f} {r['pico_rss_mb']:>14.1f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compara tiempo y memoria de los motores de lectura de Excel.')
+    parser.add_argument('--patron', default=os.path.join(CRUDOS_DIR, '**', '*.xlsx'), help='Patrón glob de los archivos a medir.')
+    parser.add_argument('--medir', help=argparse.SUPPRESS)
+    parser.add_argument('--variante', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        print(json.dumps(medir_lectura(args.medir, args.variante)))
+    else:
+        correr_benchmark(args.patron)
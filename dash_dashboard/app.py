@@ -1,3 +1,6 @@
+import os
+import sys
+
 import dash
 
 # Usamos un "stylesheet" externo para que la app tenga un estilo base
@@ -10,4 +13,17 @@ external_stylesheets = ['https://codepen.io/chriddyp/pen/bWLwgP.css']
 app = dash.Dash(__name__, suppress_callback_exceptions=True, external_stylesheets=external_stylesheets)
 
 # Esta línea es necesaria para el despliegue en servidores.
-server = app.server
\ No newline at end of file
+server = app.server
+
+
+# Antes de cada pedido, el worker se fija si se publicó otra versión de la base
+# (utils/versiones.py); las conexiones del pedido se abren sobre la que esté vigente.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.versiones import actualizar_version
+
+DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'base_de_datos', 'academica.db')
+
+
+@server.before_request
+def usar_version_publicada():
+    actualizar_version(DB_PATH)
@@ -1,6 +1,6 @@
 import pandas as pd
 import os
-import sqlite3
+import sys
 
 # --- Path a la Carpeta de Datos (Método Robusto) ---
 # 1. Obtenemos la ruta absoluta del directorio donde está ESTE archivo (loader.py).
@@ -12,6 +12,38 @@ project_root = os.path.dirname(app_dir)
 # 4. Construimos la ruta a la carpeta _output desde la raíz del proyecto.
 DATA_PATH = os.path.join(project_root, "_output")
 
+sys.path.append(project_root)
+
+# Las consultas a la BD usan conexiones en modo WAL con busy timeout y reintentos, así
+# que una importación en curso no las bloquea ni las hace fallar con "database is locked".
+# Si hay una versión publicada de la base (utils/versiones.py), se lee esa en lugar de
+# academica.db; app.py relee el puntero antes de cada pedido. Las consultas que leen
+# años viejos lo indican con `desde` y, si esos años están archivados
+# (utils/archivo.py), se adjunta el archivo; las demás leen solo la base caliente.
+from utils.archivo import adjuntar_archivo, TODOS_LOS_ANIOS
+from utils.conexion import consultar, conectar, TIMEOUT_LECTURA
+from utils.versiones import base_de_lectura
+
+
+def conectar_lectura(db_path, desde=None):
+    """
+    Conexión para las consultas de las páginas: versión publicada, modo WAL y busy
+    timeout de lectura. Con `desde` (primer año que lee la consulta), adjunta el archivo
+    si hace falta.
+    """
+    ruta = base_de_lectura(db_path)
+    conn = conectar(ruta, TIMEOUT_LECTURA)
+    if desde is not None:
+        adjuntar_archivo(conn, ruta, desde)
+    return conn
+
+
+def consultar_lectura(db_path, query, params=None, desde=None):
+    """Como `consultar`, sobre la versión publicada de la base y con el archivo si la consulta lee años desde `desde`."""
+    ruta = base_de_lectura(db_path)
+    preparar = (lambda conn: adjuntar_archivo(conn, ruta, desde)) if desde is not None else None
+    return consultar(ruta, query, params, preparar=preparar)
+
 
 # --- Configuración de Sub-carpetas de Datos ---
 SUB_PATHS = {
@@ -24,7 +56,21 @@ SUB_PATHS = {
 # --- Carga de Datos ---
 
 def cargar_evolucion_egresados():
-    """Carga el archivo CSV con el detalle de egresados por año, carrera y plan."""
+    """
+    Carga los egresados de grado por año académico, carrera y plan. Se agrupa la tabla
+    egresados por las columnas que se calculan al importarla; si la base todavía no las
+    tiene, se usa el CSV exportado.
+    """
+    db_path = os.path.join(project_root, 'data', 'base_de_datos', 'academica.db')
+    query_path = os.path.join(project_root, 'data', 'base_de_datos', 'consultas', 'egresados.sql')
+    try:
+        with open(query_path, encoding='utf-8') as f:
+            df = consultar_lectura(db_path, f.read(), desde=TODOS_LOS_ANIOS)
+        print(f"-> Evolución de egresados cargada desde la base de datos.")
+        return df
+    except Exception as e:
+        print(f"Advertencia: No se pudo consultar la evolución de egresados ({e}); se usa el CSV.")
+
     try:
         folder = SUB_PATHS["egresados"]
         file_path = os.path.join(DATA_PATH, folder, 'Egresados_anio_egreso_carrera.csv')
@@ -199,9 +245,7 @@ def cargar_inscriptos_grado_por_dia():
         ORDER BY ic.anio, dia_mes;
     """
     try:
-        conn = sqlite3.connect(db_path)
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = consultar_lectura(db_path, query)
         print("-> Datos de inscriptos diarios por grado cargados desde la BD.")
         return df
     except Exception as e:
@@ -226,9 +270,7 @@ def cargar_inscripciones_por_anio_carrera():
         ORDER BY ic.anio, carrera_nombre;
     """
     try:
-        conn = sqlite3.connect(db_path)
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = consultar_lectura(db_path, query)
         print("-> Datos de inscripciones por año y carrera cargados desde la BD.")
         return df
     except Exception as e:
@@ -255,9 +297,7 @@ def cargar_documentacion_por_dia():
         ORDER BY fecha, estado_agrupado;
     """
     try:
-        conn = sqlite3.connect(db_path)
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = consultar_lectura(db_path, query)
         
         # Pivotear la tabla para tener los estados como columnas
         df_pivot = df.pivot_table(index='fecha', columns='estado_agrupado', values='cantidad', fill_value=0).reset_index()
@@ -298,9 +338,7 @@ def cargar_inscriptos_grado_y_pregrado_por_dia():
         ORDER BY ic.anio, dia_mes;
     """
     try:
-        conn = sqlite3.connect(db_path)
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = consultar_lectura(db_path, query)
         print("-> Datos de inscriptos diarios de grado y pregrado cargados desde la BD.")
         return df
     except Exception as e:
@@ -325,9 +363,7 @@ def cargar_egresados_por_tipo(tipo):
         GROUP BY e.propuesta, p.nombre
     """
     try:
-        conn = sqlite3.connect(db_path)
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = consultar_lectura(db_path, query, desde=TODOS_LOS_ANIOS)
         print(f"-> Datos de egresados de {tipo} cargados correctamente.")
         return df
     except Exception as e:
@@ -350,9 +386,7 @@ def cargar_total_egresados_por_tipo():
         GROUP BY c.tipo
     """
     try:
-        conn = sqlite3.connect(db_path)
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = consultar_lectura(db_path, query, desde=TODOS_LOS_ANIOS)
         # Convertir el dataframe a un diccionario con el formato {'tipo': cantidad}
         kpis = {f"Total Egresados {row['tipo']}": row['cantidad'] for _, row in df.iterrows()}
         print(f"-> KPIs de total de egresados por tipo cargados: {kpis}")
@@ -383,11 +417,7 @@ def cargar_estudiantes_activos():
 
             
 
-        conn = sqlite3.connect(db_path)
-
-        df = pd.read_sql_query(query, conn)
-
-        conn.close()
+        df = consultar_lectura(db_path, query, desde=TODOS_LOS_ANIOS)
 
         print("-> Datos de estudiantes activos por año y tipo cargados desde la BD.")
 
@@ -423,11 +453,7 @@ def cargar_origen_preinscripcion():
 
             
 
-        conn = sqlite3.connect(db_path)
-
-        df = pd.read_sql_query(query, conn)
-
-        conn.close()
+        df = consultar_lectura(db_path, query)
 
         print("-> Datos de origen de preinscripción cargados desde la BD.")
 
@@ -464,9 +490,7 @@ def cargar_nuevos_inscriptos_primer_ingreso(anio=2026):
             GROUP BY primera_carrera
     """
     try:
-        conn = sqlite3.connect(db_path)
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = consultar_lectura(db_path, query, desde=anio)
         print(f"-> Datos de nuevos inscriptos (primer ingreso) para el año {anio} cargados.")
         return df
     except Exception as e:
@@ -496,9 +520,7 @@ def cargar_nuevos_inscriptos_por_carrera(anio=2026):
             GROUP BY SUBSTR(e.carrera, 2, 9)
     """
     try:
-        conn = sqlite3.connect(db_path)
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = consultar_lectura(db_path, query, desde=anio)
         df['carrera'] = df['carrera'].replace('CP-CCCP-P', 'CP-CCCP-PC')
         print(f"-> Datos de nuevos inscriptos por carrera para el año {anio} cargados.")
         return df
@@ -529,9 +551,7 @@ def cargar_nuevos_inscriptos_historico(anio_inicio=2022):
             GROUP BY SUBSTR(e.carrera, 2, 9), e.ano_ingreso
     """
     try:
-        conn = sqlite3.connect(db_path)
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = consultar_lectura(db_path, query, desde=anio_inicio)
         df['carrera'] = df['carrera'].replace('CP-CCCP-P', 'CP-CCCP-PC')
         print(f"-> Histórico de nuevos inscriptos desde {anio_inicio} cargado.")
         return df
@@ -319,6 +319,7 @@ def crear_grafico_inscripciones_por_anio_carrera(df):
     fig.update_layout(
         height=GRAPH_HEIGHT,
         plot_bgcolor='white',
+        xaxis_type='category', # Un año por barra, aunque 'anio' sea numérico
         yaxis_range=[0, df_totales['cantidad'].max() * 1.15] # Ajustar el rango del eje Y
     )
     return fig
@@ -128,15 +128,17 @@ def toggle_sidebar(n, data):
 # --- Callback de Navegación ---
 @app.callback(Output('page-content', 'children'), [Input('url', 'pathname')])
 def display_page(pathname):
+    # Las páginas con datos arman su layout en cada visita, así que muestran la versión
+    # de la base vigente para este pedido (ver app.py) sin reiniciar el servidor.
     if pathname == '/egresados':
-        return egresados.layout
+        return egresados.layout()
     elif pathname == '/estudiantes-activos':
-        return estudiantes_activos.layout
+        return estudiantes_activos.layout()
     elif pathname == '/analisis-cohorte':
-        return analisis_cohorte.layout
+        return analisis_cohorte.layout()
     else:
         # Por defecto, al entrar a la app ('/') o a '/inscripciones-carreras', se muestra esta página
-        return inscripciones_carreras.layout
+        return inscripciones_carreras.layout()
 
 
 # --- Punto de Entrada para Ejecutar la App ---
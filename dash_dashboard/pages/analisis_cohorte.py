@@ -1,7 +1,6 @@
 import dash
 from dash import dcc, html, Input, Output, State, ctx, MATCH
 import dash_bootstrap_components as dbc
-import sqlite3
 import pandas as pd
 import plotly.express as px
 import os
@@ -9,6 +8,7 @@ import json
 
 # Importamos la instancia de la app
 from ..app import app
+from ..data.loader import conectar_lectura
 
 # --- Registro de la Página ---
 dash.register_page(__name__, path='/analisis-cohorte', name='Análisis por Cohorte')
@@ -16,22 +16,20 @@ dash.register_page(__name__, path='/analisis-cohorte', name='Análisis por Cohor
 # --- Base de datos y helpers ---
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'base_de_datos', 'academica.db')
 
+# Primera cohorte del selector. Las consultas de una cohorte pasan `desde` a
+# conectar_lectura: las cohortes archivadas (utils/archivo.py) se leen con el archivo.
+PRIMERA_COHORTE = 2006
+
 def get_cohortes():
     """Obtiene los años de cohorte disponibles desde la tabla de aspirantes."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH, desde=PRIMERA_COHORTE)
     try:
-        # Usamos DISTINCT para obtener años únicos y filtramos desde 2006
-        query = "SELECT DISTINCT ano_ingreso FROM aspirantes WHERE ano_ingreso >= 2006 ORDER BY ano_ingreso DESC"
+        # Usamos DISTINCT para obtener años únicos y filtramos desde PRIMERA_COHORTE
+        query = f"SELECT DISTINCT ano_ingreso FROM aspirantes WHERE ano_ingreso >= {PRIMERA_COHORTE} ORDER BY ano_ingreso DESC"
         df = pd.read_sql_query(query, conn)
-        raw_cohortes = df['ano_ingreso'].tolist()
-        cohortes = []
-        for c in raw_cohortes:
-            if isinstance(c, bytes):
-                # Los años parecen estar almacenados como bytes, los decodificamos a enteros.
-                # Asumimos codificación little-endian.
-                cohortes.append(int.from_bytes(c, 'little'))
-            else:
-                cohortes.append(c)
+        # ano_ingreso es INTEGER (las bases con años guardados como bytes se convierten
+        # con db_scripts/migrar_tipos.py).
+        cohortes = [int(c) for c in df['ano_ingreso']]
     except Exception as e:
         print(f"Error al obtener cohortes: {e}")
         cohortes = []
@@ -41,7 +39,7 @@ def get_cohortes():
 
 # --- Funciones para KPIs ---
 def get_total_aspirantes_grado(cohorte):
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH, desde=cohorte)
     try:
         query = f"""SELECT COUNT(DISTINCT tipo_y_n_documento) 
                      FROM aspirantes 
@@ -57,7 +55,7 @@ def get_total_aspirantes_grado(cohorte):
     return total
 
 def get_total_aspirantes_pregrado(cohorte):
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH, desde=cohorte)
     try:
         query = f"""SELECT COUNT(DISTINCT tipo_y_n_documento) 
                      FROM aspirantes 
@@ -73,7 +71,7 @@ def get_total_aspirantes_pregrado(cohorte):
     return total
 
 def get_aprobaron_cpu_grado(cohorte):
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH, desde=cohorte)
     try:
         # Parte 1: Aspirantes que aprobaron el CPU directamente
         query_pasaron_directo = f"""SELECT DISTINCT tipo_y_n_documento 
@@ -124,7 +122,7 @@ def get_tasa_aprobacion_cpu_grado(cohorte):
 # --- Funciones para Gráficos ---
 def create_graph_aspirantes_carrera(cohorte):
     """Crea el gráfico de aspirantes a carrera."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH, desde=cohorte)
     try:
         query = f"""
             SELECT actividades_aprobadas
@@ -173,7 +171,7 @@ def create_graph_aspirantes_carrera(cohorte):
 
 def create_graph_contexto_anual(cohorte):
     """Crea el gráfico de contexto anual."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH, desde=cohorte - 2)
     try:
         years_to_query = [cohorte - 2, cohorte - 1, cohorte, cohorte + 1, cohorte + 2]
         if 2025 not in years_to_query:
@@ -215,7 +213,7 @@ def create_graph_contexto_anual(cohorte):
 
 def create_graph_estudiantes_grado(cohorte):
     """Crea el gráfico de estudiantes de grado."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH, desde=cohorte)
     try:
         query = f"""
             SELECT e.carrera, COUNT(DISTINCT e.tipo_y_n_documento) AS total_ingresantes
@@ -250,7 +248,7 @@ def create_graph_estudiantes_grado(cohorte):
 
 def create_graph_porcentaje_avance(cohorte):
     """Crea el gráfico de porcentaje de avance."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH, desde=cohorte)
     try:
         query = f"""
             SELECT 
@@ -319,63 +317,67 @@ def create_kpi_card(title, value, card_id):
         ], className="kpi-content"),
     ], className="three columns kpi-card-container")
 
-layout = html.Div([
-    html.H1("Análisis por Cohorte"),
+def layout():
+    """Arma la página en cada visita, con las cohortes de la versión vigente de la base."""
+    cohortes = get_cohortes()
+
+    return html.Div([
+        html.H1("Análisis por Cohorte"),
     
-    # Selector de Cohorte
-    html.Div([
-        html.Label("Seleccionar Cohorte (Año de Ingreso):"),
-        dcc.Dropdown(
-            id='dropdown-cohorte',
-            options=[{'label': str(anio), 'value': anio} for anio in get_cohortes()],
-            value=get_cohortes()[0] if get_cohortes() else None, # Selecciona el último año por defecto
-            clearable=False
-        ),
-    ], className="row", style={'marginBottom': '20px'}),
-
-    # Fila de KPIs
-    html.Div(id='kpi-row-cohorte', className="row"),
-
-    html.Hr(),
-
-    # Fila de Gráficos
-    html.Div(className="row", children=[
-        html.Div([
-            dcc.Graph(id='graph-cohorte-1'),
-            dbc.Button("Ampliar", id='btn-modal-cohorte-1', className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Aspirantes a carrera")),
-                dbc.ModalBody(dcc.Graph(id='modal-graph-1', style={'height': '80vh'}))
-            ], id='modal-cohorte-1', size="xl", is_open=False)
-        ], className="six columns position-relative"),
-        html.Div([
-            dcc.Graph(id='graph-cohorte-2'),
-            dbc.Button("Ampliar", id='btn-modal-cohorte-2', className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Contexto anual")),
-                dbc.ModalBody(dcc.Graph(id='modal-graph-2', style={'height': '80vh'}))
-            ], id='modal-cohorte-2', size="xl", is_open=False)
-        ], className="six columns position-relative"),
-    ]),
-    html.Div(className="row", children=[
-        html.Div([
-            dcc.Graph(id='graph-cohorte-3'),
-            dbc.Button("Ampliar", id='btn-modal-cohorte-3', className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Estudiantes de grado")),
-                dbc.ModalBody(dcc.Graph(id='modal-graph-3', style={'height': '80vh'}))
-            ], id='modal-cohorte-3', size="xl", is_open=False)
-        ], className="six columns position-relative"),
+        # Selector de Cohorte
         html.Div([
-            dcc.Graph(id='graph-cohorte-4'),
-            dbc.Button("Ampliar", id='btn-modal-cohorte-4', className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Porcentaje de avance")),
-                dbc.ModalBody(dcc.Graph(id='modal-graph-4', style={'height': '80vh'}))
-            ], id='modal-cohorte-4', size="xl", is_open=False)
-        ], className="six columns position-relative"),
-    ]),
-])
+            html.Label("Seleccionar Cohorte (Año de Ingreso):"),
+            dcc.Dropdown(
+                id='dropdown-cohorte',
+                options=[{'label': str(anio), 'value': anio} for anio in cohortes],
+                value=cohortes[0] if cohortes else None, # Selecciona el último año por defecto
+                clearable=False
+            ),
+        ], className="row", style={'marginBottom': '20px'}),
+
+        # Fila de KPIs
+        html.Div(id='kpi-row-cohorte', className="row"),
+
+        html.Hr(),
+
+        # Fila de Gráficos
+        html.Div(className="row", children=[
+            html.Div([
+                dcc.Graph(id='graph-cohorte-1'),
+                dbc.Button("Ampliar", id='btn-modal-cohorte-1', className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Aspirantes a carrera")),
+                    dbc.ModalBody(dcc.Graph(id='modal-graph-1', style={'height': '80vh'}))
+                ], id='modal-cohorte-1', size="xl", is_open=False)
+            ], className="six columns position-relative"),
+            html.Div([
+                dcc.Graph(id='graph-cohorte-2'),
+                dbc.Button("Ampliar", id='btn-modal-cohorte-2', className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Contexto anual")),
+                    dbc.ModalBody(dcc.Graph(id='modal-graph-2', style={'height': '80vh'}))
+                ], id='modal-cohorte-2', size="xl", is_open=False)
+            ], className="six columns position-relative"),
+        ]),
+        html.Div(className="row", children=[
+            html.Div([
+                dcc.Graph(id='graph-cohorte-3'),
+                dbc.Button("Ampliar", id='btn-modal-cohorte-3', className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Estudiantes de grado")),
+                    dbc.ModalBody(dcc.Graph(id='modal-graph-3', style={'height': '80vh'}))
+                ], id='modal-cohorte-3', size="xl", is_open=False)
+            ], className="six columns position-relative"),
+            html.Div([
+                dcc.Graph(id='graph-cohorte-4'),
+                dbc.Button("Ampliar", id='btn-modal-cohorte-4', className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Porcentaje de avance")),
+                    dbc.ModalBody(dcc.Graph(id='modal-graph-4', style={'height': '80vh'}))
+                ], id='modal-cohorte-4', size="xl", is_open=False)
+            ], className="six columns position-relative"),
+        ]),
+    ])
 
 # --- Callbacks ---
 @app.callback(
@@ -21,18 +21,6 @@ from ..graph_factory.factory import (
     crear_grafico_egresados_por_tipo
 )
 
-# --- Carga de datos para la página ---
-df_egresados = cargar_datos_egresados()
-df_egresados_tasa = cargar_egresados_tasa()
-kpis_egr = cargar_kpis_egresados()
-# Cargar y fusionar los nuevos KPIs
-nuevos_kpis = cargar_total_egresados_por_tipo()
-kpis_egr.update(nuevos_kpis)
-
-# Eliminar el KPI no deseado
-if 'Total de graduados (Grado)' in kpis_egr:
-    del kpis_egr['Total de graduados (Grado)']
-
 # Definir el orden deseado de los KPIs
 kpi_order = [
     'Total Egresados Grado',
@@ -44,12 +32,19 @@ kpi_order = [
     'Variación interanual (2023 - 2024)'
 ]
 
-# Filtrar y ordenar los nombres de los KPIs
-kpi_names_egr = [kpi for kpi in kpi_order if kpi in kpis_egr]
+# --- Carga de datos para la página ---
+def cargar_kpis_pagina():
+    """Devuelve los KPIs de la página y sus nombres, en el orden de kpi_order."""
+    kpis_egr = cargar_kpis_egresados()
+    # Cargar y fusionar los nuevos KPIs
+    kpis_egr.update(cargar_total_egresados_por_tipo())
 
-df_evolucion_egresados = cargar_evolucion_egresados()
-df_egresados_grado = cargar_egresados_por_tipo('Grado')
-df_egresados_posgrado = cargar_egresados_por_tipo('Posgrado')
+    # Eliminar el KPI no deseado
+    if 'Total de graduados (Grado)' in kpis_egr:
+        del kpis_egr['Total de graduados (Grado)']
+
+    # Filtrar y ordenar los nombres de los KPIs
+    return kpis_egr, [kpi for kpi in kpi_order if kpi in kpis_egr]
 
 # --- Función de ayuda para crear tarjetas KPI ---
 def create_kpi_card(card_index, initial_kpi_name, initial_kpi_value):
@@ -65,86 +60,96 @@ def create_kpi_card(card_index, initial_kpi_name, initial_kpi_value):
 
 
 # --- Layout de la Página ---
-initial_indices = [(i % len(kpi_names_egr)) for i in range(4)] if kpi_names_egr else [0,0,0,0]
-
-layout = html.Div([
-    html.H1("Egresados"),
-
-    # Fila de KPIs con 4 tarjetas
-    html.Div(id='kpi-row-egr', className="row", children=[
-        create_kpi_card(i, 
-                        kpi_names_egr[initial_indices[i]],
-                        kpis_egr.get(kpi_names_egr[initial_indices[i]], 0))
-        for i in range(4)
-    ]),
-    
-    html.Hr(),
+def layout():
+    """Arma la página en cada visita, con los datos de la versión vigente de la base."""
+    kpis_egr, kpi_names_egr = cargar_kpis_pagina()
+    df_egresados = cargar_datos_egresados()
+    df_egresados_tasa = cargar_egresados_tasa()
+    df_evolucion_egresados = cargar_evolucion_egresados()
+    df_egresados_grado = cargar_egresados_por_tipo('Grado')
+    df_egresados_posgrado = cargar_egresados_por_tipo('Posgrado')
 
-    # Filas de gráficos
-    html.Div([
-        # Gráfico 1
-        html.Div([
-            dcc.Graph(id={'type': 'graph-egr', 'index': 'evolucion'}, figure=crear_grafico_evolucion_egresados(df_evolucion_egresados)),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-egr', 'index': 'evolucion'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Evolución de Egresados")),
-                dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-egr', 'index': 'evolucion'}, figure=crear_grafico_evolucion_egresados(df_evolucion_egresados), style={'height': '80vh'}))
-            ], id={'type': 'modal-egr', 'index': 'evolucion'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-        # Gráfico 2
-        html.Div([
-            dcc.Graph(id={'type': 'graph-egr', 'index': 'egresados-grado'}, figure=crear_grafico_egresados_por_tipo(df_egresados_grado, 'Grado')),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-egr', 'index': 'egresados-grado'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Egresados de Grado")),
-                dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-egr', 'index': 'egresados-grado'}, figure=crear_grafico_egresados_por_tipo(df_egresados_grado, 'Grado'), style={'height': '80vh'}))
-            ], id={'type': 'modal-egr', 'index': 'egresados-grado'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-    ], className="row"),
-    html.Div([
-        # Gráfico 3
-        html.Div([
-            dcc.Graph(id={'type': 'graph-egr', 'index': 'tasa-graduacion'}, figure=crear_grafico_tasa_graduacion(df_egresados_tasa)),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-egr', 'index': 'tasa-graduacion'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Tasa de Graduación")),
-                dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-egr', 'index': 'tasa-graduacion'}, figure=crear_grafico_tasa_graduacion(df_egresados_tasa), style={'height': '80vh'}))
-            ], id={'type': 'modal-egr', 'index': 'tasa-graduacion'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-        # Gráfico 4
+    initial_indices = [(i % len(kpi_names_egr)) for i in range(4)] if kpi_names_egr else [0,0,0,0]
+
+    return html.Div([
+        html.H1("Egresados"),
+
+        # Fila de KPIs con 4 tarjetas
+        html.Div(id='kpi-row-egr', className="row", children=[
+            create_kpi_card(i, 
+                            kpi_names_egr[initial_indices[i]],
+                            kpis_egr.get(kpi_names_egr[initial_indices[i]], 0))
+            for i in range(4)
+        ]),
+
+        html.Hr(),
+
+        # Filas de gráficos
         html.Div([
-            dcc.Graph(id={'type': 'graph-egr', 'index': 'duracion-carrera'}, figure=crear_grafico_duracion_carrera(df_egresados)),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-egr', 'index': 'duracion-carrera'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Duración de Carrera")),
-                dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-egr', 'index': 'duracion-carrera'}, figure=crear_grafico_duracion_carrera(df_egresados), style={'height': '80vh'}))
-            ], id={'type': 'modal-egr', 'index': 'duracion-carrera'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-    ], className="row"),
-    html.Div([
-        # Gráfico 5
+            # Gráfico 1
+            html.Div([
+                dcc.Graph(id={'type': 'graph-egr', 'index': 'evolucion'}, figure=crear_grafico_evolucion_egresados(df_evolucion_egresados)),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-egr', 'index': 'evolucion'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Evolución de Egresados")),
+                    dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-egr', 'index': 'evolucion'}, figure=crear_grafico_evolucion_egresados(df_evolucion_egresados), style={'height': '80vh'}))
+                ], id={'type': 'modal-egr', 'index': 'evolucion'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+            # Gráfico 2
+            html.Div([
+                dcc.Graph(id={'type': 'graph-egr', 'index': 'egresados-grado'}, figure=crear_grafico_egresados_por_tipo(df_egresados_grado, 'Grado')),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-egr', 'index': 'egresados-grado'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Egresados de Grado")),
+                    dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-egr', 'index': 'egresados-grado'}, figure=crear_grafico_egresados_por_tipo(df_egresados_grado, 'Grado'), style={'height': '80vh'}))
+                ], id={'type': 'modal-egr', 'index': 'egresados-grado'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+        ], className="row"),
         html.Div([
-            dcc.Graph(id={'type': 'graph-egr', 'index': 'egresados-posgrado'}, figure=crear_grafico_egresados_por_tipo(df_egresados_posgrado, 'Posgrado')),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-egr', 'index': 'egresados-posgrado'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Egresados de Posgrado")),
-                dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-egr', 'index': 'egresados-posgrado'}, figure=crear_grafico_egresados_por_tipo(df_egresados_posgrado, 'Posgrado'), style={'height': '80vh'}))
-            ], id={'type': 'modal-egr', 'index': 'egresados-posgrado'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-        # Gráfico 6
+            # Gráfico 3
+            html.Div([
+                dcc.Graph(id={'type': 'graph-egr', 'index': 'tasa-graduacion'}, figure=crear_grafico_tasa_graduacion(df_egresados_tasa)),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-egr', 'index': 'tasa-graduacion'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Tasa de Graduación")),
+                    dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-egr', 'index': 'tasa-graduacion'}, figure=crear_grafico_tasa_graduacion(df_egresados_tasa), style={'height': '80vh'}))
+                ], id={'type': 'modal-egr', 'index': 'tasa-graduacion'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+            # Gráfico 4
+            html.Div([
+                dcc.Graph(id={'type': 'graph-egr', 'index': 'duracion-carrera'}, figure=crear_grafico_duracion_carrera(df_egresados)),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-egr', 'index': 'duracion-carrera'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Duración de Carrera")),
+                    dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-egr', 'index': 'duracion-carrera'}, figure=crear_grafico_duracion_carrera(df_egresados), style={'height': '80vh'}))
+                ], id={'type': 'modal-egr', 'index': 'duracion-carrera'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+        ], className="row"),
         html.Div([
-            dcc.Graph(id={'type': 'graph-egr', 'index': 'graduados-plan'}, figure=crear_grafico_cantidad_graduados_por_plan(df_egresados_tasa)),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-egr', 'index': 'graduados-plan'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Cantidad de Graduados por Plan")),
-                dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-egr', 'index': 'graduados-plan'}, figure=crear_grafico_cantidad_graduados_por_plan(df_egresados_tasa), style={'height': '80vh'}))
-            ], id={'type': 'modal-egr', 'index': 'graduados-plan'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-    ], className="row"),
-
-    # Almacenamiento invisible para los índices de todos los KPIs
-    dcc.Store(id='kpi-indices-egr', data=initial_indices)
-])
+            # Gráfico 5
+            html.Div([
+                dcc.Graph(id={'type': 'graph-egr', 'index': 'egresados-posgrado'}, figure=crear_grafico_egresados_por_tipo(df_egresados_posgrado, 'Posgrado')),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-egr', 'index': 'egresados-posgrado'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Egresados de Posgrado")),
+                    dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-egr', 'index': 'egresados-posgrado'}, figure=crear_grafico_egresados_por_tipo(df_egresados_posgrado, 'Posgrado'), style={'height': '80vh'}))
+                ], id={'type': 'modal-egr', 'index': 'egresados-posgrado'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+            # Gráfico 6
+            html.Div([
+                dcc.Graph(id={'type': 'graph-egr', 'index': 'graduados-plan'}, figure=crear_grafico_cantidad_graduados_por_plan(df_egresados_tasa)),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-egr', 'index': 'graduados-plan'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Cantidad de Graduados por Plan")),
+                    dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-egr', 'index': 'graduados-plan'}, figure=crear_grafico_cantidad_graduados_por_plan(df_egresados_tasa), style={'height': '80vh'}))
+                ], id={'type': 'modal-egr', 'index': 'graduados-plan'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+        ], className="row"),
+
+        # Almacenamiento invisible para los índices de todos los KPIs y sus valores
+        dcc.Store(id='kpi-indices-egr', data=initial_indices),
+        dcc.Store(id='kpi-datos-egr', data={'nombres': kpi_names_egr, 'valores': kpis_egr})
+    ])
 
 # --- Callbacks ---
 
@@ -153,10 +158,12 @@ layout = html.Div([
     [Output(f'kpi-value-{i+1}-egr', 'children') for i in range(4)] +
     [Output('kpi-indices-egr', 'data')],
     [Input({'type': 'kpi-change-btn-egr', 'index': i}, 'n_clicks') for i in range(4)],
-    [State('kpi-indices-egr', 'data')],
+    [State('kpi-indices-egr', 'data'),
+     State('kpi-datos-egr', 'data')],
     prevent_initial_call=True
 )
-def update_all_kpis_egr(n0, n1, n2, n3, current_indices):
+def update_all_kpis_egr(n0, n1, n2, n3, current_indices, datos):
+    kpi_names_egr, kpis_egr = datos['nombres'], datos['valores']
     if not kpi_names_egr:
         return [dash.no_update] * 9
 
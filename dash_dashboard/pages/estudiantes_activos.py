@@ -20,14 +20,6 @@ from ..graph_factory.factory import (
     crear_grafico_vacio
 )
 
-# --- Carga de datos para la página ---
-df_estudiantes_activos = cargar_estudiantes_activos()
-df_todas = cargar_evolucion_todas()
-df_grado = cargar_evolucion_grado()
-df_cpu_mat = cargar_cpu_materias()
-kpis_insc = cargar_kpis_inscripciones()
-kpi_names_insc = sorted(list(kpis_insc.keys())) if kpis_insc else []
-
 # --- Función de ayuda para crear tarjetas KPI ---
 def create_kpi_card(card_index, initial_kpi_name, initial_kpi_value):
     """Crea la estructura de una tarjeta KPI con un botón de rotación."""
@@ -42,56 +34,64 @@ def create_kpi_card(card_index, initial_kpi_name, initial_kpi_value):
 
 
 # --- Layout de la Página ---
-initial_indices = [(i % len(kpi_names_insc)) for i in range(4)] if kpi_names_insc else [0,0,0,0]
+def layout():
+    """
+    Arma la página en cada visita. Los KPIs se leen acá; los gráficos, en sus callbacks
+    (también en cada visita), siempre de la versión vigente de la base.
+    """
+    kpis_insc = cargar_kpis_inscripciones()
+    kpi_names_insc = sorted(list(kpis_insc.keys())) if kpis_insc else []
+    initial_indices = [(i % len(kpi_names_insc)) for i in range(4)] if kpi_names_insc else [0,0,0,0]
 
-layout = html.Div([
-    html.H1("Estudiantes Activos"),
-    html.Div(id='kpi-row-insc', className="row", children=[
-        create_kpi_card(i, 
-                        kpi_names_insc[initial_indices[i]],
-                        f"{kpis_insc.get(kpi_names_insc[initial_indices[i]], 0):,}".replace(',', '.'))
-        for i in range(4)
-    ]),
-    html.Div([
-        html.Div([
-            dcc.Graph(id='grafico-estudiantes-activos'),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-materias', 'index': 'estudiantes-activos'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Evolución de Estudiantes Activos")),
-                dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-materias', 'index': 'estudiantes-activos'}, style={'height': '80vh'}))
-            ], id={'type': 'modal-materias', 'index': 'estudiantes-activos'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-        html.Div([
-            html.Label("Filtrar evolución por:"),
-            dcc.RadioItems(id='filtro-evolucion-insc', options=[{'label': 'Todas', 'value': 'Todas'}, {'label': 'Grado', 'value': 'Grado'}], value='Todas', labelStyle={'display': 'inline-block', 'marginRight': '10px'}),
-            dcc.Graph(id='grafico-evolucion-temporal'),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-materias', 'index': 'evolucion-temporal'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Evolución Temporal")),
-                dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-materias', 'index': 'evolucion-temporal'}, style={'height': '80vh'}))
-            ], id={'type': 'modal-materias', 'index': 'evolucion-temporal'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-    ], className="row"),
-    html.Div([
+    return html.Div([
+        html.H1("Estudiantes Activos"),
+        html.Div(id='kpi-row-insc', className="row", children=[
+            create_kpi_card(i, 
+                            kpi_names_insc[initial_indices[i]],
+                            f"{kpis_insc.get(kpi_names_insc[initial_indices[i]], 0):,}".replace(',', '.'))
+            for i in range(4)
+        ]),
         html.Div([
-            dcc.Graph(id='grafico-insc-cuatri'),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-materias', 'index': 'insc-cuatri'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Inscripciones por Cuatrimestre")),
-                dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-materias', 'index': 'insc-cuatri'}, style={'height': '80vh'}))
-            ], id={'type': 'modal-materias', 'index': 'insc-cuatri'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
+            html.Div([
+                dcc.Graph(id='grafico-estudiantes-activos'),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-materias', 'index': 'estudiantes-activos'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Evolución de Estudiantes Activos")),
+                    dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-materias', 'index': 'estudiantes-activos'}, style={'height': '80vh'}))
+                ], id={'type': 'modal-materias', 'index': 'estudiantes-activos'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+            html.Div([
+                html.Label("Filtrar evolución por:"),
+                dcc.RadioItems(id='filtro-evolucion-insc', options=[{'label': 'Todas', 'value': 'Todas'}, {'label': 'Grado', 'value': 'Grado'}], value='Todas', labelStyle={'display': 'inline-block', 'marginRight': '10px'}),
+                dcc.Graph(id='grafico-evolucion-temporal'),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-materias', 'index': 'evolucion-temporal'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Evolución Temporal")),
+                    dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-materias', 'index': 'evolucion-temporal'}, style={'height': '80vh'}))
+                ], id={'type': 'modal-materias', 'index': 'evolucion-temporal'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+        ], className="row"),
         html.Div([
-            dcc.Graph(id='grafico-cpu'),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-materias', 'index': 'cpu'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Materias CPU")),
-                dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-materias', 'index': 'cpu'}, style={'height': '80vh'}))
-            ], id={'type': 'modal-materias', 'index': 'cpu'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-    ], className="row"),
-    dcc.Store(id='kpi-indices-insc', data=initial_indices)
-])
+            html.Div([
+                dcc.Graph(id='grafico-insc-cuatri'),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-materias', 'index': 'insc-cuatri'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Inscripciones por Cuatrimestre")),
+                    dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-materias', 'index': 'insc-cuatri'}, style={'height': '80vh'}))
+                ], id={'type': 'modal-materias', 'index': 'insc-cuatri'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+            html.Div([
+                dcc.Graph(id='grafico-cpu'),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-materias', 'index': 'cpu'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Materias CPU")),
+                    dbc.ModalBody(dcc.Graph(id={'type': 'modal-graph-materias', 'index': 'cpu'}, style={'height': '80vh'}))
+                ], id={'type': 'modal-materias', 'index': 'cpu'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+        ], className="row"),
+        dcc.Store(id='kpi-indices-insc', data=initial_indices),
+        dcc.Store(id='kpi-datos-insc', data={'nombres': kpi_names_insc, 'valores': kpis_insc})
+    ])
 
 # --- Callbacks ---
 
@@ -100,10 +100,12 @@ layout = html.Div([
     [Output(f'kpi-value-{i+1}-insc', 'children') for i in range(4)] +
     [Output('kpi-indices-insc', 'data')],
     [Input({'type': 'kpi-change-btn', 'index': i}, 'n_clicks') for i in range(4)],
-    [State('kpi-indices-insc', 'data')],
+    [State('kpi-indices-insc', 'data'),
+     State('kpi-datos-insc', 'data')],
     prevent_initial_call=True
 )
-def update_all_kpis(n0, n1, n2, n3, current_indices):
+def update_all_kpis(n0, n1, n2, n3, current_indices, datos):
+    kpi_names_insc, kpis_insc = datos['nombres'], datos['valores']
     if not kpi_names_insc:
         return [dash.no_update] * 9
 
@@ -140,7 +142,7 @@ def update_all_kpis(n0, n1, n2, n3, current_indices):
 )
 def update_grafico_estudiantes_activos(pathname):
     if pathname == '/estudiantes-activos':
-        figure = crear_grafico_estudiantes_activos(df_estudiantes_activos)
+        figure = crear_grafico_estudiantes_activos(cargar_estudiantes_activos())
         return figure, figure
     return crear_grafico_vacio(), crear_grafico_vacio()
 
@@ -150,7 +152,7 @@ def update_grafico_estudiantes_activos(pathname):
     [Input('filtro-evolucion-insc', 'value')]
 )
 def update_grafico_evolucion(filtro_tipo):
-    df = df_grado if filtro_tipo == 'Grado' else df_todas
+    df = cargar_evolucion_grado() if filtro_tipo == 'Grado' else cargar_evolucion_todas()
     figure = crear_grafico_evolucion_temporal(df, filtro_tipo)
     return figure, figure
 
@@ -161,7 +163,7 @@ def update_grafico_evolucion(filtro_tipo):
 )
 def update_grafico_insc_cuatri(pathname):
     if pathname == '/estudiantes-activos':
-        figure = crear_grafico_inscripciones_cuatrimestre(df_todas)
+        figure = crear_grafico_inscripciones_cuatrimestre(cargar_evolucion_todas())
         return figure, figure
     return crear_grafico_vacio(), crear_grafico_vacio()
 
@@ -172,7 +174,7 @@ def update_grafico_insc_cuatri(pathname):
 )
 def update_grafico_cpu(pathname):
     if pathname == '/estudiantes-activos':
-        figure = crear_grafico_cpu_materias(df_cpu_mat)
+        figure = crear_grafico_cpu_materias(cargar_cpu_materias())
         return figure, figure
     return crear_grafico_vacio(), crear_grafico_vacio()
 
@@ -15,6 +15,7 @@ from ..data.loader import (
     cargar_inscripciones_por_anio_carrera,
     cargar_documentacion_por_dia,
     cargar_inscriptos_grado_y_pregrado_por_dia, # Add this
+    conectar_lectura,
 )
 from ..graph_factory.factory import (
     crear_grafico_inscriptos_grado_por_dia,
@@ -39,9 +40,9 @@ DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '
 # --- Funciones para KPIs ---
 def get_total_fichas_guarani():
     """Obtiene el total de personas distintas en preinscriptos para 2026."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH)
     try:
-        query = "SELECT COUNT(DISTINCT identificacion) FROM preinscriptos WHERE anio = '2026'"
+        query = "SELECT COUNT(DISTINCT identificacion) FROM preinscriptos WHERE anio = 2026"
         total = pd.read_sql_query(query, conn).iloc[0, 0]
     except (IndexError, sqlite3.OperationalError) as e:
         print(f"Error al calcular KPI 'Total Fichas Guaraní': {e}")
@@ -52,13 +53,13 @@ def get_total_fichas_guarani():
 
 def get_total_inscripciones_grado():
     """Obtiene el total de inscriptos a carreras de grado desde inscripciones_carreras para 2026."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH)
     try:
         query = """
             SELECT COUNT(insc.n_documento)
             FROM inscripciones_carreras insc
             JOIN propuestas prop ON insc.carrera = prop.codigo
-            WHERE prop.tipo = 'Grado' AND insc.anio = '2026'
+            WHERE prop.tipo = 'Grado' AND insc.anio = 2026
         """
         total = pd.read_sql_query(query, conn).iloc[0, 0]
     except (IndexError, sqlite3.OperationalError) as e:
@@ -70,10 +71,10 @@ def get_total_inscripciones_grado():
 
 def get_tasa_de_procesamiento():
     """Calcula la tasa de procesamiento de preinscripciones para 2026."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH)
     try:
-        query_procesadas = "SELECT COUNT(*) FROM preinscriptos WHERE estado = 'Procesada' AND anio = '2026'"
-        query_listas = "SELECT COUNT(*) FROM preinscriptos WHERE estado = 'Listas para procesar' AND anio = '2026'"
+        query_procesadas = "SELECT COUNT(*) FROM preinscriptos WHERE estado = 'Procesada' AND anio = 2026"
+        query_listas = "SELECT COUNT(*) FROM preinscriptos WHERE estado = 'Listas para procesar' AND anio = 2026"
         procesadas = pd.read_sql_query(query_procesadas, conn).iloc[0, 0]
         listas = pd.read_sql_query(query_listas, conn).iloc[0, 0]
         if (procesadas + listas) == 0:
@@ -92,13 +93,13 @@ def get_tasa_de_procesamiento():
 
 def get_total_inscripciones_pregrado():
     """Obtiene el total de inscriptos a carreras de pregrado desde inscripciones_carreras para 2026."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH)
     try:
         query = """
             SELECT COUNT(insc.n_documento)
             FROM inscripciones_carreras insc
             JOIN propuestas prop ON insc.carrera = prop.codigo
-            WHERE prop.tipo = 'Pregrado' AND insc.anio = '2026'
+            WHERE prop.tipo = 'Pregrado' AND insc.anio = 2026
         """
         total = pd.read_sql_query(query, conn).iloc[0, 0]
     except (IndexError, sqlite3.OperationalError) as e:
@@ -110,13 +111,13 @@ def get_total_inscripciones_pregrado():
 
 def get_total_inscripciones_grado_pregrado():
     """Obtiene el total de inscriptos a carreras de grado y pregrado desde inscripciones_carreras para 2026."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH)
     try:
         query = """
             SELECT COUNT(insc.n_documento)
             FROM inscripciones_carreras insc
             JOIN propuestas prop ON insc.carrera = prop.codigo
-            WHERE (prop.tipo = 'Grado' OR prop.tipo = 'Pregrado') AND insc.anio = '2026'
+            WHERE (prop.tipo = 'Grado' OR prop.tipo = 'Pregrado') AND insc.anio = 2026
         """
         total = pd.read_sql_query(query, conn).iloc[0, 0]
     except (IndexError, sqlite3.OperationalError) as e:
@@ -128,7 +129,7 @@ def get_total_inscripciones_grado_pregrado():
 
 def get_total_documentacion_recibida():
     """Obtiene el total de filas en la tabla docu_inscripciones."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH)
     try:
         query = "SELECT COUNT(*) FROM docu_inscripciones"
         total = pd.read_sql_query(query, conn).iloc[0, 0]
@@ -141,7 +142,7 @@ def get_total_documentacion_recibida():
 
 def get_tasa_aprobacion_documentacion():
     """Calcula la tasa de aprobación de la documentación."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH)
     try:
         # Usamos un solo query para eficiencia
         query = "SELECT estado_documentacin, COUNT(*) as count FROM docu_inscripciones WHERE estado_documentacin IN ('Aprobada', 'Rechazada', 'Duplicado') GROUP BY estado_documentacin"
@@ -198,7 +199,7 @@ def create_kpi_card(card_index, initial_kpi_name, initial_kpi_value):
 # --- Funciones para crear gráficos dinámicos ---
 def grafico_distribucion_estado():
     """Crea un gráfico de barras mostrando la distribución de preinscriptos por estado."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH)
     query = "SELECT estado, COUNT(*) as cantidad FROM preinscriptos GROUP BY estado ORDER BY cantidad DESC"
     df = pd.read_sql_query(query, conn)
     conn.close()
@@ -211,7 +212,7 @@ def grafico_distribucion_estado():
 
 def grafico_inscriptos_grado_2026():
     """Crea un gráfico de barras con la cantidad de inscriptos por carrera de grado en 2026."""
-    conn = sqlite3.connect(DB_PATH)
+    conn = conectar_lectura(DB_PATH)
     query = """
         SELECT
             prop.codigo,
@@ -222,7 +223,7 @@ def grafico_inscriptos_grado_2026():
         JOIN
             propuestas prop ON insc.carrera = prop.codigo
         WHERE
-            insc.anio = '2026' AND prop.tipo = 'Grado'
+            insc.anio = 2026 AND prop.tipo = 'Grado'
         GROUP BY
             prop.codigo, prop.nombre
         HAVING
@@ -311,128 +312,128 @@ def grafico_nuevos_inscriptos_historico(df):
     fig.update_layout(title_x=0.5)
     return fig
 
-# --- Carga de Datos para gráficos no dinámicos ---
-df_inscriptos_grado_dia = cargar_inscriptos_grado_por_dia()
-df_insc_anio_carrera = cargar_inscripciones_por_anio_carrera()
-df_docu_por_dia = cargar_documentacion_por_dia()
-df_inscriptos_grado_y_pregrado_por_dia = cargar_inscriptos_grado_y_pregrado_por_dia()
-df_origen_preinscripcion = cargar_origen_preinscripcion()
-df_nuevos_inscriptos_primer_ingreso = cargar_nuevos_inscriptos_primer_ingreso()
-df_nuevos_inscriptos_por_carrera = cargar_nuevos_inscriptos_por_carrera()
-df_nuevos_inscriptos_historico = cargar_nuevos_inscriptos_historico()
-
+# --- Layout de la Página ---
+def layout():
+    """Arma la página con los datos de la versión vigente de la base."""
+    df_inscriptos_grado_dia = cargar_inscriptos_grado_por_dia()
+    df_insc_anio_carrera = cargar_inscripciones_por_anio_carrera()
+    df_docu_por_dia = cargar_documentacion_por_dia()
+    df_inscriptos_grado_y_pregrado_por_dia = cargar_inscriptos_grado_y_pregrado_por_dia()
+    df_origen_preinscripcion = cargar_origen_preinscripcion()
+    df_nuevos_inscriptos_primer_ingreso = cargar_nuevos_inscriptos_primer_ingreso()
+    df_nuevos_inscriptos_por_carrera = cargar_nuevos_inscriptos_por_carrera()
+    df_nuevos_inscriptos_historico = cargar_nuevos_inscriptos_historico()
 
-# --- Filtrado para el gráfico de evolución de inscriptos ---
-hoy = datetime.now()
-df_filtrado = df_inscriptos_grado_dia.copy()
+    # --- Filtrado para el gráfico de evolución de inscriptos ---
+    hoy = datetime.now()
+    df_filtrado = df_inscriptos_grado_dia.copy()
 
-# Si estamos en el año 2026, filtramos los datos de ese año para que solo muestren hasta el día actual.
-if hoy.year == 2026:
-    dia_mes_hoy = hoy.strftime('%m-%d')
-    # Excluimos las filas de 2026 cuya fecha es posterior a hoy
-    condicion_a_excluir = (df_filtrado['anio'] == 2026) & (df_filtrado['dia_mes'] > dia_mes_hoy)
-    df_filtrado = df_filtrado[~condicion_a_excluir]
+    # Si estamos en el año 2026, filtramos los datos de ese año para que solo muestren hasta el día actual.
+    if hoy.year == 2026:
+        dia_mes_hoy = hoy.strftime('%m-%d')
+        # Excluimos las filas de 2026 cuya fecha es posterior a hoy
+        condicion_a_excluir = (df_filtrado['anio'] == 2026) & (df_filtrado['dia_mes'] > dia_mes_hoy)
+        df_filtrado = df_filtrado[~condicion_a_excluir]
 
-# --- Layout de la Página ---
-layout = html.Div([
-    html.H1("Inscripciones a Carreras 2026"),
-    html.Div(id='kpi-row-carreras', className="row", children=[
-        create_kpi_card(i, kpi_names[i], kpi_definitions[kpi_names[i]]())
-        for i in range(4)
-    ]),
-    dcc.Store(id='kpi-indices-carreras', data=initial_indices),
-    html.Hr(),
-    html.Div(className="row", children=[
-        html.Div([
-            dcc.Graph(id={'type': 'graph-carreras', 'index': 'inscriptos-grado-dia'}, figure=crear_grafico_inscriptos_grado_por_dia(df_filtrado)),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'inscriptos-grado-dia'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Inscriptos de Grado por Día")),
-                dbc.ModalBody(dcc.Graph(figure=crear_grafico_inscriptos_grado_por_dia(df_filtrado), style={'height': '80vh'}))
-            ], id={'type': 'modal-carreras', 'index': 'inscriptos-grado-dia'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-        html.Div([
-            dcc.Graph(id={'type': 'graph-carreras', 'index': 'inscripciones-anio-carrera'}, figure=crear_grafico_inscripciones_por_anio_carrera(df_insc_anio_carrera)),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'inscripciones-anio-carrera'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Inscripciones por Año y Carrera")),
-                dbc.ModalBody(dcc.Graph(figure=crear_grafico_inscripciones_por_anio_carrera(df_insc_anio_carrera), style={'height': '80vh'}))
-            ], id={'type': 'modal-carreras', 'index': 'inscripciones-anio-carrera'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-    ]),
-    html.Div(className="row", children=[
-        html.Div([
-            dcc.Graph(id={'type': 'graph-carreras', 'index': 'distribucion-estado'}, figure=grafico_distribucion_estado()),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'distribucion-estado'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Distribución de Preinscriptos por Estado")),
-                dbc.ModalBody(dcc.Graph(figure=grafico_distribucion_estado(), style={'height': '80vh'}))
-            ], id={'type': 'modal-carreras', 'index': 'distribucion-estado'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-        html.Div([
-            dcc.Graph(id={'type': 'graph-carreras', 'index': 'inscriptos-grado-2026'}, figure=grafico_inscriptos_grado_2026()),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'inscriptos-grado-2026'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Inscriptos por Carrera de Grado (2026)")),
-                dbc.ModalBody(dcc.Graph(figure=grafico_inscriptos_grado_2026(), style={'height': '80vh'}))
-            ], id={'type': 'modal-carreras', 'index': 'inscriptos-grado-2026'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-    ]),
-    html.Div(className="row", children=[
-        html.Div([
-            dcc.Graph(id={'type': 'graph-carreras', 'index': 'documentacion-por-dia'}, figure=crear_grafico_documentacion_por_dia(df_docu_por_dia)),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'documentacion-por-dia'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Documentación Recibida por Día")),
-                dbc.ModalBody(dcc.Graph(figure=crear_grafico_documentacion_por_dia(df_docu_por_dia), style={'height': '80vh'}))
-            ], id={'type': 'modal-carreras', 'index': 'documentacion-por-dia'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-        html.Div([
-            dcc.Graph(id={'type': 'graph-carreras', 'index': 'inscriptos-grado-pregrado-dia'}, figure=crear_grafico_inscriptos_grado_y_pregrado_por_dia(df_inscriptos_grado_y_pregrado_por_dia)),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'inscriptos-grado-pregrado-dia'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Inscriptos Grado y Pregrado por Día")),
-                dbc.ModalBody(dcc.Graph(figure=crear_grafico_inscriptos_grado_y_pregrado_por_dia(df_inscriptos_grado_y_pregrado_por_dia), style={'height': '80vh'}))
-            ], id={'type': 'modal-carreras', 'index': 'inscriptos-grado-pregrado-dia'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-    ]),
-    html.Div(className="row", children=[
-        html.Div([
-            dcc.Graph(id={'type': 'graph-carreras', 'index': 'nuevos-inscriptos-primer-ingreso'}, figure=grafico_nuevos_inscriptos_primer_ingreso(df_nuevos_inscriptos_primer_ingreso)),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'nuevos-inscriptos-primer-ingreso'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Nuevos Inscriptos: Primer Ingreso")),
-                dbc.ModalBody(dcc.Graph(figure=grafico_nuevos_inscriptos_primer_ingreso(df_nuevos_inscriptos_primer_ingreso), style={'height': '80vh'}))
-            ], id={'type': 'modal-carreras', 'index': 'nuevos-inscriptos-primer-ingreso'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-        html.Div([
-            dcc.Graph(id={'type': 'graph-carreras', 'index': 'nuevos-inscriptos-por-carrera'}, figure=grafico_nuevos_inscriptos_por_carrera(df_nuevos_inscriptos_por_carrera)),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'nuevos-inscriptos-por-carrera'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Nuevos Inscriptos: Por Carrera")),
-                dbc.ModalBody(dcc.Graph(figure=grafico_nuevos_inscriptos_por_carrera(df_nuevos_inscriptos_por_carrera), style={'height': '80vh'}))
-            ], id={'type': 'modal-carreras', 'index': 'nuevos-inscriptos-por-carrera'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-    ]),
-    html.Div(className="row", children=[
-        html.Div([
-            dcc.Graph(id={'type': 'graph-carreras', 'index': 'origen-preinscripcion'}, figure=grafico_origen_preinscripcion(df_origen_preinscripcion)),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'origen-preinscripcion'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Origen de la Preinscripción")),
-                dbc.ModalBody(dcc.Graph(figure=grafico_origen_preinscripcion(df_origen_preinscripcion), style={'height': '80vh'}))
-            ], id={'type': 'modal-carreras', 'index': 'origen-preinscripcion'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-        html.Div([
-            dcc.Graph(id={'type': 'graph-carreras', 'index': 'nuevos-inscriptos-historico'}, figure=grafico_nuevos_inscriptos_historico(df_nuevos_inscriptos_historico)),
-            dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'nuevos-inscriptos-historico'}, className="btn-sm float-end"),
-            dbc.Modal([
-                dbc.ModalHeader(dbc.ModalTitle("Nuevos Inscriptos: Histórico")),
-                dbc.ModalBody(dcc.Graph(figure=grafico_nuevos_inscriptos_historico(df_nuevos_inscriptos_historico), style={'height': '80vh'}))
-            ], id={'type': 'modal-carreras', 'index': 'nuevos-inscriptos-historico'}, size="xl", is_open=False)
-        ], className="six columns position-relative"),
-    ]),
-])
+    return html.Div([
+        html.H1("Inscripciones a Carreras 2026"),
+        html.Div(id='kpi-row-carreras', className="row", children=[
+            create_kpi_card(i, kpi_names[i], kpi_definitions[kpi_names[i]]())
+            for i in range(4)
+        ]),
+        dcc.Store(id='kpi-indices-carreras', data=initial_indices),
+        html.Hr(),
+        html.Div(className="row", children=[
+            html.Div([
+                dcc.Graph(id={'type': 'graph-carreras', 'index': 'inscriptos-grado-dia'}, figure=crear_grafico_inscriptos_grado_por_dia(df_filtrado)),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'inscriptos-grado-dia'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Inscriptos de Grado por Día")),
+                    dbc.ModalBody(dcc.Graph(figure=crear_grafico_inscriptos_grado_por_dia(df_filtrado), style={'height': '80vh'}))
+                ], id={'type': 'modal-carreras', 'index': 'inscriptos-grado-dia'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+            html.Div([
+                dcc.Graph(id={'type': 'graph-carreras', 'index': 'inscripciones-anio-carrera'}, figure=crear_grafico_inscripciones_por_anio_carrera(df_insc_anio_carrera)),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'inscripciones-anio-carrera'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Inscripciones por Año y Carrera")),
+                    dbc.ModalBody(dcc.Graph(figure=crear_grafico_inscripciones_por_anio_carrera(df_insc_anio_carrera), style={'height': '80vh'}))
+                ], id={'type': 'modal-carreras', 'index': 'inscripciones-anio-carrera'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+        ]),
+        html.Div(className="row", children=[
+            html.Div([
+                dcc.Graph(id={'type': 'graph-carreras', 'index': 'distribucion-estado'}, figure=grafico_distribucion_estado()),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'distribucion-estado'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Distribución de Preinscriptos por Estado")),
+                    dbc.ModalBody(dcc.Graph(figure=grafico_distribucion_estado(), style={'height': '80vh'}))
+                ], id={'type': 'modal-carreras', 'index': 'distribucion-estado'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+            html.Div([
+                dcc.Graph(id={'type': 'graph-carreras', 'index': 'inscriptos-grado-2026'}, figure=grafico_inscriptos_grado_2026()),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'inscriptos-grado-2026'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Inscriptos por Carrera de Grado (2026)")),
+                    dbc.ModalBody(dcc.Graph(figure=grafico_inscriptos_grado_2026(), style={'height': '80vh'}))
+                ], id={'type': 'modal-carreras', 'index': 'inscriptos-grado-2026'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+        ]),
+        html.Div(className="row", children=[
+            html.Div([
+                dcc.Graph(id={'type': 'graph-carreras', 'index': 'documentacion-por-dia'}, figure=crear_grafico_documentacion_por_dia(df_docu_por_dia)),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'documentacion-por-dia'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Documentación Recibida por Día")),
+                    dbc.ModalBody(dcc.Graph(figure=crear_grafico_documentacion_por_dia(df_docu_por_dia), style={'height': '80vh'}))
+                ], id={'type': 'modal-carreras', 'index': 'documentacion-por-dia'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+            html.Div([
+                dcc.Graph(id={'type': 'graph-carreras', 'index': 'inscriptos-grado-pregrado-dia'}, figure=crear_grafico_inscriptos_grado_y_pregrado_por_dia(df_inscriptos_grado_y_pregrado_por_dia)),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'inscriptos-grado-pregrado-dia'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Inscriptos Grado y Pregrado por Día")),
+                    dbc.ModalBody(dcc.Graph(figure=crear_grafico_inscriptos_grado_y_pregrado_por_dia(df_inscriptos_grado_y_pregrado_por_dia), style={'height': '80vh'}))
+                ], id={'type': 'modal-carreras', 'index': 'inscriptos-grado-pregrado-dia'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+        ]),
+        html.Div(className="row", children=[
+            html.Div([
+                dcc.Graph(id={'type': 'graph-carreras', 'index': 'nuevos-inscriptos-primer-ingreso'}, figure=grafico_nuevos_inscriptos_primer_ingreso(df_nuevos_inscriptos_primer_ingreso)),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'nuevos-inscriptos-primer-ingreso'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Nuevos Inscriptos: Primer Ingreso")),
+                    dbc.ModalBody(dcc.Graph(figure=grafico_nuevos_inscriptos_primer_ingreso(df_nuevos_inscriptos_primer_ingreso), style={'height': '80vh'}))
+                ], id={'type': 'modal-carreras', 'index': 'nuevos-inscriptos-primer-ingreso'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+            html.Div([
+                dcc.Graph(id={'type': 'graph-carreras', 'index': 'nuevos-inscriptos-por-carrera'}, figure=grafico_nuevos_inscriptos_por_carrera(df_nuevos_inscriptos_por_carrera)),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'nuevos-inscriptos-por-carrera'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Nuevos Inscriptos: Por Carrera")),
+                    dbc.ModalBody(dcc.Graph(figure=grafico_nuevos_inscriptos_por_carrera(df_nuevos_inscriptos_por_carrera), style={'height': '80vh'}))
+                ], id={'type': 'modal-carreras', 'index': 'nuevos-inscriptos-por-carrera'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+        ]),
+        html.Div(className="row", children=[
+            html.Div([
+                dcc.Graph(id={'type': 'graph-carreras', 'index': 'origen-preinscripcion'}, figure=grafico_origen_preinscripcion(df_origen_preinscripcion)),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'origen-preinscripcion'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Origen de la Preinscripción")),
+                    dbc.ModalBody(dcc.Graph(figure=grafico_origen_preinscripcion(df_origen_preinscripcion), style={'height': '80vh'}))
+                ], id={'type': 'modal-carreras', 'index': 'origen-preinscripcion'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+            html.Div([
+                dcc.Graph(id={'type': 'graph-carreras', 'index': 'nuevos-inscriptos-historico'}, figure=grafico_nuevos_inscriptos_historico(df_nuevos_inscriptos_historico)),
+                dbc.Button("Ampliar", id={'type': 'btn-modal-carreras', 'index': 'nuevos-inscriptos-historico'}, className="btn-sm float-end"),
+                dbc.Modal([
+                    dbc.ModalHeader(dbc.ModalTitle("Nuevos Inscriptos: Histórico")),
+                    dbc.ModalBody(dcc.Graph(figure=grafico_nuevos_inscriptos_historico(df_nuevos_inscriptos_historico), style={'height': '80vh'}))
+                ], id={'type': 'modal-carreras', 'index': 'nuevos-inscriptos-historico'}, size="xl", is_open=False)
+            ], className="six columns position-relative"),
+        ]),
+    ])
 
 # --- Callbacks ---
 @app.callback(
@@ -0,0 +1,57 @@
+import argparse
+import os
+import sqlite3
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.archivo import ANIOS_CALIENTES, archivar, leer_cortes, ruta_archivo
+from utils.conexion import conectar
+
+# Mueve los años cerrados de inscripciones_cursadas, estudiantes, aspirantes y egresados
+# a academica_archivo.db (ver utils/archivo.py). Sin argumentos, en academica.db quedan
+# los últimos ANIOS_CALIENTES años académicos; con --corte, los años desde ese. Un corte
+# menor al actual devuelve filas del archivo a la base.
+#
+#     python db_scripts/archivar_anios.py
+#     python db_scripts/archivar_anios.py --corte 2018
+#     python db_scripts/archivar_anios.py --reaplicar    # después de una importación
+
+DB_FILEPATH = 'data/base_de_datos/academica.db'
+
+
+def corte_guardado(db_filepath):
+    """Corte del último archivo de la base, o None si nunca se archivó."""
+    conn = conectar(db_filepath)
+    try:
+        cortes = leer_cortes(conn)
+    except sqlite3.Error:
+        cortes = {}
+    finally:
+        conn.close()
+    return min(cortes.values()) if cortes else None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mueve los años académicos cerrados a la base de archivo.')
+    parser.add_argument('--db', default=DB_FILEPATH, help='Ruta a la base de datos SQLite.')
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument('--corte', type=int, help=f'Primer año que queda en la base (por defecto, los últimos {ANIOS_CALIENTES} años).')
+    grupo.add_argument('--reaplicar', action='store_true',
+                       help='Vuelve a aplicar el corte guardado (las filas importadas o las personas que volvieron a '
+                            'inscribirse); si la base no tiene años archivados, no hace nada.')
+    parser.add_argument('--sin-vacuum', action='store_true', help='No compacta las bases después de mover las filas.')
+    args = parser.parse_args()
+
+    corte = args.corte
+    if args.reaplicar:
+        if not os.path.exists(args.db) or not os.path.exists(ruta_archivo(args.db)):
+            print("-> La base no tiene años archivados; no hay nada que reaplicar.")
+            sys.exit(0)
+        corte = corte_guardado(args.db)
+        if corte is None:
+            print("-> La base no tiene años archivados; no hay nada que reaplicar.")
+            sys.exit(0)
+
+    if archivar(args.db, corte, vacuum=not args.sin_vacuum) is None:
+        sys.exit(1)
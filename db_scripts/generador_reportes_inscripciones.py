@@ -1,114 +1,200 @@
-import pandas as pd
-import sqlite3
+import argparse
 import os
-from datetime import datetime
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
-# --- Configuración ---
-# Para cambiar el año de los reportes, simplemente modifica el valor de la variable YEAR.
-# Por ejemplo, para generar reportes para el año 2026, cambia YEAR = 2025 a YEAR = 2026.
-YEAR = 2025
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.conexion import conectar, TIMEOUT_LECTURA
+
+# Reportes del dashboard de inscripciones a carreras. Cada año se calcula con dos
+# consultas agregadas (inscripciones por fecha, carrera, estado y tipo de carrera, y
+# preinscripciones por carrera y estado) y los cinco CSV salen de esos dos resultados.
+# Los años se procesan en paralelo, cada uno con su conexión de lectura, y se guardan en
+# OUTPUT_DIR/<año>/. La temporada publicada (YEAR, o --publicar) se copia además en
+# OUTPUT_DIR, que es lo que lee el dashboard; los demás años solo quedan en su carpeta.
+# Cada CSV se escribe en un temporal que se renombra al final, así que el dashboard
+# nunca lee un archivo a medio escribir.
+#
+#     python db_scripts/generador_reportes_inscripciones.py                       # YEAR, publicado
+#     python db_scripts/generador_reportes_inscripciones.py 2024 2025             # publica 2025
+#     python db_scripts/generador_reportes_inscripciones.py 2026 --publicar 2026  # cambia de temporada
 
 DB_PATH = 'data/base_de_datos/academica.db'
 OUTPUT_DIR = '_output/inscripciones_carreras'
 
-def generar_reportes_inscripciones(year):
-    """
-    Se conecta a la base de datos para generar los reportes CSV y KPIs
-    necesarios para el dashboard de inscripciones a carreras para un año específico.
-    """
-    print(f"Iniciando la generación de reportes de inscripciones a carreras para el año {year}...")
+# Temporada que muestra el dashboard. Para publicar otra, cambiar este valor (o usar
+# --publicar), por ejemplo YEAR = 2026 cuando empiece esa temporada.
+YEAR = 2025
 
-    if not os.path.exists(DB_PATH):
-        print(f"Error: No se encontró la base de datos en {DB_PATH}")
-        return
+# Estados de inscripción que cuentan como inscripto aceptado (el SIU los informa en
+# masculino; versiones anteriores de los reportes usaban 'Aceptada').
+ESTADOS_ACEPTADOS = ('Aceptado', 'Aceptada')
+
+QUERY_INSCRIPCIONES = """
+    SELECT i.fecha_insc, i.carrera, i.estado_insc, p.tipo, COUNT(*) AS cantidad
+    FROM inscripciones_carreras AS i
+    LEFT JOIN propuestas AS p ON i.carrera = p.codigo
+    WHERE i.anio = ?
+    GROUP BY i.fecha_insc, i.carrera, i.estado_insc, p.tipo
+"""
+
+QUERY_PREINSCRIPCIONES = """
+    SELECT carrera, estado, COUNT(*) AS cantidad
+    FROM preinscriptos
+    WHERE anio = ?
+    GROUP BY carrera, estado
+"""
+
+
+def anios_disponibles(db_path=DB_PATH):
+    """Años con inscripciones o preinscripciones en la base, de menor a mayor."""
+    conn = conectar(db_path, TIMEOUT_LECTURA)
+    try:
+        filas = conn.execute(
+            "SELECT anio FROM inscripciones_carreras UNION SELECT anio FROM preinscriptos").fetchall()
+    finally:
+        conn.close()
+    return sorted(anio for anio, in filas if anio is not None)
 
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    print(f"-> Directorio de salida asegurado: {OUTPUT_DIR}")
 
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        print(f"-> Conexión exitosa con la base de datos: {DB_PATH}")
-    except Exception as e:
-        print(f"Error al conectar con la base de datos: {e}")
-        return
+def _contar_por(df, columna):
+    """Suma 'cantidad' por `columna`, con los vacíos primero como en un GROUP BY de SQLite."""
+    conteo = df.groupby(columna, dropna=False)['cantidad'].sum().reset_index()
+    return conteo.sort_values(columna, na_position='first').reset_index(drop=True)
 
-    try:
-        # Tarea 3.1: Generar inscriptos_por_dia.csv
-        print("-> Generando inscriptos_por_dia.csv...")
-        query_inscriptos_dia = f"SELECT fecha_insc, COUNT(*) as cantidad FROM inscripciones_carreras WHERE anio = {year} GROUP BY fecha_insc ORDER BY fecha_insc;"
-        df_inscriptos_dia = pd.read_sql_query(query_inscriptos_dia, conn)
-        df_inscriptos_dia.to_csv(os.path.join(OUTPUT_DIR, 'inscriptos_por_dia.csv'), index=False)
-
-        # Tarea 3.2: Generar inscriptos_vs_preinscriptos_por_carrera.csv
-        print("-> Generando inscriptos_vs_preinscriptos_por_carrera.csv...")
-        query_preinscriptos = f"SELECT carrera, COUNT(*) as preinscriptos FROM preinscriptos WHERE anio = {year} GROUP BY carrera;"
-        df_preinscriptos = pd.read_sql_query(query_preinscriptos, conn)
-        
-        query_inscriptos = f"SELECT carrera, COUNT(*) as inscriptos FROM inscripciones_carreras WHERE estado_insc = 'Aceptada' AND anio = {year} GROUP BY carrera;"
-        df_inscriptos = pd.read_sql_query(query_inscriptos, conn)
-        
-        df_comparativa = pd.merge(df_preinscriptos, df_inscriptos, on='carrera', how='outer').fillna(0)
-        df_comparativa['inscriptos'] = df_comparativa['inscriptos'].astype(int)
-        df_comparativa.to_csv(os.path.join(OUTPUT_DIR, 'inscriptos_vs_preinscriptos_por_carrera.csv'), index=False)
-
-        # Tarea 3.3: Generar preinscripciones_por_estado.csv
-        print("-> Generando preinscripciones_por_estado.csv...")
-        query_estado = f"SELECT estado, COUNT(*) as cantidad FROM preinscriptos WHERE anio = {year} GROUP BY estado;"
-        df_estado = pd.read_sql_query(query_estado, conn)
-        df_estado.to_csv(os.path.join(OUTPUT_DIR, 'preinscripciones_por_estado.csv'), index=False)
-
-        # Tarea 3.4: Generar inscriptos_grado_por_dia.csv
-        print("-> Generando inscriptos_grado_por_dia.csv...")
-        query_grado_diario = f"""
-            SELECT
-                i.fecha_insc
-            FROM inscripciones_carreras AS i
-            JOIN propuestas AS p ON i.carrera = p.codigo
-            WHERE p.tipo = 'Grado' AND i.anio = {year}
-        """
-        df_grado_diario = pd.read_sql_query(query_grado_diario, conn)
-        
-        if not df_grado_diario.empty:
-            df_grado_diario['fecha_insc'] = pd.to_datetime(df_grado_diario['fecha_insc'], errors='coerce')
-            df_grado_diario.dropna(subset=['fecha_insc'], inplace=True)
-            
-            df_conteo_diario = df_grado_diario.groupby('fecha_insc').size().reset_index(name='cantidad')
-            df_conteo_diario.to_csv(os.path.join(OUTPUT_DIR, 'inscriptos_grado_por_dia.csv'), index=False)
-            print(f"-> Se generó 'inscriptos_grado_por_dia.csv' con {len(df_conteo_diario)} registros de fechas.")
-        else:
-            print("-> No se encontraron inscripciones de grado para generar 'inscriptos_grado_por_dia.csv'.")
-
-        # Fase 4.1: Generar KPIs
-        print("-> Generando kpis_inscripciones_carreras.csv...")
-        query_total_preinscriptos = f"SELECT COUNT(*) as total FROM preinscriptos WHERE anio = {year};"
-        total_preinscriptos = pd.read_sql_query(query_total_preinscriptos, conn)['total'][0]
-
-        query_total_inscriptos = f"SELECT COUNT(*) as total FROM inscripciones_carreras WHERE estado_insc = 'Aceptada' AND anio = {year};"
-        total_inscriptos = pd.read_sql_query(query_total_inscriptos, conn)['total'][0]
-        
-        tasa_conversion = (total_inscriptos / total_preinscriptos) * 100 if total_preinscriptos > 0 else 0
-        
-        query_estado_principal = f"SELECT estado FROM preinscriptos WHERE anio = {year} GROUP BY estado ORDER BY COUNT(*) DESC LIMIT 1;"
-        estado_principal_series = pd.read_sql_query(query_estado_principal, conn)
-        estado_principal = estado_principal_series['estado'][0] if not estado_principal_series.empty else 'N/A'
-
-
-        kpis = {
+
+def calcular_reportes(inscripciones, preinscripciones):
+    """
+    Arma los reportes de un año a partir de las dos consultas agregadas.
+
+    Returns:
+        dict: Nombre del CSV -> DataFrame.
+    """
+    aceptadas = inscripciones[inscripciones['estado_insc'].isin(ESTADOS_ACEPTADOS)]
+
+    por_carrera = pd.merge(
+        preinscripciones.groupby('carrera', dropna=False)['cantidad'].sum().rename('preinscriptos').reset_index(),
+        aceptadas.groupby('carrera', dropna=False)['cantidad'].sum().rename('inscriptos').reset_index(),
+        on='carrera', how='outer')
+    for columna in ('preinscriptos', 'inscriptos'):
+        # Sin filas, la columna queda como object; to_numeric la vuelve numérica.
+        por_carrera[columna] = pd.to_numeric(por_carrera[columna]).fillna(0).astype(int)
+
+    grado = inscripciones[inscripciones['tipo'] == 'Grado'].copy()
+    grado['fecha_insc'] = pd.to_datetime(grado['fecha_insc'], errors='coerce')
+    grado_por_dia = _contar_por(grado.dropna(subset=['fecha_insc']), 'fecha_insc')
+
+    por_estado = _contar_por(preinscripciones, 'estado')
+    total_preinscriptos = int(preinscripciones['cantidad'].sum())
+    total_inscriptos = int(aceptadas['cantidad'].sum())
+    tasa_conversion = (total_inscriptos / total_preinscriptos) * 100 if total_preinscriptos > 0 else 0
+    estado_principal = por_estado.loc[por_estado['cantidad'].idxmax(), 'estado'] if not por_estado.empty else 'N/A'
+
+    return {
+        'inscriptos_por_dia.csv': _contar_por(inscripciones, 'fecha_insc'),
+        'inscriptos_vs_preinscriptos_por_carrera.csv': por_carrera,
+        'preinscripciones_por_estado.csv': por_estado,
+        'inscriptos_grado_por_dia.csv': grado_por_dia,
+        'kpis_inscripciones_carreras.csv': pd.DataFrame({
             'Total Preinscriptos': [total_preinscriptos],
             'Total Inscriptos Aceptados': [total_inscriptos],
             'Tasa de Conversión (%)': [round(tasa_conversion, 2)],
-            'Principal Estado Preinscripción': [estado_principal]
-        }
-        df_kpis = pd.DataFrame(kpis)
-        df_kpis.to_csv(os.path.join(OUTPUT_DIR, 'kpis_inscripciones_carreras.csv'), index=False)
+            'Principal Estado Preinscripción': [estado_principal],
+        }),
+    }
 
-        print("\nReportes generados exitosamente.")
 
-    except Exception as e:
-        print(f"Ocurrió un error durante la generación de reportes: {e}")
+def guardar_csv(df, ruta):
+    """Escribe el CSV en un temporal y lo renombra, para no dejarlo a medio escribir."""
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        df.to_csv(temporal, index=False)
+        os.replace(temporal, ruta)
     finally:
-        conn.close()
-        print("-> Conexión con la base de datos cerrada.")
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def generar_reportes_anio(year, db_path=DB_PATH, directorios=None):
+    """
+    Calcula los reportes de un año y los guarda en cada uno de los directorios.
+
+    Returns:
+        dict | None: Nombre del CSV -> cantidad de filas, o None si hubo un error.
+    """
+    directorios = directorios or [os.path.join(OUTPUT_DIR, str(year))]
+    try:
+        conn = conectar(db_path, TIMEOUT_LECTURA)
+        try:
+            inscripciones = pd.read_sql_query(QUERY_INSCRIPCIONES, conn, params=(year,))
+            preinscripciones = pd.read_sql_query(QUERY_PREINSCRIPCIONES, conn, params=(year,))
+        finally:
+            conn.close()
+        reportes = calcular_reportes(inscripciones, preinscripciones)
+        for directorio in directorios:
+            os.makedirs(directorio, exist_ok=True)
+            for nombre, df in reportes.items():
+                guardar_csv(df, os.path.join(directorio, nombre))
+    except Exception as e:
+        print(f"Ocurrió un error durante la generación de reportes de {year}: {e}")
+        return None
+    return {nombre: len(df) for nombre, df in reportes.items()}
+
+
+def generar_reportes_inscripciones(years=None, db_path=DB_PATH, procesos=None, publicar=YEAR):
+    """
+    Genera los reportes CSV y KPIs del dashboard de inscripciones a carreras para uno o
+    más años, en paralelo. Sin años, genera solo la temporada `publicar`. Si `publicar`
+    está entre los años, sus reportes se publican además para el dashboard.
+
+    Returns:
+        bool: True si se generaron los reportes de todos los años.
+    """
+    if not os.path.exists(db_path):
+        print(f"Error: No se encontró la base de datos en {db_path}")
+        return False
+
+    years = sorted(set(years or [publicar]))
+    if publicar in years:
+        aviso = f"el dashboard muestra {publicar}"
+    else:
+        aviso = f"el dashboard sigue con la temporada {publicar}"
+    print(f"Iniciando la generación de reportes de inscripciones a carreras para {', '.join(map(str, years))} "
+          f"({aviso})...")
+    directorios = {year: [os.path.join(OUTPUT_DIR, str(year))] for year in years}
+    if publicar in years:
+        directorios[publicar].append(OUTPUT_DIR)
+
+    with ThreadPoolExecutor(max_workers=procesos or min(len(years), os.cpu_count() or 1)) as pool:
+        resultados = dict(zip(years, pool.map(lambda year: generar_reportes_anio(year, db_path, directorios[year]), years)))
+
+    for year, filas in resultados.items():
+        if filas is not None:
+            detalle = ', '.join(f"{nombre} ({cantidad})" for nombre, cantidad in filas.items())
+            print(f"-> {year}: {detalle}.")
+    fallidos = [year for year, filas in resultados.items() if filas is None]
+    if fallidos:
+        print(f"\nNo se pudieron generar los reportes de: {', '.join(map(str, fallidos))}.")
+        return False
+    print("\nReportes generados exitosamente.")
+    return True
+
 
 if __name__ == '__main__':
-    generar_reportes_inscripciones(YEAR)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Genera los reportes de inscripciones a carreras del dashboard.')
+    parser.add_argument('anios', nargs='*', type=int, help='Años a generar (por defecto, solo la temporada publicada).')
+    parser.add_argument('--publicar', type=int, default=YEAR,
+                        help=f'Temporada que se publica para el dashboard si está entre los años (por defecto, {YEAR}).')
+    parser.add_argument('--todos', action='store_true', help='Genera todos los años con datos en la base.')
+    parser.add_argument('--db', default=DB_PATH, help='Ruta a la base de datos SQLite.')
+    parser.add_argument('--procesos', type=int, default=None, help='Años que se procesan a la vez (por defecto, uno por CPU).')
+    args = parser.parse_args()
+
+    anios = args.anios
+    if args.todos and os.path.exists(args.db):
+        anios = anios_disponibles(args.db)
+    if not generar_reportes_inscripciones(anios, args.db, args.procesos, args.publicar):
+        sys.exit(1)
@@ -1,16 +1,55 @@
 import pandas as pd
-import sqlite3
 import os
+import argparse
+import hashlib
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fechas import normalizar_fechas
+from utils.intercambio import leer_procesado
+from utils.lotes import iterar_lotes, insertar_lotes, carga_masiva, upsert_lotes, resumen_upsert
+from utils.validacion import aprobar_importacion
+from utils.manifiesto import ejecutar_si_hay_cambios, clave_importacion
+from utils.conexion import conectar
+from utils.cambios import registrar_cambios
 
 # --- Configuración ---
 CSV_FILEPATH = 'data/procesados/inscripciones_docu_limpio.csv'
 DB_FILEPATH = 'data/base_de_datos/academica.db'
 TABLE_NAME = 'docu_inscripciones'
 
-def importar_documentacion_inscripciones():
+# Una respuesta del formulario se identifica por su marca temporal (con la hora) y el DNI.
+# El CSV es la planilla completa de respuestas, que crece durante la temporada; la
+# importación incremental inserta sin comparar las respuestas posteriores a la última marca
+# temporal guardada y, entre las anteriores, actualiza en su lugar las que cambiaron (ej:
+# 'estado_documentacin', que se completa a mano en la planilla), detectadas comparando el
+# hash de cada fila.
+LLAVE = ['marca_temporal', 'dni']
+COLUMNA_HASH = 'hash_fila'
+FORMATO_MARCA = '%Y-%m-%d %H:%M:%S'
+
+
+def hash_filas(df):
+    """Hash (SHA-1) del contenido de cada fila, como texto, para detectar cambios."""
+    textos = df.astype(str).agg('\x1f'.join, axis=1)
+    return textos.map(lambda texto: hashlib.sha1(texto.encode('utf-8')).hexdigest())
+
+
+def columnas_tabla(cursor):
+    """Columnas actuales de la tabla, o None si la tabla no existe."""
+    columnas = [fila[1] for fila in cursor.execute(f"PRAGMA table_info({TABLE_NAME})").fetchall()]
+    return columnas or None
+
+
+def importar_documentacion_inscripciones(completo=False):
     """
     Importa los datos de documentación de inscripciones desde un CSV a una tabla SQLite.
-    La tabla se borra y se vuelve a crear en cada ejecución para evitar duplicados.
+
+    La tabla no se borra: se insertan las respuestas nuevas y se actualizan las que
+    cambiaron desde la importación anterior, en una única transacción. Con `completo`
+    (o si la tabla tiene el formato anterior, sin hash de fila) se reemplaza todo el
+    contenido, también en una única transacción.
     """
     print(f"Iniciando importación de '{CSV_FILEPATH}' a la tabla '{TABLE_NAME}'...")
 
@@ -20,16 +59,22 @@ def importar_documentacion_inscripciones():
         return
 
     try:
-        df = pd.read_csv(CSV_FILEPATH, encoding='utf-8')
-        df['dni'] = df['dni'].astype(str)
-
-        # Convertir 'marca_temporal' a formato de fecha (YYYY-MM-DD)
-        if 'marca_temporal' in df.columns:
-            print("-> Convirtiendo la columna 'marca_temporal' a formato de fecha (YYYY-MM-DD)...")
-            df['marca_temporal'] = pd.to_datetime(df['marca_temporal'], format='%d/%m/%Y %H:%M:%S', errors='coerce').dt.strftime('%Y-%m-%d')
-            # Eliminar filas donde la conversión de fecha resultó en NaT (Not a Time)
-            df.dropna(subset=['marca_temporal'], inplace=True)
-            print("-> Conversión completa.")
+        # 'dni' llega como texto según el esquema, sin pasar por la inferencia numérica del CSV.
+        df = leer_procesado(CSV_FILEPATH, 'docu_inscripciones')
+        if not aprobar_importacion(df, 'docu_inscripciones'):
+            return False
+
+        # Convertir 'marca_temporal' a formato ISO con la hora (YYYY-MM-DD HH:MM:SS): es
+        # parte de la llave y la marca de agua de la importación incremental.
+        print("-> Convirtiendo la columna 'marca_temporal' a formato ISO (YYYY-MM-DD HH:MM:SS)...")
+        df['marca_temporal'] = normalizar_fechas(df['marca_temporal'], formato='%d/%m/%Y %H:%M:%S', formato_salida=FORMATO_MARCA)
+        # Eliminar filas donde la conversión de fecha resultó en NaT (Not a Time)
+        df.dropna(subset=['marca_temporal'], inplace=True)
+        # Un DNI vacío no entra en el índice UNIQUE (NULL nunca choca): se guarda como ''.
+        df['dni'] = df['dni'].fillna('')
+        df = df.drop_duplicates(subset=LLAVE, keep='last')
+        df[COLUMNA_HASH] = hash_filas(df)
+        print("-> Conversión completa.")
 
         print(f"-> Archivo CSV cargado con {len(df)} registros.")
     except Exception as e:
@@ -38,45 +83,80 @@ def importar_documentacion_inscripciones():
 
     # --- Paso 2: Conectarse a la base de datos ---
     try:
-        conn = sqlite3.connect(DB_FILEPATH)
+        conn = conectar(DB_FILEPATH)
         cursor = conn.cursor()
         print(f"-> Conexión exitosa con la base de datos '{DB_FILEPATH}'.")
     except Exception as e:
         print(f"Error al conectar con la base de datos: {e}")
         return
 
-    # --- Paso 3: Borrar y crear la tabla ---
+    # --- Paso 3: Crear la tabla o elegir el modo de importación ---
     try:
-        # Borrar la tabla si ya existe para empezar de cero
-        cursor.execute(f"DROP TABLE IF EXISTS {TABLE_NAME}")
-        print(f"-> Tabla '{TABLE_NAME}' anterior eliminada (si existía).")
-
-        # Crear la tabla sin clave primaria
-        column_definitions = ", ".join([f'"{col}" TEXT' for col in df.columns])
-        create_table_query = f'CREATE TABLE {TABLE_NAME} ({column_definitions});'
-        
-        cursor.execute(create_table_query)
-        print(f"-> Nueva tabla '{TABLE_NAME}' creada sin clave primaria.")
-
+        existentes = columnas_tabla(cursor)
+        if existentes is None:
+            column_definitions = ", ".join([f'"{col}" TEXT' for col in df.columns])
+            cursor.execute(f'CREATE TABLE {TABLE_NAME} ({column_definitions});')
+            existentes = list(df.columns)
+            print(f"-> Nueva tabla '{TABLE_NAME}' creada.")
+        elif COLUMNA_HASH not in existentes:
+            print(f"-> La tabla '{TABLE_NAME}' tiene el formato anterior (sin hash de fila); se recarga completa.")
+            completo = True
+        # Las preguntas nuevas del formulario se agregan como columnas.
+        nuevas_columnas = [col for col in df.columns if col not in existentes]
     except Exception as e:
-        print(f"Error al recrear la tabla: {e}")
+        print(f"Error al preparar la tabla: {e}")
         conn.close()
         return
 
-    # --- Paso 4: Insertar todos los datos ---
-    registros = [tuple(x) for x in df.to_records(index=False)]
+    # --- Paso 4: Insertar las respuestas nuevas y actualizar las modificadas ---
     column_names = ", ".join([f'"{col}"' for col in df.columns])
     placeholders = ", ".join(["?"] * len(df.columns))
     insert_query = f"INSERT INTO {TABLE_NAME} ({column_names}) VALUES ({placeholders});"
+    llave = ", ".join(f'"{col}"' for col in LLAVE)
 
+    importacion_ok = False
     try:
-        cursor.executemany(insert_query, registros)
-        conn.commit()
+        with carga_masiva(conn, TABLE_NAME) as carga, registrar_cambios(conn, TABLE_NAME, LLAVE, CSV_FILEPATH):
+            for col in nuevas_columnas:
+                carga.execute(f'ALTER TABLE {TABLE_NAME} ADD COLUMN "{col}" TEXT')
+            if nuevas_columnas:
+                print(f"-> Columnas agregadas a la tabla: {nuevas_columnas}")
+
+            if completo:
+                carga.execute(f"DROP INDEX IF EXISTS idx_{TABLE_NAME}_respuesta")
+                carga.execute(f"DELETE FROM {TABLE_NAME}")
+                carga.execute(f"CREATE UNIQUE INDEX idx_{TABLE_NAME}_respuesta ON {TABLE_NAME} ({llave})")
+                filas = insertar_lotes(carga, insert_query, iterar_lotes(df, como_texto=False))
+                print(f"-> Importación completa: se insertaron {filas} registros en la tabla.")
+            else:
+                carga.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{TABLE_NAME}_respuesta ON {TABLE_NAME} ({llave})")
+                # Marca de agua: la última respuesta importada (el índice la resuelve sin recorrer la tabla).
+                marca_agua = carga.execute(f"SELECT MAX(marca_temporal) FROM {TABLE_NAME}").fetchone()[0]
+                nuevas = df['marca_temporal'] > marca_agua if marca_agua else pd.Series(True, index=df.index)
+                posteriores, anteriores = df[nuevas], df[~nuevas]
+                guardados = pd.read_sql_query(f"SELECT {llave}, {COLUMNA_HASH} FROM {TABLE_NAME}", conn)
+
+                # Las respuestas posteriores a la marca de agua no pueden estar guardadas: se
+                # insertan sin compararlas con la tabla.
+                insertadas = insertar_lotes(carga, insert_query, iterar_lotes(posteriores, como_texto=False))
+
+                # Las anteriores se comparan con el hash guardado y solo se envían si cambiaron.
+                comparadas = anteriores[LLAVE + [COLUMNA_HASH]].merge(guardados, on=LLAVE, how='left', suffixes=('', '_guardado'))
+                cambiadas = anteriores[comparadas[COLUMNA_HASH].to_numpy() != comparadas[f'{COLUMNA_HASH}_guardado'].to_numpy()]
+                print(f"-> Marca de agua: {marca_agua or 'tabla vacía'}. {insertadas} respuestas posteriores insertadas "
+                      f"y {len(cambiadas)} anteriores con cambios.")
+
+                conteos = upsert_lotes(carga, TABLE_NAME, list(df.columns), LLAVE, iterar_lotes(cambiadas, como_texto=False))
+                print(f"-> Respuestas anteriores: {resumen_upsert(conteos)}.")
+
+                ausentes = len(guardados.merge(df[LLAVE], on=LLAVE, how='left', indicator=True).query("_merge == 'left_only'"))
+                if ausentes:
+                    print(f"-> Advertencia: {ausentes} respuestas guardadas ya no están en el CSV. "
+                          "Para quitarlas, use --completo.")
 
         cursor.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}")
-        filas_insertadas = cursor.fetchone()[0]
-
-        print(f"-> Se insertaron {filas_insertadas} registros en la tabla.")
+        print(f"-> La tabla tiene {cursor.fetchone()[0]} registros.")
+        importacion_ok = True
 
     except Exception as e:
         print(f"Ocurrió un error durante la inserción de datos: {e}")
@@ -85,6 +165,16 @@ def importar_documentacion_inscripciones():
         print("-> Conexión con la base de datos cerrada.")
 
     print("\n¡Proceso de importación completado!")
+    return importacion_ok
 
 if __name__ == '__main__':
-    importar_documentacion_inscripciones()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Importa la documentación de inscripciones a la base de datos.')
+    parser.add_argument('--force', action='store_true', help='Importa aunque el CSV no haya cambiado desde la última importación.')
+    parser.add_argument('--completo', action='store_true', help='Reemplaza todo el contenido de la tabla en lugar de importar solo las respuestas nuevas o modificadas.')
+    args = parser.parse_args()
+
+    ejecutar_si_hay_cambios(
+        clave_importacion(TABLE_NAME, CSV_FILEPATH),
+        importar_documentacion_inscripciones, args.completo,
+        entradas=[CSV_FILEPATH], tablas=[TABLE_NAME], db_filepath=DB_FILEPATH, forzar=args.force or args.completo
+    )
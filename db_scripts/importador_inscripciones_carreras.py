@@ -1,10 +1,17 @@
 
-import pandas as pd
-import sqlite3
 import os
 import argparse
 import sys
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.intercambio import leer_procesado, definiciones_columnas
+from utils.lotes import iterar_lotes, upsert_lotes, resumen_upsert, carga_masiva
+from utils.validacion import aprobar_importacion
+from utils.manifiesto import ejecutar_si_hay_cambios, clave_importacion
+from utils.conexion import conectar
+from utils.cambios import registrar_cambios
+
 # --- Configuración ---
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_OUTPUT_PATH = os.path.join(BASE_DIR, 'data', 'base_de_datos', 'academica.db')
@@ -13,7 +20,7 @@ TABLE_NAME = 'inscripciones_carreras'
 def importar_inscripciones_carreras(csv_input_path):
     """
     Importa los datos de inscripciones a carreras desde un CSV a la base de datos SQLite.
-    Agrega nuevos registros a la tabla, ignorando duplicados basados en la llave primaria (nº_documento, propuesta).
+    Agrega los registros nuevos a la tabla y actualiza los del mismo año que cambiaron, según la llave primaria (n_documento, carrera).
     """
     print(f"Iniciando la importación de '{csv_input_path}' a la tabla '{TABLE_NAME}'...")
 
@@ -21,30 +28,55 @@ def importar_inscripciones_carreras(csv_input_path):
         print(f"Error: No se encontró el archivo CSV en la ruta: {csv_input_path}")
         sys.exit(1)
 
-    # --- Paso 1: Leer el archivo CSV ---
+    # --- Paso 1: Leer el archivo procesado (Parquet tipado si está disponible) ---
     try:
-        df = pd.read_csv(csv_input_path, encoding='utf-8')
-        # Forzar todas las columnas a string para consistencia con la DB (TEXT)
-        df = df.astype(str)
-        print(f"-> Archivo CSV cargado. Se encontraron {len(df)} registros.")
+        df = leer_procesado(csv_input_path, 'inscripciones_carreras')
+        print(f"-> Archivo procesado cargado. Se encontraron {len(df)} registros.")
     except Exception as e:
         print(f"Ocurrió un error al leer el CSV: {e}")
         sys.exit(1)
 
+    if not aprobar_importacion(df, 'inscripciones_carreras'):
+        return False
+
+    # Los valores se insertan con sus tipos (el año como entero, los vacíos como NULL).
+    importacion_ok = cargar_inscripciones_carreras(list(df.columns), iterar_lotes(df, como_texto=False),
+                                                   origen=csv_input_path)
+
+    print(f"\n¡Proceso de importación de {TABLE_NAME} completado!")
+    return importacion_ok
+
+def cargar_inscripciones_carreras(columnas, lotes, db_filepath=DB_OUTPUT_PATH, origen=None):
+    """
+    Inserta lotes de registros de inscripciones a carreras: los nuevos se agregan y los ya
+    cargados para el mismo año se actualizan solo si cambió alguna columna.
+    Es el camino de inserción que usan tanto la importación desde CSV como el
+    pipeline en proceso del cargador (`utils/pipeline_carga.py`).
+
+    Args:
+        columnas (list[str]): Nombres de las columnas, en el orden de los registros.
+        lotes (iterable[list[tuple]]): Lotes de registros, ej: de `iterar_lotes`.
+        db_filepath (str): Ruta a la base de datos SQLite.
+        origen (str, optional): Archivo importado, para el registro de cambios.
+
+    Returns:
+        bool: True si la inserción terminó bien.
+    """
     # --- Paso 2: Conectarse a la base de datos ---
     try:
-        conn = sqlite3.connect(DB_OUTPUT_PATH)
+        conn = conectar(db_filepath)
         cursor = conn.cursor()
-        print(f"-> Conexión con la base de datos '{DB_OUTPUT_PATH}' establecida.")
+        print(f"-> Conexión con la base de datos '{db_filepath}' establecida.")
     except Exception as e:
         print(f"Ocurrió un error al conectar con la base de datos: {e}")
-        sys.exit(1)
+        return False
 
     # --- Paso 3: Crear la tabla si no existe con la nueva llave primaria ---
     try:
         print(f"-> Creando la tabla '{TABLE_NAME}' si no existe...")
-        column_definitions = ", ".join([f'"{col}" TEXT' for col in df.columns])
-        
+        # Cada columna con la afinidad de su tipo en el esquema (ej: 'anio' INTEGER).
+        column_definitions = definiciones_columnas(columnas, 'inscripciones_carreras')
+
         # Se usa "IF NOT EXISTS" para no fallar si la tabla ya está creada.
         # La llave primaria se define con 'nº_documento' y 'propuesta'.
         create_table_query = f"""
@@ -59,37 +91,39 @@ def importar_inscripciones_carreras(csv_input_path):
     except Exception as e:
         print(f"Ocurrió un error al crear o verificar la tabla: {e}")
         conn.close()
-        sys.exit(1)
+        return False
         
-    # --- Paso 4: Insertar datos ignorando duplicados ---
+    # --- Paso 4: Insertar las inscripciones nuevas y actualizar las que cambiaron ---
+    importacion_ok = False
     try:
-        # Se construye una sentencia INSERT OR IGNORE para evitar fallos por duplicados
-        # y agregar únicamente los registros nuevos.
-        cols = ', '.join([f'"{col}"' for col in df.columns])
-        placeholders = ', '.join(['?'] * len(df.columns))
-        sql = f"INSERT OR IGNORE INTO {TABLE_NAME} ({cols}) VALUES ({placeholders})"
-        
-        # Contar filas afectadas para reportar cuántos registros nuevos se agregaron
-        initial_changes = conn.total_changes
-        cursor.executemany(sql, df.to_records(index=False))
-        final_changes = conn.total_changes
-        
-        inserted_rows = final_changes - initial_changes
+        # Una inscripción ya cargada (misma persona y carrera) se actualiza solo si es del
+        # mismo año y cambió alguna columna, por ejemplo el estado; las idénticas no se
+        # escriben. Si la persona ya figura en otro año, se conserva la primera inscripción.
+        with carga_masiva(conn, TABLE_NAME) as cursor, registrar_cambios(conn, TABLE_NAME, ['n_documento', 'carrera'], origen):
+            conteos = upsert_lotes(cursor, TABLE_NAME, columnas, ['n_documento', 'carrera'], lotes,
+                                   condicion=f'{TABLE_NAME}."anio" = excluded."anio"')
 
-        print(f"-> Se procesaron {len(df)} registros. Se insertaron {inserted_rows} nuevos registros en '{TABLE_NAME}'.")
+        print(f"-> {resumen_upsert(conteos)} en '{TABLE_NAME}'.")
+        importacion_ok = True
 
     except Exception as e:
         print(f"Ocurrió un error durante la inserción de datos: {e}")
     finally:
-        conn.commit()
         conn.close()
         print("-> Conexión con la base de datos cerrada.")
 
-    print(f"\n¡Proceso de importación de {TABLE_NAME} completado!")
+    return importacion_ok
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Importa datos de inscripciones a carreras a la base de datos.')
     parser.add_argument('--archivo-csv', required=True, help='Ruta del archivo CSV a importar.')
+    parser.add_argument('--force', action='store_true', help='Importa aunque el CSV no haya cambiado desde la última importación.')
     args = parser.parse_args()
     
-    importar_inscripciones_carreras(args.archivo_csv)
+    resultado = ejecutar_si_hay_cambios(
+        clave_importacion(TABLE_NAME, args.archivo_csv),
+        importar_inscripciones_carreras, args.archivo_csv,
+        entradas=[args.archivo_csv], tablas=[TABLE_NAME], db_filepath=DB_OUTPUT_PATH, forzar=args.force
+    )
+    if resultado is False:
+        sys.exit(1)
@@ -0,0 +1,174 @@
+import pandas as pd
+import os
+import glob
+import argparse
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fechas import normalizar_fechas
+from utils.intercambio import leer_procesado
+from utils.lotes import iterar_lotes, insertar_lotes, carga_masiva, upsert_lotes, resumen_upsert
+from utils.validacion import aprobar_importacion
+from utils.manifiesto import ejecutar_si_hay_cambios, clave_importacion
+from utils.conexion import conectar
+from utils.cambios import registrar_cambios
+from utils.text_utils import to_snake_case
+
+# Llave de una inscripción de posgrado. Algunos períodos se exportaron en más de un
+# archivo con contenido superpuesto (ej: 2022-1 y 2022-1-b), por eso se deduplica por ella.
+COLUMNAS_CLAVE = ['identificacion', 'actividad', 'comision', 'carrera', 'periodo']
+# Llave primaria de la tabla (las mismas columnas, con el período primero).
+LLAVE_TABLA = ['periodo', 'identificacion', 'actividad', 'comision', 'carrera']
+# Columnas del CSV que `to_snake_case` no deja con el nombre de la tabla.
+RENOMBRAR = {'Estado Insc.': 'estado_insc'}
+
+def importar_posgrado(csv_filepaths, db_filepath, table_name='inscripciones_posgrado', resumen_table='posgrado_resumen_periodo'):
+    """
+    Importa todos los CSV de posgrado en una sola transacción. La tabla se maneja por
+    período: los períodos presentes en los CSV quedan con el contenido de los archivos
+    (se insertan o actualizan las inscripciones que cambiaron y se borran las que ya no
+    están), y los demás quedan intactos. En la misma transacción se recalcula la tabla
+    de resumen por período y carrera que usa el dashboard.
+
+    Args:
+        csv_filepaths (list[str]): CSV generados por limpiador_posgrado.py.
+        db_filepath (str): Ruta a la base de datos SQLite.
+        table_name (str): Tabla de inscripciones de posgrado.
+        resumen_table (str): Tabla de agregados por período.
+    """
+    print(f"Iniciando la importación de {len(csv_filepaths)} archivos de posgrado a la tabla '{table_name}'...")
+
+    # --- Paso 1: Leer y unir los CSV ---
+    try:
+        df = pd.concat([leer_procesado(f, 'inscripciones_posgrado') for f in csv_filepaths], ignore_index=True)
+        df.dropna(how='all', inplace=True)
+        if not aprobar_importacion(df, 'inscripciones_posgrado'):
+            return False
+        df.columns = [RENOMBRAR.get(col, to_snake_case(col)) for col in df.columns]
+        print(f"-> Archivos CSV cargados. Se encontraron {len(df)} registros.")
+
+        df['fecha_inscripcion'] = normalizar_fechas(df['fecha_inscripcion'])
+
+        total = len(df)
+        df = df.drop_duplicates(subset=COLUMNAS_CLAVE, keep='first')
+        print(f"-> Se descartaron {total - len(df)} inscripciones repetidas entre archivos del mismo período.")
+    except ValueError as e:
+        print(f"Error: No hay archivos CSV para importar ({e}).")
+        return
+    except Exception as e:
+        print(f"Ocurrió un error al procesar los CSV: {e}")
+        return
+
+    periodos = sorted(df['periodo'].unique())
+    print(f"-> Períodos a cargar: {periodos}")
+
+    # --- Paso 2: Conectarse a la base de datos ---
+    try:
+        conn = conectar(db_filepath)
+        cursor = conn.cursor()
+        print(f"-> Conexión con la base de datos '{db_filepath}' establecida.")
+    except Exception as e:
+        print(f"Ocurrió un error al conectar con la base de datos: {e}")
+        return
+
+    columnas = ['alumno', 'identificacion', 'legajo', 'comision', 'estado_insc', 'fecha_inscripcion',
+                'actividad', 'carrera', 'periodo', 'origen']
+    marcadores_periodo = ", ".join(["?"] * len(periodos))
+
+    # --- Paso 3: Reemplazar los períodos y recalcular el resumen en una transacción ---
+    importacion_ok = False
+    try:
+        cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table_name} (
+            alumno TEXT,
+            identificacion TEXT,
+            legajo TEXT,
+            comision TEXT,
+            estado_insc TEXT,
+            fecha_inscripcion DATE,
+            actividad TEXT,
+            carrera TEXT,
+            periodo TEXT,
+            origen TEXT,
+            PRIMARY KEY (periodo, identificacion, actividad, comision, carrera)
+        );
+        """)
+        cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {resumen_table} (
+            periodo TEXT,
+            carrera TEXT,
+            inscripciones INTEGER,
+            estudiantes INTEGER,
+            actividades INTEGER,
+            aceptadas INTEGER,
+            PRIMARY KEY (periodo, carrera)
+        );
+        """)
+
+        # Solo se escriben las diferencias: las inscripciones que siguen iguales no se
+        # tocan ni aparecen en el registro de cambios.
+        origen = ', '.join(os.path.basename(f) for f in csv_filepaths)
+        vigentes = f'_{table_name}_vigentes'
+        llave = ', '.join(LLAVE_TABLA)
+        with carga_masiva(conn, table_name) as cursor, registrar_cambios(conn, table_name, LLAVE_TABLA, origen):
+            # Llaves de los archivos, para borrar las inscripciones que ya no figuran en sus períodos.
+            cursor.execute(f"DROP TABLE IF EXISTS temp.{vigentes}")
+            cursor.execute(f"CREATE TEMP TABLE {vigentes} ({llave}, PRIMARY KEY ({llave}))")
+            insertar_lotes(cursor, f"INSERT INTO temp.{vigentes} VALUES ({', '.join(['?'] * len(LLAVE_TABLA))})",
+                           iterar_lotes(df[LLAVE_TABLA], como_texto=False))
+            misma_llave = ' AND '.join(f'v.{col} IS {table_name}.{col}' for col in LLAVE_TABLA)
+            cursor.execute(f"""
+            DELETE FROM {table_name}
+            WHERE periodo IN ({marcadores_periodo})
+              AND NOT EXISTS (SELECT 1 FROM temp.{vigentes} v WHERE {misma_llave})
+            """, periodos)
+            print(f"-> Se borraron {cursor.rowcount} registros que ya no están en los archivos.")
+            cursor.execute(f"DROP TABLE temp.{vigentes}")
+
+            conteos = upsert_lotes(cursor, table_name, columnas, LLAVE_TABLA, iterar_lotes(df[columnas], como_texto=False))
+            print(f"-> Registros: {resumen_upsert(conteos)}.")
+
+            cursor.execute(f"DELETE FROM {resumen_table} WHERE periodo IN ({marcadores_periodo})", periodos)
+            cursor.execute(f"""
+            INSERT INTO {resumen_table} (periodo, carrera, inscripciones, estudiantes, actividades, aceptadas)
+            SELECT
+                periodo,
+                carrera,
+                COUNT(*),
+                COUNT(DISTINCT identificacion),
+                COUNT(DISTINCT actividad),
+                SUM(estado_insc LIKE '%Aceptada%')
+            FROM {table_name}
+            WHERE periodo IN ({marcadores_periodo})
+            GROUP BY periodo, carrera
+            """, periodos)
+            print(f"-> Resumen por período recalculado ({cursor.rowcount} filas en '{resumen_table}').")
+        importacion_ok = True
+    except Exception as e:
+        print(f"Ocurrió un error durante la importación de datos: {e}")
+    finally:
+        conn.close()
+        print("-> Conexión con la base de datos cerrada.")
+
+    print(f"\n¡Proceso de importación para la tabla '{table_name}' completado!")
+    return importacion_ok
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Importa los CSV de inscripciones de posgrado a la base de datos SQLite.')
+    parser.add_argument('--patron', default='data/procesados/inscripciones_posgrado_procesado_*.csv', help='Patrón glob de los CSV a importar.')
+    parser.add_argument('--force', action='store_true', help='Importa aunque los CSV no hayan cambiado desde la última importación.')
+    args = parser.parse_args()
+
+    db_output_path = 'data/base_de_datos/academica.db'
+    archivos = sorted(glob.glob(args.patron))
+    if not archivos:
+        print(f"Error: No se encontraron archivos con el patrón: {args.patron}")
+        sys.exit(1)
+
+    ejecutar_si_hay_cambios(
+        clave_importacion('inscripciones_posgrado', args.patron),
+        importar_posgrado, archivos, db_output_path,
+        entradas=archivos, tablas=['inscripciones_posgrado', 'posgrado_resumen_periodo'],
+        db_filepath=db_output_path, forzar=args.force
+    )
@@ -1,18 +1,26 @@
-import pandas as pd
-import sqlite3
 import os
 import argparse
 import sys
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.intercambio import leer_procesado, definiciones_columnas
+from utils.lotes import iterar_lotes, fusionar_particion
+from utils.validacion import aprobar_importacion
+from utils.manifiesto import ejecutar_si_hay_cambios, clave_importacion
+from utils.conexion import conectar
+
 # --- Configuración ---
 DB_OUTPUT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'base_de_datos', 'academica.db')
 TABLE_NAME = 'preinscriptos'
+# Una persona puede preinscribirse en la misma carrera en años distintos.
+LLAVE = ['anio', 'identificacion', 'carrera']
 
 def importar_preinscriptos(csv_input_path):
     """
     Importa datos de preinscriptos desde un CSV a SQLite.
     Crea la tabla si no existe, agrega columnas si es necesario,
-    y borra los datos del año a importar antes de la inserción para evitar duplicados.
+    y reemplaza los datos del año a importar aplicando solo las diferencias.
     """
     print(f"Iniciando la importación de '{csv_input_path}' a la tabla '{TABLE_NAME}'...")
 
@@ -21,24 +29,74 @@ def importar_preinscriptos(csv_input_path):
         sys.exit(1)
 
     try:
-        df = pd.read_csv(csv_input_path, encoding='utf-8')
-        df = df.astype(str)
-        print(f"-> Archivo CSV cargado. Se encontraron {len(df)} registros.")
+        df = leer_procesado(csv_input_path, 'preinscriptos')
+        print(f"-> Archivo procesado cargado. Se encontraron {len(df)} registros.")
     except Exception as e:
         print(f"Ocurrió un error al leer el CSV: {e}", file=sys.stderr)
         sys.exit(1)
 
+    if not aprobar_importacion(df, 'preinscriptos'):
+        return False
+
     if 'anio' not in df.columns or df['anio'].nunique() != 1:
         print("Error: El CSV debe contener una columna 'anio' con un único valor.", file=sys.stderr)
         sys.exit(1)
     
-    anio_a_importar = df['anio'].iloc[0]
+    anio_a_importar = int(df['anio'].iloc[0])
     print(f"-> Año a importar detectado: {anio_a_importar}")
 
+    # Los valores se insertan con sus tipos (el año como entero, los vacíos como NULL).
+    return cargar_preinscriptos(list(df.columns), iterar_lotes(df, como_texto=False), anio_a_importar,
+                                origen=csv_input_path)
+
+def _asegurar_llave(conn):
+    """
+    Las tablas creadas por versiones anteriores tenían la llave (identificacion, carrera),
+    sin el año: si una persona se preinscribía en la misma carrera dos años, la
+    importación del segundo fallaba. Si hace falta, se recrea la tabla con LLAVE.
+    """
+    info = conn.execute(f"PRAGMA table_info({TABLE_NAME})").fetchall()
+    llave_actual = [fila[1] for fila in sorted((f for f in info if f[5]), key=lambda f: f[5])]
+    if llave_actual == LLAVE:
+        return
+    print(f"-> Actualizando la llave primaria de '{TABLE_NAME}' a ({', '.join(LLAVE)})...")
+    definiciones = ", ".join(f'"{fila[1]}" {fila[2] or "TEXT"}' for fila in info)
+    cols = ", ".join(f'"{fila[1]}"' for fila in info)
     try:
-        conn = sqlite3.connect(DB_OUTPUT_PATH)
+        conn.execute("BEGIN")
+        conn.execute(f"CREATE TABLE {TABLE_NAME}_nueva ({definiciones}, PRIMARY KEY ({', '.join(LLAVE)}))")
+        conn.execute(f"INSERT INTO {TABLE_NAME}_nueva ({cols}) SELECT {cols} FROM {TABLE_NAME}")
+        conn.execute(f"DROP TABLE {TABLE_NAME}")
+        conn.execute(f"ALTER TABLE {TABLE_NAME}_nueva RENAME TO {TABLE_NAME}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+def cargar_preinscriptos(columnas, lotes, anio_a_importar, db_filepath=DB_OUTPUT_PATH, origen=None):
+    """
+    Reemplaza los preinscriptos de un año con los lotes de registros recibidos. Los
+    registros se comparan con los del año ya cargado y solo se escriben las filas
+    nuevas, modificadas o eliminadas, en una transacción corta: el dashboard nunca ve
+    el año a medio cargar. Es el camino de inserción que usan tanto la importación desde
+    CSV como el pipeline en proceso del cargador (`utils/pipeline_carga.py`).
+
+    Args:
+        columnas (list[str]): Nombres de las columnas, en el orden de los registros.
+        lotes (iterable[list[tuple]]): Lotes de registros, ej: de `iterar_lotes`.
+        anio_a_importar (int): Año cuyos registros se reemplazan.
+        db_filepath (str): Ruta a la base de datos SQLite.
+        origen (str, optional): Archivo importado, para el registro de cambios.
+
+    Returns:
+        bool: True si la importación terminó bien.
+    """
+    importacion_ok = False
+    conn = None
+    try:
+        conn = conectar(db_filepath)
         cursor = conn.cursor()
-        print(f"-> Conexión con la base de datos '{DB_OUTPUT_PATH}' establecida.")
+        print(f"-> Conexión con la base de datos '{db_filepath}' establecida.")
 
         # --- Sincronizar esquema de la tabla (Añadir columnas si es necesario) ---
         cursor.execute(f"PRAGMA table_info({TABLE_NAME})")
@@ -46,39 +104,38 @@ def importar_preinscriptos(csv_input_path):
         
         if not table_columns:
             print(f"-> La tabla '{TABLE_NAME}' no existe. Se creará.")
-            column_definitions = ", ".join([f'\"{col}\" TEXT' for col in df.columns])
+            column_definitions = definiciones_columnas(columnas, 'preinscriptos')
             # Asumimos que las columnas de la PK existen y tienen el nombre normalizado
-            pk_cols = ['identificacion', 'carrera']
-            if all(c in df.columns for c in pk_cols):
+            pk_cols = LLAVE
+            if all(c in columnas for c in pk_cols):
                 create_query = f"CREATE TABLE {TABLE_NAME} ({column_definitions}, PRIMARY KEY ({', '.join(pk_cols)}))"
                 cursor.execute(create_query)
                 print(f"-> Tabla '{TABLE_NAME}' creada con llave primaria.")
             else:
                 print(f"Error: Faltan columnas para la llave primaria ({', '.join(pk_cols)}) en el CSV.", file=sys.stderr)
-                sys.exit(1)
+                return False
         else:
             print(f"-> La tabla '{TABLE_NAME}' ya existe. Verificando columnas...")
-            csv_columns = set(df.columns)
-            missing_columns = csv_columns - table_columns
+            missing_columns = set(columnas) - table_columns
             if missing_columns:
                 print(f"  -> Columnas faltantes en la tabla: {missing_columns}. Añadiéndolas...")
                 for col in missing_columns:
-                    cursor.execute(f'ALTER TABLE {TABLE_NAME} ADD COLUMN "{col}" TEXT')
+                    cursor.execute(f'ALTER TABLE {TABLE_NAME} ADD COLUMN {definiciones_columnas([col], "preinscriptos")}')
                 print("  -> Columnas añadidas exitosamente.")
             else:
                 print("  -> El esquema de la tabla está actualizado.")
+            _asegurar_llave(conn)
 
-        # --- Borrar registros del año a importar para evitar duplicados ---
-        print(f"-> Borrando registros existentes para el año {anio_a_importar}...")
-        cursor.execute(f"DELETE FROM {TABLE_NAME} WHERE anio = ?", (anio_a_importar,))
-        print(f"  -> Se eliminaron {cursor.rowcount} registros antiguos.")
+        # --- Aplicar las diferencias con el año ya cargado ---
+        print(f"-> Comparando con los registros existentes para el año {anio_a_importar}...")
+        # El lote del registro de cambios se confirma en la misma transacción que las diferencias.
+        conteos = fusionar_particion(conn, TABLE_NAME, columnas, LLAVE, lotes, 'anio', anio_a_importar,
+                                     registrar=True, origen=origen)
+        print(f"-> {conteos['insertados']} insertados, {conteos['actualizados']} actualizados, "
+              f"{conteos['eliminados']} eliminados y {conteos['sin_cambios']} sin cambios para el año {anio_a_importar}.")
 
-        # --- Insertar datos ---
-        df.to_sql(TABLE_NAME, conn, if_exists='append', index=False)
-        print(f"-> Se insertaron {len(df)} registros nuevos para el año {anio_a_importar}.")
-
-        conn.commit()
         print("\n¡Proceso de importación completado!")
+        importacion_ok = True
 
     except Exception as e:
         print(f"Ocurrió un error durante la operación de base de datos: {e}", file=sys.stderr)
@@ -89,8 +146,17 @@ def importar_preinscriptos(csv_input_path):
             conn.close()
             print("-> Conexión con la base de datos cerrada.")
 
+    return importacion_ok
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Importa datos de preinscripciones a la base de datos de forma segura.')
     parser.add_argument('--archivo-csv', required=True, help='Ruta del archivo CSV procesado a importar.')
+    parser.add_argument('--force', action='store_true', help='Importa aunque el CSV no haya cambiado desde la última importación.')
     args = parser.parse_args()
-    importar_preinscriptos(args.archivo_csv)
+    resultado = ejecutar_si_hay_cambios(
+        clave_importacion(TABLE_NAME, args.archivo_csv),
+        importar_preinscriptos, args.archivo_csv,
+        entradas=[args.archivo_csv], tablas=[TABLE_NAME], db_filepath=DB_OUTPUT_PATH, forzar=args.force
+    )
+    if resultado is False:
+        sys.exit(1)
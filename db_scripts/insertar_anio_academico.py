@@ -1,7 +1,11 @@
-import sqlite3
 import os
+import sys
 from datetime import date
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.conexion import conectar
+
 def poblar_anio_academico(start_year, end_year, db_filepath, table_name='anio_academico'):
     """
     Genera los años académicos y los inserta directamente en la base de datos,
@@ -27,7 +31,7 @@ def poblar_anio_academico(start_year, end_year, db_filepath, table_name='anio_ac
 
     # --- Paso 2: Conectarse a la base de datos ---
     try:
-        conn = sqlite3.connect(db_filepath)
+        conn = conectar(db_filepath)
         cursor = conn.cursor()
         print(f"-> Conexión con la base de datos '{db_filepath}' establecida.")
     except Exception as e:
@@ -0,0 +1,166 @@
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.conexion import conectar
+
+# Mantenimiento de academica.db. Las importaciones actualizan, borran y recrean tablas,
+# y nada refrescaba las estadísticas del planificador ni recuperaba el espacio libre.
+# En orden:
+#   1. PRAGMA integrity_check (o quick_check): si la base está dañada, no se sigue.
+#   2. ANALYZE: estadísticas de las tablas e índices para elegir los planes de consulta.
+#   3. VACUUM (opcional): reescribe la base sin páginas libres. Por defecto solo se hace
+#      si las páginas libres superan UMBRAL_VACUUM.
+#   4. PRAGMA optimize.
+#   5. Reporte de páginas, páginas libres y tamaño de cada tabla e índice.
+#
+#     python db_scripts/mantenimiento_base.py
+#     python db_scripts/mantenimiento_base.py --vacuum --reporte _output/tamanos_base.csv
+
+DB_FILEPATH = 'data/base_de_datos/academica.db'
+
+# Fracción de páginas libres a partir de la cual se hace VACUUM si no se indica.
+UMBRAL_VACUUM = 0.2
+
+
+def estado_paginas(cursor):
+    """Tamaño de página, páginas totales y páginas libres de la base."""
+    return {
+        'page_size': cursor.execute("PRAGMA page_size").fetchone()[0],
+        'page_count': cursor.execute("PRAGMA page_count").fetchone()[0],
+        'freelist_count': cursor.execute("PRAGMA freelist_count").fetchone()[0],
+    }
+
+
+def tamanos_objetos(cursor):
+    """
+    Páginas y bytes de cada tabla e índice según la tabla virtual dbstat.
+
+    Returns:
+        pd.DataFrame | None: 'nombre', 'tipo', 'tabla', 'paginas', 'bytes' y 'mb', de
+        mayor a menor; None si el SQLite instalado no tiene dbstat.
+    """
+    query = """
+        SELECT s.name AS nombre, COALESCE(m.type, 'table') AS tipo, COALESCE(m.tbl_name, s.name) AS tabla,
+               COUNT(*) AS paginas, SUM(s.pgsize) AS bytes
+        FROM dbstat AS s
+        LEFT JOIN sqlite_master AS m ON m.name = s.name
+        GROUP BY s.name
+        ORDER BY bytes DESC
+    """
+    try:
+        df = pd.read_sql_query(query, cursor.connection)
+    except (sqlite3.OperationalError, pd.errors.DatabaseError):
+        return None
+    df['mb'] = (df['bytes'] / 1e6).round(2)
+    return df
+
+
+def mostrar_reporte(paginas, tamanos, limite=15):
+    total = paginas['page_count'] * paginas['page_size']
+    libres = paginas['freelist_count'] / paginas['page_count'] if paginas['page_count'] else 0
+    print(f"-> {paginas['page_count']} páginas de {paginas['page_size']} bytes ({total / 1e6:.1f} MB), "
+          f"{paginas['freelist_count']} libres ({libres:.1%}).")
+    if tamanos is None:
+        print("-> Este SQLite no tiene la tabla virtual dbstat; no se informan los tamaños por tabla.")
+        return
+    print("-> Tablas e índices más grandes:")
+    print(tamanos.head(limite)[['nombre', 'tipo', 'tabla', 'paginas', 'mb']].to_string(index=False))
+
+
+def mantener_base(db_filepath=DB_FILEPATH, vacuum=None, rapido=False, reporte=None):
+    """
+    Revisa la integridad, actualiza las estadísticas y, si hace falta, compacta la base.
+
+    Args:
+        db_filepath (str): Ruta a la base de datos SQLite.
+        vacuum (bool, optional): True siempre hace VACUUM y False nunca; None lo hace
+            si las páginas libres superan UMBRAL_VACUUM.
+        rapido (bool): Usa quick_check (no revisa el contenido de los índices).
+        reporte (str, optional): CSV donde guardar los tamaños por tabla e índice.
+
+    Returns:
+        bool: True si la base está íntegra y el mantenimiento terminó bien.
+    """
+    print(f"Iniciando el mantenimiento de '{db_filepath}'...")
+    if not os.path.exists(db_filepath):
+        print(f"Error: No se encontró la base de datos en {db_filepath}")
+        return False
+
+    try:
+        conn = conectar(db_filepath)
+        cursor = conn.cursor()
+    except Exception as e:
+        print(f"Ocurrió un error al conectar con la base de datos: {e}")
+        return False
+
+    try:
+        antes = estado_paginas(cursor)
+
+        # --- 1. Integridad ---
+        inicio = time.perf_counter()
+        chequeo = 'quick_check' if rapido else 'integrity_check'
+        resultado = [fila[0] for fila in cursor.execute(f"PRAGMA {chequeo}").fetchall()]
+        if resultado != ['ok']:
+            print(f"Error: {chequeo} encontró {len(resultado)} problemas; no se sigue con el mantenimiento:")
+            for problema in resultado[:20]:
+                print(f"   {problema}")
+            return False
+        print(f"-> {chequeo}: ok ({time.perf_counter() - inicio:.2f}s).")
+
+        # --- 2. Estadísticas del planificador ---
+        inicio = time.perf_counter()
+        cursor.execute("ANALYZE")
+        conn.commit()
+        print(f"-> ANALYZE completado ({time.perf_counter() - inicio:.2f}s).")
+
+        # --- 3. Compactación ---
+        libres = antes['freelist_count'] / antes['page_count'] if antes['page_count'] else 0
+        if vacuum or (vacuum is None and libres > UMBRAL_VACUUM):
+            inicio = time.perf_counter()
+            cursor.execute("VACUUM")
+            despues = estado_paginas(cursor)
+            print(f"-> VACUUM: {antes['page_count'] * antes['page_size'] / 1e6:.1f} MB -> "
+                  f"{despues['page_count'] * despues['page_size'] / 1e6:.1f} MB ({time.perf_counter() - inicio:.2f}s).")
+        elif vacuum is None:
+            print(f"-> Sin VACUUM: las páginas libres ({libres:.1%}) no superan el {UMBRAL_VACUUM:.0%}.")
+
+        # --- 4. Optimize ---
+        cursor.execute("PRAGMA optimize")
+        print("-> PRAGMA optimize completado.")
+
+        # --- 5. Reporte ---
+        tamanos = tamanos_objetos(cursor)
+        mostrar_reporte(estado_paginas(cursor), tamanos)
+        if reporte and tamanos is not None:
+            os.makedirs(os.path.dirname(reporte) or '.', exist_ok=True)
+            tamanos.to_csv(reporte, index=False, encoding='utf-8')
+            print(f"-> Tamaños guardados en '{reporte}'.")
+        return True
+    except Exception as e:
+        print(f"Ocurrió un error durante el mantenimiento: {e}")
+        return False
+    finally:
+        conn.close()
+        print("-> Conexión con la base de datos cerrada.")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Revisa la integridad, actualiza las estadísticas y compacta la base de datos.')
+    parser.add_argument('--db', default=DB_FILEPATH, help='Ruta a la base de datos SQLite.')
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument('--vacuum', action='store_true', help='Hace VACUUM aunque haya pocas páginas libres.')
+    grupo.add_argument('--sin-vacuum', action='store_true', help='No hace VACUUM.')
+    parser.add_argument('--rapido', action='store_true', help='Usa quick_check en lugar de integrity_check.')
+    parser.add_argument('--reporte', help='Ruta opcional de un CSV donde guardar el tamaño de cada tabla e índice.')
+    args = parser.parse_args()
+
+    vacuum = True if args.vacuum else (False if args.sin_vacuum else None)
+    if not mantener_base(args.db, vacuum, args.rapido, args.reporte):
+        sys.exit(1)
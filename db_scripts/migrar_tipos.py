@@ -0,0 +1,166 @@
+import argparse
+import os
+import struct
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.conexion import conectar
+from utils.intercambio import AFINIDADES, tipos_columnas
+
+# Migración única de las bases creadas por versiones anteriores de los importadores:
+#   - inscripciones_carreras y preinscriptos tenían todas las columnas TEXT y guardaban
+#     los vacíos como el texto 'nan' (y el año como '2026');
+#   - aspirantes.ano_ingreso y otras columnas numéricas podían tener BLOBs con los bytes
+#     de un numpy.int64 o numpy.float64 (little-endian).
+# Cada tabla se recrea con las afinidades de su esquema en utils/intercambio.py, con los
+# 'nan' como NULL y los BLOBs convertidos a números. Las tablas ya migradas se omiten.
+
+DB_FILEPATH = 'data/base_de_datos/academica.db'
+
+# Tabla -> dataset de ESQUEMAS con los tipos de sus columnas.
+TABLAS = {
+    'inscripciones_carreras': 'inscripciones_carreras',
+    'preinscriptos': 'preinscriptos',
+    'aspirantes': 'estudiantes',
+    'estudiantes': 'estudiantes',
+}
+
+
+def _numero_desde_blob(valor, tipo):
+    """Convierte los bytes de un escalar de numpy (little-endian) al número que representan."""
+    if not isinstance(valor, bytes):
+        return None
+    if tipo == 'REAL':
+        formatos = {4: '<f', 8: '<d'}
+        return struct.unpack(formatos[len(valor)], valor)[0] if len(valor) in formatos else None
+    return int.from_bytes(valor, 'little', signed=True) if len(valor) in (1, 2, 4, 8) else None
+
+
+def columnas_destino(cursor, tabla, dataset):
+    """
+    Columnas de la tabla con su tipo actual y el que le corresponde según el esquema
+    (las que no figuran en el esquema conservan su tipo).
+
+    Returns:
+        list[tuple]: (columna, tipo actual, tipo destino, posición en la llave primaria).
+    """
+    info = cursor.execute(f"PRAGMA table_info({tabla})").fetchall()
+    esquema = tipos_columnas([fila[1] for fila in info], dataset)
+    columnas = []
+    for _, col, tipo, _, _, pk in info:
+        tipo = tipo.upper()
+        destino = tipo if esquema[col] == 'texto' and tipo else AFINIDADES[esquema[col]]
+        columnas.append((col, tipo, destino, pk))
+    return columnas
+
+
+def necesita_migracion(cursor, tabla, columnas):
+    """Indica si alguna columna cambia de tipo o tiene textos 'nan' o BLOBs."""
+    if any(actual != destino for _, actual, destino, _ in columnas):
+        return True
+    condiciones = ' OR '.join(f"\"{col}\" = 'nan' OR typeof(\"{col}\") = 'blob'" for col, _, _, _ in columnas)
+    return cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {tabla} WHERE {condiciones})").fetchone()[0] == 1
+
+
+def migrar_tabla(conn, tabla, columnas):
+    """
+    Recrea la tabla con los tipos destino en una única transacción, conservando la
+    llave primaria y los índices.
+
+    Returns:
+        int: Cantidad de filas migradas.
+    """
+    cursor = conn.cursor()
+    indices = [fila[0] for fila in cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (tabla,))]
+    llave = [col for col, _, _, pk in sorted(columnas, key=lambda c: c[3]) if pk]
+    definiciones = ", ".join(f'"{col}" {destino}' for col, _, destino, _ in columnas)
+    if llave:
+        definiciones += ", PRIMARY KEY (" + ", ".join(f'"{col}"' for col in llave) + ")"
+
+    # Los 'nan' pasan a NULL y los BLOBs a número; el resto lo convierte la afinidad de
+    # la columna nueva (ej: '2026' en una columna INTEGER se guarda como 2026).
+    expresiones = []
+    for col, _, destino, _ in columnas:
+        if destino in ('INTEGER', 'REAL'):
+            expresiones.append(f"CASE WHEN typeof(\"{col}\") = 'blob' THEN _numero_desde_blob(\"{col}\", '{destino}') "
+                               f"ELSE NULLIF(\"{col}\", 'nan') END")
+        else:
+            expresiones.append(f"NULLIF(\"{col}\", 'nan')")
+
+    cursor.execute("BEGIN")
+    try:
+        cursor.execute(f"DROP TABLE IF EXISTS {tabla}_migrada")
+        cursor.execute(f"CREATE TABLE {tabla}_migrada ({definiciones})")
+        cursor.execute(f"INSERT INTO {tabla}_migrada SELECT {', '.join(expresiones)} FROM {tabla}")
+        filas = cursor.rowcount
+        cursor.execute(f"DROP TABLE {tabla}")
+        cursor.execute(f"ALTER TABLE {tabla}_migrada RENAME TO {tabla}")
+        for sql in indices:
+            cursor.execute(sql)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return filas
+
+
+def migrar_tipos(db_filepath=DB_FILEPATH, compactar=True):
+    """
+    Migra las tablas de TABLAS que lo necesiten y, si se migró alguna, compacta la base
+    con VACUUM para recuperar el espacio.
+
+    Returns:
+        bool: True si la migración terminó bien (o no hacía falta).
+    """
+    print(f"Iniciando la migración de tipos en '{db_filepath}'...")
+    if not os.path.exists(db_filepath):
+        print(f"-> No existe la base de datos '{db_filepath}'; no hay nada que migrar.")
+        return True
+
+    try:
+        conn = conectar(db_filepath)
+        conn.create_function('_numero_desde_blob', 2, _numero_desde_blob, deterministic=True)
+        cursor = conn.cursor()
+    except Exception as e:
+        print(f"Ocurrió un error al conectar con la base de datos: {e}")
+        return False
+
+    try:
+        tamano_antes = cursor.execute("SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()").fetchone()[0]
+        migradas = 0
+        for tabla, dataset in TABLAS.items():
+            columnas = columnas_destino(cursor, tabla, dataset)
+            if not columnas:
+                print(f"-> La tabla '{tabla}' no existe; se omite.")
+                continue
+            if not necesita_migracion(cursor, tabla, columnas):
+                print(f"-> La tabla '{tabla}' ya tiene los tipos correctos.")
+                continue
+            cambios = [f"{col} {actual or '-'} -> {destino}" for col, actual, destino, _ in columnas if actual != destino]
+            filas = migrar_tabla(conn, tabla, columnas)
+            migradas += 1
+            print(f"-> Tabla '{tabla}' migrada ({filas} filas). Columnas con tipo nuevo: {', '.join(cambios) or 'ninguna'}.")
+
+        if migradas and compactar:
+            cursor.execute("VACUUM")
+            tamano_despues = cursor.execute("SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()").fetchone()[0]
+            print(f"-> Base compactada: {tamano_antes / 1e6:.1f} MB -> {tamano_despues / 1e6:.1f} MB.")
+        return True
+    except Exception as e:
+        print(f"Ocurrió un error durante la migración: {e}")
+        return False
+    finally:
+        conn.close()
+        print("-> Conexión con la base de datos cerrada.")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convierte las tablas creadas por versiones anteriores a columnas tipadas.')
+    parser.add_argument('--db', default=DB_FILEPATH, help='Ruta a la base de datos SQLite.')
+    parser.add_argument('--sin-vacuum', action='store_true', help='No compacta la base después de migrar.')
+    args = parser.parse_args()
+
+    if not migrar_tipos(args.db, compactar=not args.sin_vacuum):
+        sys.exit(1)
@@ -0,0 +1,60 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.versiones import leer_puntero, listar_versiones, publicar, publicar_version, revertir
+
+# Publicación de versiones de academica.db para el dashboard (ver utils/versiones.py).
+#
+#     python db_scripts/publicar_base.py                  # copia, valida y publica la base de trabajo
+#     python db_scripts/publicar_base.py --listar         # versiones disponibles
+#     python db_scripts/publicar_base.py --revertir       # vuelve a la versión anterior
+#     python db_scripts/publicar_base.py --version academica-20250101-120000-000000.db
+
+DB_FILEPATH = 'data/base_de_datos/academica.db'
+
+
+def mostrar_versiones(db_filepath):
+    puntero = leer_puntero(db_filepath) or {}
+    versiones = listar_versiones(db_filepath)
+    if not versiones:
+        print("No hay versiones publicadas; el dashboard lee la base de trabajo.")
+        return
+    for nombre in versiones:
+        marca = '*' if nombre == puntero.get('version') else ('<' if nombre == puntero.get('anterior') else ' ')
+        print(f"{marca} {nombre}")
+    print(f"\n* publicada ({puntero.get('publicado', '-')}), < anterior")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Publica una copia validada de la base de datos para el dashboard.')
+    parser.add_argument('--db', default=DB_FILEPATH, help='Ruta a la base de datos de trabajo.')
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument('--listar', action='store_true', help='Muestra las versiones disponibles.')
+    grupo.add_argument('--revertir', action='store_true', help='Vuelve a publicar la versión anterior.')
+    grupo.add_argument('--version', help='Publica una versión existente (nombre de archivo).')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: No se encontró la base de datos en {args.db}")
+        sys.exit(1)
+
+    if args.listar:
+        mostrar_versiones(args.db)
+    elif args.revertir:
+        version = revertir(args.db)
+        if not version:
+            print("Error: No hay una versión anterior a la que volver.")
+            sys.exit(1)
+        print(f"-> Versión {version} publicada de nuevo.")
+    elif args.version:
+        try:
+            publicar(args.db, args.version)
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"-> Versión {args.version} publicada.")
+    elif not publicar_version(args.db):
+        sys.exit(1)
@@ -0,0 +1,114 @@
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.archivo import adjuntar_archivo
+from utils.identidades import resolver
+from utils.conexion import conectar
+
+# Tablas con documentos de personas: (tabla, columna del documento, columna del nombre).
+FUENTES = [
+    ('estudiantes', 'tipo_y_n_documento', 'apellido_y_nombre'),
+    ('aspirantes', 'tipo_y_n_documento', 'apellido_y_nombre'),
+    ('inscripciones_carreras', 'n_documento', 'apellido_y_nombre'),
+    ('preinscriptos', 'identificacion', 'apellido_y_nombres'),
+    ('inscripciones_cursadas', 'identificacion', 'alumno'),
+    ('egresados', 'documento', 'apellido_y_nombres'),
+    ('inscripciones_posgrado', 'identificacion', 'alumno'),
+    ('docu_inscripciones', 'dni', None),
+]
+
+
+def resolver_identidades(db_filepath, table_name='personas_documentos'):
+    """
+    Lee los documentos de todas las tablas de personas, los agrupa por persona y guarda
+    la tabla de correspondencias documento -> persona_id. Los identificadores asignados
+    en ejecuciones anteriores se conservan.
+
+    Para cruzar tablas por persona en lugar de por el texto del documento:
+        JOIN personas_documentos pd ON pd.documento = e.tipo_y_n_documento
+
+    Returns:
+        bool: True si la tabla se actualizó correctamente.
+    """
+    print(f"Iniciando la resolución de identidades en '{db_filepath}'...")
+    inicio = time.perf_counter()
+
+    try:
+        conn = conectar(db_filepath)
+        cursor = conn.cursor()
+        # Las personas de los años archivados también tienen que tener su identificador.
+        adjuntar_archivo(conn, db_filepath)
+        print(f"-> Conexión con la base de datos '{db_filepath}' establecida.")
+    except Exception as e:
+        print(f"Ocurrió un error al conectar con la base de datos: {e}")
+        return False
+
+    try:
+        tablas = {fila[0] for fila in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        consultas = []
+        for tabla, col_doc, col_nombre in FUENTES:
+            if tabla not in tablas:
+                print(f"-> La tabla '{tabla}' no existe; se omite.")
+                continue
+            nombre = f'"{col_nombre}"' if col_nombre else 'NULL'
+            consultas.append(f'SELECT DISTINCT "{col_doc}" AS documento, {nombre} AS nombre FROM {tabla}')
+        if not consultas:
+            print("Error: No hay tablas con documentos para procesar.")
+            return False
+        registros = pd.read_sql_query(' UNION '.join(consultas), conn)
+        # Las bases sin migrar (db_scripts/migrar_tipos.py) pueden tener vacíos guardados como 'nan'.
+        registros = registros.replace({'nan': None})
+        print(f"-> Se leyeron {len(registros)} combinaciones de documento y nombre.")
+
+        existentes = {}
+        if table_name in tablas:
+            previos = pd.read_sql_query(f"SELECT DISTINCT documento_normalizado, persona_id FROM {table_name}", conn)
+            existentes = dict(zip(previos['documento_normalizado'], previos['persona_id']))
+
+        crosswalk = resolver(registros, existentes)
+        personas = crosswalk['persona_id'].nunique()
+        aproximados = (crosswalk['metodo'] == 'aproximado').sum()
+        print(f"-> {len(crosswalk)} documentos distintos corresponden a {personas} personas "
+              f"({aproximados} documentos unidos por coincidencia aproximada).")
+
+        # La tabla se reemplaza completa dentro de una única transacción.
+        cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+        cursor.execute(f"""
+        CREATE TABLE {table_name} (
+            documento TEXT PRIMARY KEY,
+            documento_normalizado TEXT NOT NULL,
+            persona_id INTEGER NOT NULL,
+            metodo TEXT NOT NULL,
+            nombre TEXT
+        );
+        """)
+        cursor.execute(f"CREATE INDEX idx_{table_name}_persona ON {table_name} (persona_id)")
+        cursor.executemany(
+            f"INSERT INTO {table_name} (documento, documento_normalizado, persona_id, metodo, nombre) VALUES (?, ?, ?, ?, ?)",
+            crosswalk.astype(object).where(crosswalk.notna(), None).itertuples(index=False, name=None),
+        )
+        conn.commit()
+        print(f"-> Tabla '{table_name}' actualizada en {time.perf_counter() - inicio:.2f}s.")
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"Ocurrió un error durante la resolución de identidades: {e}")
+        return False
+    finally:
+        conn.close()
+        print("-> Conexión con la base de datos cerrada.")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Agrupa los documentos de todas las tablas por persona.')
+    parser.add_argument('--db', default='data/base_de_datos/academica.db', help='Ruta a la base de datos SQLite.')
+    args = parser.parse_args()
+
+    if not resolver_identidades(args.db):
+        sys.exit(1)
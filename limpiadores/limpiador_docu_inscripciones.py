@@ -1,6 +1,13 @@
 import pandas as pd
 import os
 import re
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.manifiesto import ejecutar_si_hay_cambios, clave_limpieza
+from utils.intercambio import guardar_procesado
 
 # --- Configuración de archivos ---
 INPUT_FILE = 'data/crudos/Inscripción ingresantes CPU 1ºC 2026 (respuestas) - Respuestas de formulario 1.csv'
@@ -45,12 +52,22 @@ def procesar_inscripciones_documentacion():
 
         # --- Paso 3: Guardar el archivo procesado ---
         os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
-        df.to_csv(OUTPUT_FILE, index=False, encoding='utf-8')
+        guardar_procesado(df, OUTPUT_FILE, 'docu_inscripciones')
         
         print(f"\nProceso finalizado. Archivo limpio guardado en: {OUTPUT_FILE}")
+        return df
 
     except Exception as e:
         print(f"Ocurrió un error durante el procesamiento: {e}")
 
 if __name__ == '__main__':
-    procesar_inscripciones_documentacion()
+    parser = argparse.ArgumentParser(description='Limpia las respuestas del formulario de documentación de inscripciones.')
+    parser.add_argument('--force', action='store_true', help='Limpia aunque el archivo de entrada no haya cambiado desde la última limpieza.')
+    args = parser.parse_args()
+
+    ejecutar_si_hay_cambios(
+        clave_limpieza(OUTPUT_FILE),
+        procesar_inscripciones_documentacion,
+        entradas=[INPUT_FILE], salidas=[OUTPUT_FILE], forzar=args.force
+    )
+
@@ -1,8 +1,15 @@
 import pandas as pd
-import re
 import os
+import sys
 import argparse
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.lector_excel import leer_reporte
+from utils.manifiesto import ejecutar_si_hay_cambios, clave_limpieza
+from utils.intercambio import guardar_procesado
+from utils.reporte_jerarquico import columna_texto, extraer_codigos_carrera, propagar_carrera, extraer_filas
+
 # --- Configuración del script ---
 
 # Archivo con la lista de carreras válidas
@@ -14,6 +21,7 @@ def limpiar_y_procesar_datos(inscripciones_file, output_file, periodo_value):
     """
     Función principal para leer, limpiar y enriquecer los datos de inscripciones.
     Valida las carreras contra el archivo carreras.csv.
+    Devuelve el DataFrame guardado, o None si no se pudo generar.
     """
     print("Iniciando el proceso de limpieza y enriquecimiento de datos...")
 
@@ -33,45 +41,40 @@ def limpiar_y_procesar_datos(inscripciones_file, output_file, periodo_value):
 
     # --- Paso 2: Procesar el archivo de inscripciones ---
     try:
-        df_inscripciones = pd.read_excel(inscripciones_file, header=None)
+        df_inscripciones = leer_reporte(inscripciones_file)
         
-        datos_limpios = []
-        current_carrera_code = None
-
         print("-> Procesando filas del reporte de inscripciones...")
-        for index, row in df_inscripciones.iterrows():
-            cell_value = str(row.iloc[0])
-            match = re.search(r'\((.*?)\)', cell_value)
-            
-            # Condición 1: La fila es un encabezado de carrera
-            if match and match.group(1) in codigos_carrera_validos:
-                current_carrera_code = match.group(1)
-                continue
-
-            # Condición 2: La fila es un encabezado de columnas. La detectamos y la saltamos.
-            if 'Alumno' in cell_value and 'Identificación' in str(row.iloc[1]):
-                continue
-
-            # Condición 3: La fila es un dato de alumno
-            if current_carrera_code and pd.notna(row.iloc[1]):
-                # CORRECCIÓN: Se ajustaron los índices de las columnas para que coincidan con el archivo Excel.
-                datos_limpios.append({
-                    'Alumno': row.iloc[0],
-                    'Identificación': row.iloc[1],
-                    'Comisión': row.iloc[3],       # Comisión está en la 4ta columna (índice 3)
-                    'Estado Insc.': row.iloc[4],   # Estado Insc. está en la 5ta columna (índice 4)
-                    'Fecha inscripción': row.iloc[6], # Fecha inscripción está en la 7ma columna (índice 6)
-                    'Carrera': current_carrera_code,
-                    'Período': periodo_value
-                })
-        
-        if not datos_limpios:
+        codigos = extraer_codigos_carrera(df_inscripciones)
+
+        # Condición 1: La fila es un encabezado de carrera
+        filas_carrera = codigos.isin(codigos_carrera_validos)
+
+        # Condición 2: La fila es un encabezado de columnas. La detectamos y la saltamos.
+        filas_encabezado = (
+            columna_texto(df_inscripciones, 0).str.contains('Alumno', regex=False)
+            & columna_texto(df_inscripciones, 1).str.contains('Identificación', regex=False)
+        )
+
+        # Condición 3: La fila es un dato de alumno de la última carrera detectada
+        carrera = propagar_carrera(filas_carrera, codigos)
+        filas_datos = ~filas_carrera & ~filas_encabezado & carrera.notna() & df_inscripciones.iloc[:, 1].notna()
+
+        if not filas_datos.any():
             print("Resultado: No se encontraron datos de inscripción válidos. Revisa el archivo de entrada.")
             return
 
+        # CORRECCIÓN: Se ajustaron los índices de las columnas para que coincidan con el archivo Excel.
+        df_limpio = extraer_filas(df_inscripciones, filas_datos, {
+            'Alumno': 0,
+            'Identificación': 1,
+            'Comisión': 3,            # Comisión está en la 4ta columna (índice 3)
+            'Estado Insc.': 4,        # Estado Insc. está en la 5ta columna (índice 4)
+            'Fecha inscripción': 6,   # Fecha inscripción está en la 7ma columna (índice 6)
+        })
+        df_limpio['Carrera'] = carrera
+        df_limpio['Período'] = periodo_value
+
         # --- Paso 3: Filtrar y guardar los datos limpios ---
-        df_limpio = pd.DataFrame(datos_limpios)
-        
         # Filtro Robusto: Busca si el estado CONTIENE alguna de las palabras clave
         filtro_regex = '|'.join(ESTADOS_UTILES)
         df_filtrado = df_limpio[df_limpio['Estado Insc.'].str.contains(filtro_regex, case=False, na=False)]
@@ -82,8 +85,9 @@ def limpiar_y_procesar_datos(inscripciones_file, output_file, periodo_value):
         df_final = df_filtrado[columnas_finales]
 
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        df_final.to_csv(output_file, index=False, encoding='utf-8')
+        guardar_procesado(df_final, output_file, 'inscripciones_cursadas')
         print(f"Proceso finalizado. Archivo limpio guardado como '{output_file}'.")
+        return df_final
 
     except Exception as e:
         print(f"Error al procesar el archivo de inscripciones: {e}")
@@ -94,8 +98,14 @@ if __name__ == '__main__':
     parser.add_argument('--periodo', required=True, help='El período lectivo a asignar a los registros (ej: 2025-1).')
     parser.add_argument('--archivo-entrada', required=True, help='Ruta al archivo Excel de inscripciones crudo.')
     parser.add_argument('--archivo-salida', required=True, help='Ruta donde se guardará el archivo CSV procesado.')
+    parser.add_argument('--force', action='store_true', help='Limpia aunque el archivo de entrada no haya cambiado desde la última limpieza.')
     
     args = parser.parse_args()
     
-    limpiar_y_procesar_datos(args.archivo_entrada, args.archivo_salida, args.periodo)
+    ejecutar_si_hay_cambios(
+        clave_limpieza(args.archivo_salida),
+        limpiar_y_procesar_datos, args.archivo_entrada, args.archivo_salida, args.periodo,
+        entradas=[args.archivo_entrada, CARRERAS_FILE], salidas=[args.archivo_salida],
+        parametros={'periodo': args.periodo}, forzar=args.force
+    )
 
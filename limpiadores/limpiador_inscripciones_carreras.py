@@ -1,17 +1,27 @@
 
 import pandas as pd
-import re
 import os
+import sys
 import argparse
 
 # --- Configuración de rutas relativas ---
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.lector_excel import leer_reporte
+from utils.manifiesto import ejecutar_si_hay_cambios, clave_limpieza
+from utils.fechas import normalizar_fechas
+from utils.intercambio import guardar_procesado
+from utils.reporte_jerarquico import columna_texto, extraer_codigos_carrera, propagar_carrera, extraer_filas
+
 CARRERAS_FILE = os.path.join(BASE_DIR, 'data', 'procesados', 'carreras.csv')
 
 def limpiar_inscripciones_carreras(input_file, output_file, anio):
     """
     Procesa el reporte de inscripciones a carreras para un año específico.
     Extrae la carrera de los encabezados, normaliza los datos y los guarda en un CSV.
+    Devuelve el DataFrame limpio, o None si no se pudo generar. Si `output_file` es None
+    no se escribe el CSV.
     """
     print(f"Iniciando el proceso de limpieza de inscripciones a carreras para el año {anio}...")
 
@@ -31,51 +41,46 @@ def limpiar_inscripciones_carreras(input_file, output_file, anio):
 
     # --- Paso 2: Procesar el archivo de inscripciones ---
     try:
-        df_inscripciones = pd.read_excel(input_file, header=None)
+        df_inscripciones = leer_reporte(input_file)
         
-        datos_limpios = []
-        current_carrera_code = None
-
         print("-> Procesando filas del reporte de inscripciones a carreras...")
-        for index, row in df_inscripciones.iterrows():
-            cell_value = str(row.iloc[0])
-            match = re.search(r'\((.*?)\)', cell_value)
-            
-            # Condición 1: La fila es un encabezado de carrera
-            if match and match.group(1) in codigos_carrera_validos:
-                current_carrera_code = match.group(1)
-                continue
-
-            # Condición 2: La fila es un encabezado de columnas. La detectamos y la saltamos.
-            if 'Apellido y Nombre' in cell_value or 'N° Documento' in str(row.iloc[1]):
-                continue
-
-            # Condición 3: La fila es un dato de alumno
-            if current_carrera_code and pd.notna(row.iloc[1]):
-                datos_limpios.append({
-                    'apellido_y_nombre': row.iloc[0],
-                    'n_documento': row.iloc[1],
-                    'plan': row.iloc[2],
-                    'version': row.iloc[3],
-                    'fecha_insc': row.iloc[4],
-                    'fecha_ingreso': row.iloc[5],
-                    'estado_insc': row.iloc[6],
-                    'tipo_ingreso': row.iloc[7],
-                    'modalidad': row.iloc[8],
-                    'carrera': current_carrera_code,
-                    'anio': anio
-                })
-        
-        if not datos_limpios:
+        codigos = extraer_codigos_carrera(df_inscripciones)
+
+        # Condición 1: La fila es un encabezado de carrera
+        filas_carrera = codigos.isin(codigos_carrera_validos)
+
+        # Condición 2: La fila es un encabezado de columnas. La detectamos y la saltamos.
+        filas_encabezado = (
+            columna_texto(df_inscripciones, 0).str.contains('Apellido y Nombre', regex=False)
+            | columna_texto(df_inscripciones, 1).str.contains('N° Documento', regex=False)
+        )
+
+        # Condición 3: La fila es un dato de alumno de la última carrera detectada
+        carrera = propagar_carrera(filas_carrera, codigos)
+        filas_datos = ~filas_carrera & ~filas_encabezado & carrera.notna() & df_inscripciones.iloc[:, 1].notna()
+
+        if not filas_datos.any():
             print("Resultado: No se encontraron datos de inscripción a carrera válidos.")
             return
 
         # --- Paso 3: Eliminar duplicados y guardar los datos limpios ---
-        df_limpio = pd.DataFrame(datos_limpios)
+        df_limpio = extraer_filas(df_inscripciones, filas_datos, {
+            'apellido_y_nombre': 0,
+            'n_documento': 1,
+            'plan': 2,
+            'version': 3,
+            'fecha_insc': 4,
+            'fecha_ingreso': 5,
+            'estado_insc': 6,
+            'tipo_ingreso': 7,
+            'modalidad': 8,
+        })
+        df_limpio['carrera'] = carrera
+        df_limpio['anio'] = anio
 
         # Convertir y estandarizar fechas a 'YYYY-MM-DD'
-        df_limpio['fecha_insc'] = pd.to_datetime(df_limpio['fecha_insc'], dayfirst=True, errors='coerce').dt.strftime('%Y-%m-%d')
-        df_limpio['fecha_ingreso'] = pd.to_datetime(df_limpio['fecha_ingreso'], dayfirst=True, errors='coerce').dt.strftime('%Y-%m-%d')
+        df_limpio['fecha_insc'] = normalizar_fechas(df_limpio['fecha_insc'])
+        df_limpio['fecha_ingreso'] = normalizar_fechas(df_limpio['fecha_ingreso'])
         
         # Eliminar filas donde la conversión de fecha de inscripción falló
         df_limpio.dropna(subset=['fecha_insc'], inplace=True)
@@ -84,9 +89,12 @@ def limpiar_inscripciones_carreras(input_file, output_file, anio):
         df_limpio.drop_duplicates(subset=['n_documento', 'carrera'], inplace=True)
         print(f"-> Se eliminaron duplicados. Quedan {len(df_limpio)} registros únicos.")
         
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        df_limpio.to_csv(output_file, index=False, encoding='utf-8')
-        print(f"Proceso finalizado. Archivo limpio guardado como '{output_file}'.")
+        # Sin archivo de salida (pipeline en proceso del cargador) solo se devuelve el DataFrame.
+        if output_file:
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            guardar_procesado(df_limpio, output_file, 'inscripciones_carreras')
+            print(f"Proceso finalizado. Archivo limpio guardado como '{output_file}'.")
+        return df_limpio
 
     except Exception as e:
         print(f"Error al procesar el archivo de inscripciones a carreras: {e}")
@@ -97,7 +105,14 @@ if __name__ == '__main__':
     parser.add_argument('--archivo-entrada', required=True, help='Ruta del archivo Excel de entrada.')
     parser.add_argument('--archivo-salida', required=True, help='Ruta del archivo CSV de salida.')
     parser.add_argument('--anio', required=True, type=int, help='Año de la inscripción a procesar.')
+    parser.add_argument('--force', action='store_true', help='Limpia aunque el archivo de entrada no haya cambiado desde la última limpieza.')
     
     args = parser.parse_args()
     
-    limpiar_inscripciones_carreras(args.archivo_entrada, args.archivo_salida, args.anio)
+    ejecutar_si_hay_cambios(
+        clave_limpieza(args.archivo_salida),
+        limpiar_inscripciones_carreras, args.archivo_entrada, args.archivo_salida, args.anio,
+        entradas=[args.archivo_entrada, CARRERAS_FILE], salidas=[args.archivo_salida],
+        parametros={'anio': args.anio}, forzar=args.force
+    )
+
@@ -0,0 +1,229 @@
+import argparse
+import contextlib
+import glob
+import io
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+# --- Configuración de rutas relativas ---
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from limpiadores.limpiador_inscripciones import limpiar_y_procesar_datos
+from limpiadores.limpiador_inscripciones_carreras import limpiar_inscripciones_carreras
+from limpiadores.limpiador_posgrado import limpiar_posgrado
+from limpiadores.limpiador_preinscriptos import limpiar_preinscriptos
+from limpiadores.limpiador_reporte_alumnos import procesar_reporte_academico
+from utils.manifiesto import esta_actualizado, registrar, clave_limpieza
+
+PROCESSED_DATA_DIR = os.path.join(BASE_DIR, 'data', 'procesados')
+CARRERAS_FILE = os.path.join(PROCESSED_DATA_DIR, 'carreras.csv')
+
+# Cada tipo de limpiador define cómo obtener su parámetro (año o período) a partir
+# del nombre del archivo crudo y cómo nombrar el CSV de salida. En la plantilla de
+# salida, {coincidencia} es el texto completo reconocido en el nombre del archivo
+# (ej: '2022-2-m'), para que archivos del mismo período no se pisen entre sí.
+LIMPIADORES = {
+    'cursadas': {
+        'funcion': limpiar_y_procesar_datos,
+        'patron_parametro': r'(\d{4}-\d)(?:-[a-z])?',
+        'salida': 'inscripciones_procesado_{coincidencia}.csv',
+        'entradas_extra': [CARRERAS_FILE],
+    },
+    'carreras': {
+        'funcion': limpiar_inscripciones_carreras,
+        'patron_parametro': r'(\d{4})',
+        'tipo_parametro': int,
+        'salida': 'inscripciones_carreras_procesado_{parametro}.csv',
+        'entradas_extra': [CARRERAS_FILE],
+    },
+    'preinscriptos': {
+        'funcion': limpiar_preinscriptos,
+        'patron_parametro': r'(\d{4})',
+        'tipo_parametro': int,
+        'salida': 'preinscriptos_procesado_{parametro}.csv',
+    },
+    'posgrado': {
+        'funcion': limpiar_posgrado,
+        'patron_parametro': r'(\d{4}-\d)(?:-[a-z])?',
+        'salida': 'inscripciones_posgrado_procesado_{coincidencia}.csv',
+    },
+    'alumnos': {
+        'funcion': procesar_reporte_academico,
+        'salida': '{nombre}_procesado.csv',
+        # Nombres históricos que ya usan los importadores
+        'salidas_fijas': {
+            'CPU_todos.xlsx': 'CPU_procesados.csv',
+            'Grado_pregrado_todos.xlsx': 'Grado_pregrado_procesado.csv',
+        },
+    },
+}
+
+
+def planificar_tareas(tipo, patron, salida_dir=PROCESSED_DATA_DIR, parametro=None):
+    """
+    Arma la lista de archivos a limpiar con su archivo de salida y su parámetro.
+
+    Args:
+        tipo (str): Clave de LIMPIADORES.
+        patron (str): Patrón glob de los archivos crudos, ej: 'data/crudos/insc_carreras_20*.xlsx'.
+        salida_dir (str): Carpeta donde se guardan los CSV procesados.
+        parametro (str, optional): Año o período a usar en todos los archivos, en lugar
+            de extraerlo del nombre.
+
+    Returns:
+        list[dict]: Una tarea por archivo con 'archivo', 'salida', 'parametro' y 'error'.
+    """
+    config = LIMPIADORES[tipo]
+    tareas = []
+    salidas_usadas = set()
+    for archivo in sorted(glob.glob(patron)):
+        nombre = os.path.basename(archivo)
+        tarea = {'tipo': tipo, 'archivo': archivo, 'parametro': parametro, 'salida': None, 'error': None}
+        coincidencia = parametro
+
+        if 'patron_parametro' in config and tarea['parametro'] is None:
+            match = re.search(config['patron_parametro'], nombre)
+            if not match:
+                tarea['error'] = f"No se pudo obtener el año/período del nombre '{nombre}'."
+                tareas.append(tarea)
+                continue
+            tarea['parametro'] = match.group(1)
+            coincidencia = match.group(0)
+        if tarea['parametro'] is not None:
+            tarea['parametro'] = config.get('tipo_parametro', str)(tarea['parametro'])
+
+        salida = config.get('salidas_fijas', {}).get(nombre)
+        if salida is None:
+            salida = config['salida'].format(
+                parametro=tarea['parametro'], coincidencia=coincidencia, nombre=os.path.splitext(nombre)[0]
+            )
+        tarea['salida'] = os.path.join(salida_dir, salida)
+        if tarea['salida'] in salidas_usadas:
+            tarea['error'] = f"El archivo de salida '{salida}' ya lo genera otro archivo del lote."
+        salidas_usadas.add(tarea['salida'])
+        tareas.append(tarea)
+    return tareas
+
+
+def limpiar_archivo(tarea):
+    """
+    Ejecuta el limpiador correspondiente sobre un archivo. Corre dentro de un proceso
+    del pool, por eso captura la salida del limpiador en lugar de imprimirla mezclada
+    con la de los demás procesos.
+
+    Returns:
+        dict: La tarea con 'filas', 'segundos', 'error' y 'log' completados.
+    """
+    resultado = dict(tarea, filas=0, segundos=0.0, log='')
+    if tarea['error']:
+        return resultado
+
+    funcion = LIMPIADORES[tarea['tipo']]['funcion']
+    args = [tarea['archivo'], tarea['salida']]
+    if tarea['parametro'] is not None:
+        args.append(tarea['parametro'])
+
+    salida_capturada = io.StringIO()
+    inicio = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(salida_capturada):
+            df = funcion(*args)
+    except Exception as e:
+        df = None
+        print(f"Error inesperado: {e}", file=salida_capturada)
+    resultado['segundos'] = round(time.perf_counter() - inicio, 2)
+    resultado['log'] = salida_capturada.getvalue()
+
+    if df is None:
+        # Los limpiadores informan sus errores por consola; usamos la última línea como motivo.
+        lineas = [l for l in resultado['log'].splitlines() if l.strip()]
+        resultado['error'] = lineas[-1] if lineas else 'El limpiador no generó datos.'
+    else:
+        resultado['filas'] = len(df)
+    return resultado
+
+
+def _datos_manifiesto(tarea):
+    """Argumentos con los que la tarea se consulta y registra en el manifiesto."""
+    entradas = [tarea['archivo']] + LIMPIADORES[tarea['tipo']].get('entradas_extra', [])
+    parametros = {'parametro': tarea['parametro']} if tarea['parametro'] is not None else None
+    return clave_limpieza(tarea['salida']), entradas, [tarea['salida']], parametros
+
+
+def limpiar_en_lote(tareas, procesos=None, forzar=False):
+    """
+    Limpia todos los archivos en paralelo usando un pool de procesos. Los archivos
+    que no cambiaron desde la última limpieza (según el manifiesto) se omiten, salvo
+    que se use `forzar`.
+
+    Args:
+        tareas (list[dict]): Tareas generadas por `planificar_tareas`.
+        procesos (int, optional): Cantidad de procesos. Por defecto, uno por núcleo.
+        forzar (bool): Limpia todos los archivos aunque no hayan cambiado.
+
+    Returns:
+        pd.DataFrame: Resumen con archivo, salida, filas, segundos, omitido y error por archivo.
+    """
+    resultados = []
+    pendientes = []
+    for tarea in tareas:
+        clave, entradas, salidas, parametros = _datos_manifiesto(tarea) if tarea['salida'] else (None, None, None, None)
+        if not forzar and not tarea['error'] and esta_actualizado(clave, entradas, salidas, parametros):
+            print(f"  -> {os.path.basename(tarea['archivo'])}: sin cambios, se omite.")
+            resultados.append(dict(tarea, filas=0, segundos=0.0, omitido=True))
+        else:
+            pendientes.append(tarea)
+
+    procesos = min(procesos or os.cpu_count() or 1, max(len(pendientes), 1))
+    print(f"Limpiando {len(pendientes)} archivos con {procesos} procesos...")
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = [pool.submit(limpiar_archivo, tarea) for tarea in pendientes]
+        for futuro in as_completed(futuros):
+            r = futuro.result()
+            r['omitido'] = False
+            estado = f"Error: {r['error']}" if r['error'] else f"{r['filas']} filas"
+            print(f"  -> {os.path.basename(r['archivo'])}: {estado} ({r['segundos']}s)")
+            if not r['error']:
+                # Se registra desde el proceso principal para no competir por el manifiesto.
+                clave, entradas, salidas, parametros = _datos_manifiesto(r)
+                registrar(clave, entradas, salidas, parametros=parametros)
+            resultados.append(r)
+
+    columnas = ['archivo', 'salida', 'parametro', 'filas', 'segundos', 'omitido', 'error']
+    resumen = pd.DataFrame(resultados, columns=columnas)
+    return resumen.sort_values('archivo').reset_index(drop=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Limpia en paralelo varios archivos crudos del mismo tipo.')
+    parser.add_argument('--limpiador', required=True, choices=sorted(LIMPIADORES), help='Tipo de reporte a limpiar.')
+    parser.add_argument('--patron', required=True, help="Patrón glob de los archivos de entrada (ej: 'data/crudos/insc_carreras_20*.xlsx').")
+    parser.add_argument('--salida-dir', default=PROCESSED_DATA_DIR, help='Carpeta donde guardar los CSV procesados.')
+    parser.add_argument('--parametro', help='Año o período a usar en todos los archivos, si no se puede deducir del nombre.')
+    parser.add_argument('--procesos', type=int, help='Cantidad de procesos en paralelo (por defecto, uno por núcleo).')
+    parser.add_argument('--resumen', help='Ruta opcional de un CSV donde guardar el resumen.')
+    parser.add_argument('--force', action='store_true', help='Limpia todos los archivos aunque no hayan cambiado.')
+    args = parser.parse_args()
+
+    tareas = planificar_tareas(args.limpiador, args.patron, args.salida_dir, args.parametro)
+    if not tareas:
+        print(f"Error: No se encontraron archivos con el patrón: {args.patron}")
+        sys.exit(1)
+
+    resumen = limpiar_en_lote(tareas, args.procesos, args.force)
+    print("\nResumen:")
+    print(resumen.drop(columns=['salida']).to_string(index=False))
+
+    if args.resumen:
+        resumen.to_csv(args.resumen, index=False, encoding='utf-8')
+        print(f"\nResumen guardado en '{args.resumen}'.")
+
+    if resumen['error'].notna().any():
+        sys.exit(1)
@@ -0,0 +1,142 @@
+import os
+import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.lector_excel import leer_reporte
+from utils.intercambio import guardar_procesado
+from utils.reporte_jerarquico import columna_texto, extraer_codigos_carrera, propagar_carrera, extraer_filas
+
+# --- Configuración del script ---
+
+# Los reportes de posgrado se exportan un archivo por período, con un sufijo opcional
+# cuando el mismo período se descargó en varias partes: '2021-1.xlsx', '2021-1-b.xlsx', '2022-2-m.xlsx'.
+PATRON_ARCHIVO_POSGRADO = r'(\d{4})-(\d)(?:-([a-z]))?'
+POSGRADO_DIR = 'data/crudos/posgrado'
+ESTADOS_UTILES = ['Aceptada', 'Pendiente', 'Rechazada']
+
+
+def interpretar_nombre_archivo(filepath):
+    """
+    Obtiene el período y el sufijo a partir del nombre de un archivo de posgrado.
+
+    Returns:
+        dict: {'periodo': '2022-2', 'anio': 2022, 'cuatrimestre': 2, 'sufijo': 'm', 'origen': '2022-2-m'},
+        o None si el nombre no sigue el formato esperado.
+    """
+    match = re.search(PATRON_ARCHIVO_POSGRADO, os.path.basename(filepath))
+    if not match:
+        return None
+    anio, cuatrimestre, sufijo = match.groups()
+    return {
+        'periodo': f"{anio}-{cuatrimestre}",
+        'anio': int(anio),
+        'cuatrimestre': int(cuatrimestre),
+        'sufijo': sufijo or '',
+        'origen': match.group(0),
+    }
+
+
+def limpiar_posgrado(input_file, output_file, periodo=None):
+    """
+    Limpia un reporte de inscripciones a actividades de posgrado.
+
+    A diferencia del reporte de grado, cada bloque tiene dos encabezados: primero la
+    actividad "(MA-COM3212) TECNICAS DE COMERCIALIZACION" y luego la carrera
+    "(PR-MPCC-P) MARTILLERO PÚBLICO...", seguidos de la fila de títulos. La carrera es
+    el código que precede inmediatamente a los títulos; el resto son actividades.
+    No se filtra contra carreras.csv porque muchas propuestas de posgrado no figuran ahí.
+
+    Args:
+        input_file (str): Ruta al Excel crudo.
+        output_file (str): Ruta del CSV de salida.
+        periodo (str, optional): Período a asignar. Por defecto se toma del nombre del archivo.
+
+    Devuelve el DataFrame guardado, o None si no se pudo generar.
+    """
+    print(f"Iniciando la limpieza del reporte de posgrado '{input_file}'...")
+
+    datos_nombre = interpretar_nombre_archivo(input_file)
+    if periodo is None:
+        if datos_nombre is None:
+            print(f"Error: No se pudo obtener el período del nombre '{os.path.basename(input_file)}'.")
+            return
+        periodo = datos_nombre['periodo']
+    origen = datos_nombre['origen'] if datos_nombre else os.path.splitext(os.path.basename(input_file))[0]
+
+    try:
+        df_raw = leer_reporte(input_file)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo de entrada: {input_file}")
+        return
+    except Exception as e:
+        print(f"Error al leer el archivo de posgrado: {e}")
+        return
+
+    try:
+        codigos = extraer_codigos_carrera(df_raw)
+        filas_encabezado = (
+            columna_texto(df_raw, 0).str.contains('Alumno', regex=False)
+            & columna_texto(df_raw, 1).str.contains('Identificación', regex=False)
+        )
+        filas_codigo = codigos.notna() & df_raw.iloc[:, 1].isna()
+        filas_carrera = filas_codigo & filas_encabezado.shift(-1, fill_value=False)
+        filas_actividad = filas_codigo & ~filas_carrera
+
+        carrera = propagar_carrera(filas_carrera, codigos)
+        actividad = propagar_carrera(filas_actividad, codigos)
+        filas_datos = ~filas_codigo & ~filas_encabezado & carrera.notna() & df_raw.iloc[:, 1].notna()
+
+        if not filas_datos.any():
+            print("Resultado: No se encontraron inscripciones válidas. Revisa el archivo de entrada.")
+            return
+
+        df_limpio = extraer_filas(df_raw, filas_datos, {
+            'Alumno': 0,
+            'Identificación': 1,
+            'Legajo': 2,
+            'Comisión': 3,
+            'Estado Insc.': 4,
+            'Fecha inscripción': 6,
+        })
+        df_limpio['Actividad'] = actividad
+        df_limpio['Carrera'] = carrera
+        df_limpio['Período'] = periodo
+        df_limpio['Origen'] = origen
+
+        filtro_regex = '|'.join(ESTADOS_UTILES)
+        df_final = df_limpio[df_limpio['Estado Insc.'].str.contains(filtro_regex, case=False, na=False)]
+        print(f"-> {len(df_limpio)} filas de datos, {len(df_final)} después de filtrar por estado "
+              f"({df_final['Carrera'].nunique()} carreras, {df_final['Actividad'].nunique()} actividades).")
+
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        guardar_procesado(df_final, output_file, 'inscripciones_posgrado')
+        print(f"Proceso finalizado. Archivo limpio guardado como '{output_file}'.")
+        return df_final
+
+    except Exception as e:
+        print(f"Error al procesar el reporte de posgrado: {e}")
+        return
+
+
+if __name__ == '__main__':
+    import argparse
+    from limpiadores.limpiador_lote import planificar_tareas, limpiar_en_lote
+
+    parser = argparse.ArgumentParser(description='Limpia en paralelo los reportes de inscripciones de posgrado.')
+    parser.add_argument('--patron', default=os.path.join(POSGRADO_DIR, '*.xlsx'), help='Patrón glob de los archivos de posgrado.')
+    parser.add_argument('--procesos', type=int, help='Cantidad de procesos en paralelo (por defecto, uno por núcleo).')
+    parser.add_argument('--force', action='store_true', help='Limpia aunque los archivos de entrada no hayan cambiado.')
+    args = parser.parse_args()
+
+    tareas = planificar_tareas('posgrado', args.patron)
+    if not tareas:
+        print(f"Error: No se encontraron archivos con el patrón: {args.patron}")
+        sys.exit(1)
+
+    resumen = limpiar_en_lote(tareas, args.procesos, args.force)
+    print("\nResumen:")
+    print(resumen.drop(columns=['salida']).to_string(index=False))
+    if resumen['error'].notna().any():
+        sys.exit(1)
@@ -1,9 +1,16 @@
-import pandas as pd
 import re
 import os
+import sys
 import argparse
 import unicodedata
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.lector_excel import leer_reporte
+from utils.intercambio import guardar_procesado
+from utils.manifiesto import ejecutar_si_hay_cambios, clave_limpieza
+from utils.reporte_jerarquico import columna_texto, extraer_codigos_carrera, propagar_carrera, extraer_filas_con_encabezados
+
 def slugify(value):
     """
     Normalizes string, converts to lowercase, removes non-alpha characters,
@@ -18,6 +25,8 @@ def limpiar_preinscriptos(input_file, output_file, anio):
     Procesa el reporte de preinscriptos a carreras para un año específico.
     Extrae la carrera de los encabezados, normaliza los datos y todas las columnas,
     y los guarda en un CSV.
+    Devuelve el DataFrame limpio, o None si no se pudo generar. Si `output_file` es None
+    no se escribe el CSV.
     """
     print(f"Iniciando el proceso de limpieza de preinscriptos para el año {anio}...")
 
@@ -26,46 +35,31 @@ def limpiar_preinscriptos(input_file, output_file, anio):
         return
 
     try:
-        df_raw = pd.read_excel(input_file, header=None)
+        df_raw = leer_reporte(input_file)
         
-        all_data = []
-        current_carrera_code = None
-        header_list = []
-
         print("-> Procesando filas del reporte de preinscriptos...")
-        for index, row in df_raw.iterrows():
-            # Fila de Carrera: Busca un código entre paréntesis, ej: (CP-CCCP-PC)
-            cell_value = str(row.iloc[0])
-            match = re.search(r'\((.*?)\)', cell_value)
-            
-            if match:
-                # Extrae el código de la carrera y lo almacena
-                current_carrera_code = match.group(1)
-                print(f"  -> Detectada carrera: {current_carrera_code}")
-                continue
+        # Fila de Carrera: Busca un código entre paréntesis, ej: (CP-CCCP-PC)
+        codigos = extraer_codigos_carrera(df_raw)
+        filas_carrera = codigos.notna()
+        for codigo in codigos[filas_carrera]:
+            print(f"  -> Detectada carrera: {codigo}")
 
-            # Fila de Encabezado: Busca la fila que contiene los títulos de las columnas
-            if 'Apellido y Nombres' in cell_value:
-                header_list = [slugify(str(col)) for col in row if pd.notna(col)]
-                print(f"  -> Encabezados de datos identificados: {header_list}")
-                continue
+        # Fila de Encabezado: Busca la fila que contiene los títulos de las columnas
+        filas_encabezado = ~filas_carrera & columna_texto(df_raw, 0).str.contains('Apellido y Nombres', regex=False)
 
-            # Si no tenemos carrera o encabezados, o la fila es inválida, la saltamos
-            if not current_carrera_code or not header_list or pd.isna(row.iloc[1]):
-                continue
+        # Fila de Datos: tiene una carrera y un encabezado por encima y la identificación no está vacía
+        carrera = propagar_carrera(filas_carrera, codigos)
+        filas_datos = ~filas_carrera & ~filas_encabezado & carrera.notna() & df_raw.iloc[:, 1].notna()
 
-            # Fila de Datos: Procesar datos del estudiante
-            row_data = {header_list[i]: val for i, val in enumerate(row) if i < len(header_list)}
-            row_data['carrera'] = current_carrera_code
-            row_data['anio'] = anio
-            all_data.append(row_data)
-        
-        if not all_data:
+        df_limpio = extraer_filas_con_encabezados(df_raw, filas_encabezado, filas_datos, normalizar=slugify)
+        if df_limpio.empty:
             print("Resultado: No se encontraron datos de preinscripción válidos.")
             return
+        print(f"  -> Encabezados de datos identificados: {list(df_limpio.columns)}")
 
         # --- Crear y limpiar el DataFrame final ---
-        df_limpio = pd.DataFrame(all_data)
+        df_limpio['carrera'] = carrera
+        df_limpio['anio'] = anio
         
         # Asegurarse que la columna 'identificacion' existe antes de usarla
         if 'identificacion' in df_limpio.columns:
@@ -74,9 +68,12 @@ def limpiar_preinscriptos(input_file, output_file, anio):
         else:
             print("Advertencia: No se encontró la columna 'identificacion'. No se pudieron eliminar duplicados.")
 
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        df_limpio.to_csv(output_file, index=False, encoding='utf-8')
-        print(f"Proceso finalizado. Archivo limpio guardado como '{output_file}'.")
+        # Sin archivo de salida (pipeline en proceso del cargador) solo se devuelve el DataFrame.
+        if output_file:
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            guardar_procesado(df_limpio, output_file, 'preinscriptos')
+            print(f"Proceso finalizado. Archivo limpio guardado como '{output_file}'.")
+        return df_limpio
 
     except Exception as e:
         print(f"Error al procesar el archivo de preinscriptos: {e}")
@@ -87,7 +84,13 @@ if __name__ == '__main__':
     parser.add_argument('--archivo-entrada', required=True, help='Ruta del archivo Excel de entrada.')
     parser.add_argument('--archivo-salida', required=True, help='Ruta del archivo CSV de salida.')
     parser.add_argument('--anio', required=True, type=int, help='Año de la preinscripción a procesar.')
+    parser.add_argument('--force', action='store_true', help='Limpia aunque el archivo de entrada no haya cambiado desde la última limpieza.')
     
     args = parser.parse_args()
     
-    limpiar_preinscriptos(args.archivo_entrada, args.archivo_salida, args.anio)
+    ejecutar_si_hay_cambios(
+        clave_limpieza(args.archivo_salida),
+        limpiar_preinscriptos, args.archivo_entrada, args.archivo_salida, args.anio,
+        entradas=[args.archivo_entrada], salidas=[args.archivo_salida],
+        parametros={'anio': args.anio}, forzar=args.force
+    )
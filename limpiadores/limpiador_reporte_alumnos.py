@@ -1,60 +1,45 @@
 import pandas as pd
 import os
-import re
 import sys
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.text_utils import to_snake_case
+from utils.lector_excel import leer_reporte
+from utils.intercambio import guardar_procesado
+from utils.reporte_jerarquico import columna_texto, propagar_carrera, extraer_filas_con_encabezados
 
 def procesar_reporte_academico(input_filepath, output_filepath):
     """
     Transforma un reporte académico en formato XLSX a un formato de tabla CSV plana,
     normalizando los nombres de las columnas a snake_case.
+    Devuelve el DataFrame guardado, o None si no se pudo generar.
     """
     print(f"Iniciando el procesamiento del archivo: {input_filepath}")
 
     try:
-        df = pd.read_excel(input_filepath, header=None, engine='openpyxl')
+        df = leer_reporte(input_filepath)
     except Exception as e:
         print(f"Ocurrió un error al leer el archivo Excel: {e}")
         return
 
-    data_rows = []
-    column_headers = None
-    current_career = None
+    # Fila de carrera: tiene texto en la primera celda y la segunda vacía
+    filas_carrera = df.iloc[:, 0].notna() & df.iloc[:, 1].isna()
 
-    for index, row in df.iterrows():
-        first_cell = str(row.iloc[0])
+    # Fila de encabezados: los normalizamos a snake_case al extraer los datos
+    filas_encabezado = ~filas_carrera & columna_texto(df, 0).str.contains('Apellido y Nombre', regex=False)
 
-        if pd.notna(row.iloc[0]) and pd.isna(row.iloc[1]):
-            current_career = first_cell.strip()
-            continue
+    # Fila de datos: cualquier otra fila que no esté completamente vacía
+    filas_datos = ~filas_carrera & ~filas_encabezado & df.notna().any(axis=1)
 
-        if 'Apellido y Nombre' in first_cell:
-            # Normalizamos los encabezados a snake_case aquí
-            raw_headers = [str(h).strip() for h in row if pd.notna(h)]
-            column_headers = [to_snake_case(h) for h in raw_headers]
-            column_headers.append('carrera') # Añadimos la nueva columna ya en snake_case
-            print(f"-> Encabezados normalizados encontrados: {column_headers}")
-            continue
-
-        if column_headers is not None:
-            if row.isnull().all():
-                continue
-            
-            row_data = list(row)[:len(column_headers)-1]
-            row_data.append(current_career)
-            
-            data_dict = dict(zip(column_headers, row_data))
-            data_rows.append(data_dict)
-
-    if not data_rows:
+    df_procesado = extraer_filas_con_encabezados(df, filas_encabezado, filas_datos, normalizar=to_snake_case)
+    if df_procesado.empty:
         print("Advertencia: No se encontraron datos de estudiantes para procesar.")
         return
 
-    df_procesado = pd.DataFrame(data_rows)
-    df_procesado = df_procesado[column_headers]
+    # Añadimos la nueva columna ya en snake_case
+    df_procesado['carrera'] = propagar_carrera(filas_carrera, columna_texto(df, 0).str.strip())
+    print(f"-> Encabezados normalizados encontrados: {list(df_procesado.columns)}")
 
     # --- FIX: Convertir explicitamente la columna 'ano_ingreso' a entero ---
     if 'ano_ingreso' in df_procesado.columns:
@@ -62,27 +47,25 @@ def procesar_reporte_academico(input_filepath, output_filepath):
 
     try:
         os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
-        df_procesado.to_csv(output_filepath, index=False, encoding='utf-8')
+        guardar_procesado(df_procesado, output_filepath, 'estudiantes')
         print(f"\n¡Procesamiento completado! Archivo limpio guardado en: {output_filepath}")
+        return df_procesado
     except Exception as e:
         print(f"Ocurrió un error al guardar el archivo: {e}")
 
 if __name__ == '__main__':
     # --- Procesamiento en Lote ---
-    # Se procesan ambos reportes, aspirantes y estudiantes, uno después de la otro.
-    
-    configs = [
-        {
-            'input_path': 'data/crudos/CPU_todos.xlsx',
-            'output_path': 'data/procesados/CPU_procesados.csv'
-        },
-        {
-            'input_path': 'data/crudos/Grado_pregrado_todos.xlsx',
-            'output_path': 'data/procesados/Grado_pregrado_procesado.csv'
-        }
-    ]
-    
-    for config in configs:
-        print(f"\n--- Iniciando para el archivo: {config['input_path']} ---")
-        procesar_reporte_academico(config['input_path'], config['output_path'])
+    # Se procesan ambos reportes, aspirantes y estudiantes, en paralelo.
+    import argparse
+    from limpiadores.limpiador_lote import planificar_tareas, limpiar_en_lote
+
+    parser = argparse.ArgumentParser(description='Limpia los reportes de aspirantes (CPU) y estudiantes de grado/pregrado.')
+    parser.add_argument('--force', action='store_true', help='Limpia aunque los archivos de entrada no hayan cambiado.')
+    args = parser.parse_args()
+
+    tareas = []
+    for input_path in ['data/crudos/CPU_todos.xlsx', 'data/crudos/Grado_pregrado_todos.xlsx']:
+        tareas += planificar_tareas('alumnos', input_path)
 
+    resumen = limpiar_en_lote(tareas, forzar=args.force)
+    print(resumen.drop(columns=['salida']).to_string(index=False))
@@ -0,0 +1,342 @@
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from utils.dag import orden_topologico, ejecutar_dag, camino_critico
+from utils.conexion import conectar, checkpoint
+from utils.cambios import ultimo_lote, compactar_lotes
+from utils.versiones import publicar_version
+
+# Reconstrucción completa de la base de datos: limpiadores e importadores declarados
+# como pasos con dependencias. Los limpiadores de fuentes distintas corren en paralelo;
+# los pasos que escriben en academica.db se ejecutan de a uno.
+#
+# Cada paso lanza uno o más scripts del proyecto (en el orden indicado) y solo se
+# ejecuta si existen sus archivos de entrada. Los scripts consultan el manifiesto, así
+# que los pasos cuyas entradas no cambiaron terminan enseguida.
+#   'comandos': lista de argumentos, o función que la devuelve (se evalúa al momento de
+#               ejecutar el paso, después de que los limpiadores generaron sus CSV).
+#   'entradas': patrón glob que tiene que tener al menos un archivo.
+#   'force':    si el script acepta --force.
+
+PROCESADOS = 'data/procesados'
+DB_PATH = os.path.join(BASE_DIR, 'data', 'base_de_datos', 'academica.db')
+
+
+def _por_archivo(script, patron):
+    """Un comando por cada CSV procesado que coincide con el patrón."""
+    def comandos():
+        return [[script, '--archivo-csv', archivo] for archivo in sorted(glob.glob(patron))]
+    return comandos
+
+
+PASOS = {
+    # --- Limpiadores (no escriben en la base) ---
+    'limpiar_alumnos': {
+        'comandos': [['limpiadores/limpiador_reporte_alumnos.py']],
+        'entradas': 'data/crudos/*_todos.xlsx',
+        'force': True,
+    },
+    'limpiar_inscripciones_carreras': {
+        'comandos': [['limpiadores/limpiador_lote.py', '--limpiador', 'carreras', '--patron', 'data/crudos/insc_carreras_20*.xlsx']],
+        'entradas': 'data/crudos/insc_carreras_20*.xlsx',
+        'force': True,
+    },
+    'limpiar_preinscriptos': {
+        'comandos': [['limpiadores/limpiador_lote.py', '--limpiador', 'preinscriptos', '--patron', 'data/crudos/reporte de preinscriptos 20*.xlsx']],
+        'entradas': 'data/crudos/reporte de preinscriptos 20*.xlsx',
+        'force': True,
+    },
+    'limpiar_cursadas': {
+        'comandos': [['limpiadores/limpiador_lote.py', '--limpiador', 'cursadas', '--patron', 'data/crudos/inscripciones_20*.xlsx']],
+        'entradas': 'data/crudos/inscripciones_20*.xlsx',
+        'force': True,
+    },
+    'limpiar_posgrado': {
+        'comandos': [['limpiadores/limpiador_posgrado.py']],
+        'entradas': 'data/crudos/posgrado/*.xlsx',
+        'force': True,
+    },
+    'limpiar_docu_inscripciones': {
+        'comandos': [['limpiadores/limpiador_docu_inscripciones.py']],
+        'entradas': 'data/crudos/Inscripción ingresantes CPU*.csv',
+        'force': True,
+    },
+
+    # --- Tablas de referencia ---
+    'anio_academico': {
+        'comandos': [['db_scripts/insertar_anio_academico.py']],
+        'escribe_db': True,
+    },
+    # Convierte una sola vez las tablas creadas por versiones anteriores (sin tipos).
+    'migrar_tipos': {
+        'comandos': [['db_scripts/migrar_tipos.py']],
+        'escribe_db': True,
+    },
+    'propuestas': {
+        'comandos': [['db_scripts/carreras.py']],
+        'entradas': f'{PROCESADOS}/carreras.csv',
+        'escribe_db': True,
+        'force': True,
+    },
+    'planes': {
+        'comandos': [['db_scripts/planes.py']],
+        'entradas': f'{PROCESADOS}/planes.csv',
+        'depende_de': ['propuestas'],
+        'escribe_db': True,
+        'force': True,
+    },
+    'certificados': {
+        'comandos': [['db_scripts/certificados.py']],
+        'entradas': f'{PROCESADOS}/certificados.csv',
+        'depende_de': ['propuestas'],
+        'escribe_db': True,
+        'force': True,
+    },
+
+    # --- Importadores ---
+    'estudiantes': {
+        'comandos': [['db_scripts/estudiantes.py']],
+        'depende_de': ['limpiar_alumnos', 'propuestas', 'migrar_tipos'],
+        'escribe_db': True,
+        'force': True,
+    },
+    'egresados': {
+        'comandos': [['db_scripts/egresados.py']],
+        'entradas': f'{PROCESADOS}/Egresados_todos.csv',
+        # Al importar se calculan el año académico, el tipo de certificado y la etiqueta
+        # del plan; las consultas de egresados cruzan además con propuestas. El script
+        # reimporta si cambió alguna de esas fuentes, no solo Egresados_todos.csv.
+        'depende_de': ['anio_academico', 'propuestas', 'certificados', 'planes'],
+        'escribe_db': True,
+        'force': True,
+    },
+    'inscripciones_carreras': {
+        'comandos': _por_archivo('db_scripts/importador_inscripciones_carreras.py', f'{PROCESADOS}/inscripciones_carreras_procesado_*.csv'),
+        'depende_de': ['limpiar_inscripciones_carreras', 'propuestas', 'migrar_tipos'],
+        'escribe_db': True,
+        'force': True,
+    },
+    'preinscriptos': {
+        'comandos': _por_archivo('db_scripts/importador_preinscriptos.py', f'{PROCESADOS}/preinscriptos_procesado_*.csv'),
+        'depende_de': ['limpiar_preinscriptos', 'propuestas', 'migrar_tipos'],
+        'escribe_db': True,
+        'force': True,
+    },
+    'inscripciones_cursadas': {
+        'comandos': _por_archivo('db_scripts/inscripciones_cursadas.py', f'{PROCESADOS}/inscripciones_procesado_*.csv'),
+        'depende_de': ['limpiar_cursadas', 'propuestas'],
+        'escribe_db': True,
+        'force': True,
+    },
+    'posgrado': {
+        'comandos': [['db_scripts/importador_posgrado.py']],
+        'entradas': f'{PROCESADOS}/inscripciones_posgrado_procesado_*.csv',
+        'depende_de': ['limpiar_posgrado'],
+        'escribe_db': True,
+        'force': True,
+    },
+    'docu_inscripciones': {
+        'comandos': [['db_scripts/importador_docu_inscripciones.py']],
+        'entradas': f'{PROCESADOS}/inscripciones_docu_limpio.csv',
+        'depende_de': ['limpiar_docu_inscripciones'],
+        'escribe_db': True,
+        'force': True,
+    },
+
+    # --- Tablas derivadas ---
+    'identidades': {
+        'comandos': [['db_scripts/resolver_identidades.py']],
+        'depende_de': ['estudiantes', 'egresados', 'inscripciones_carreras', 'preinscriptos',
+                       'inscripciones_cursadas', 'posgrado', 'docu_inscripciones'],
+        'escribe_db': True,
+    },
+
+    # Si la base tiene años archivados, se reubican las filas que cargaron los importadores
+    # (ej: las de una persona archivada que volvió a inscribirse). Sin archivo no hace nada.
+    'archivo': {
+        'comandos': [['db_scripts/archivar_anios.py', '--reaplicar', '--sin-vacuum']],
+        'depende_de': ['estudiantes', 'egresados', 'inscripciones_cursadas'],
+        'escribe_db': True,
+    },
+
+    # --- Reportes derivados (solo leen la base) ---
+    'reportes_inscripciones': {
+        'comandos': [['db_scripts/generador_reportes_inscripciones.py']],
+        'depende_de': ['inscripciones_carreras', 'preinscriptos'],
+    },
+}
+
+# Al final, integridad, ANALYZE y VACUUM si quedaron muchas páginas libres, después de
+# todos los pasos que escriben en la base.
+PASOS['mantenimiento'] = {
+    'comandos': [['db_scripts/mantenimiento_base.py', '--rapido']],
+    'depende_de': [nombre for nombre, paso in PASOS.items() if paso.get('escribe_db')],
+    'escribe_db': True,
+}
+
+
+def ejecutar_paso(nombre, paso, forzar=False):
+    """
+    Ejecuta los scripts de un paso desde la raíz del proyecto, con el mismo intérprete.
+
+    Returns:
+        dict: 'ok', 'omitido' (sin archivos de entrada), 'comandos' ejecutados y 'log'.
+    """
+    if paso.get('entradas') and not glob.glob(os.path.join(BASE_DIR, paso['entradas'])):
+        return {'ok': True, 'omitido': True, 'comandos': 0, 'log': f"Sin archivos de entrada ({paso['entradas']})."}
+
+    comandos = paso['comandos']() if callable(paso['comandos']) else paso['comandos']
+    log = []
+    for comando in comandos:
+        comando = [sys.executable] + comando + (['--force'] if forzar and paso.get('force') else [])
+        proceso = subprocess.run(comando, cwd=BASE_DIR, capture_output=True, text=True, encoding='utf-8')
+        log.append(f"$ {' '.join(comando[1:])}\n{proceso.stdout}{proceso.stderr}")
+        if proceso.returncode != 0:
+            log.append(f"El script finalizó con un error (código: {proceso.returncode}).")
+            return {'ok': False, 'omitido': False, 'comandos': len(comandos), 'log': '\n'.join(log)}
+    return {'ok': True, 'omitido': False, 'comandos': len(comandos), 'log': '\n'.join(log)}
+
+
+def seleccionar_pasos(nombres):
+    """Devuelve los pasos pedidos junto con todas sus dependencias."""
+    seleccion = set()
+    pendientes = list(nombres)
+    while pendientes:
+        nombre = pendientes.pop()
+        if nombre not in PASOS:
+            raise ValueError(f"No existe el paso '{nombre}'. Pasos disponibles: {sorted(PASOS)}")
+        if nombre not in seleccion:
+            seleccion.add(nombre)
+            pendientes.extend(PASOS[nombre].get('depende_de', []))
+    return {nombre: paso for nombre, paso in PASOS.items() if nombre in seleccion}
+
+
+def compactar_wal(db_path):
+    """
+    Checkpoint completo al terminar: los importadores solo hacen checkpoints que no
+    esperan a los lectores, así que el WAL puede quedar grande después de una
+    reconstrucción. Este espera a que terminen las consultas en curso y lo vacía.
+    """
+    conn = conectar(db_path)
+    try:
+        estado = checkpoint(conn, 'TRUNCATE')
+        if estado is None:
+            print("\nLa base no está en modo WAL; no hace falta checkpoint.")
+        elif estado[1] == 0:
+            print("\nCheckpoint del WAL: no había páginas pendientes.")
+        elif estado[0]:
+            print(f"\nCheckpoint del WAL incompleto: hay lectores activos ({estado[2]} de {estado[1]} páginas copiadas).")
+        else:
+            print(f"\nCheckpoint del WAL: {estado[2]} páginas copiadas a la base.")
+    finally:
+        conn.close()
+
+
+def lote_actual(db_path):
+    """Último lote del registro de cambios de la base, o 0 si la base todavía no existe."""
+    if not os.path.exists(db_path):
+        return 0
+    conn = conectar(db_path)
+    try:
+        return ultimo_lote(conn)
+    finally:
+        conn.close()
+
+
+def compactar_registro(db_path, desde_lote):
+    """
+    Las tablas que la reconstrucción cargó desde cero quedan con un lote completo por el
+    primer archivo y uno con todas las llaves por cada archivo siguiente; esos lotes
+    también se marcan como completos, sin llaves (ver utils/cambios.py).
+    """
+    conn = conectar(db_path)
+    try:
+        borradas = compactar_lotes(conn, desde_lote)
+        if borradas:
+            print(f"\nRegistro de cambios: se quitaron {borradas} llaves de las tablas cargadas desde cero.")
+    finally:
+        conn.close()
+
+
+def reconstruir(pasos, procesos=4, forzar=False, detalle=False):
+    """
+    Ejecuta los pasos y muestra el tiempo de cada uno y el camino crítico.
+
+    Returns:
+        pd.DataFrame: Resumen por paso.
+    """
+    print(f"Reconstruyendo la base con {len(pasos)} pasos ({procesos} en paralelo)...")
+    inicio = time.perf_counter()
+    lote_inicial = lote_actual(DB_PATH)
+    resultados = ejecutar_dag(pasos, lambda nombre, paso: ejecutar_paso(nombre, paso, forzar), procesos)
+    total = time.perf_counter() - inicio
+
+    filas = []
+    for nombre, r in resultados.items():
+        estado = 'omitido' if r.get('omitido') else r['estado']
+        filas.append({
+            'paso': nombre, 'estado': estado, 'db': 'sí' if pasos[nombre].get('escribe_db') else '',
+            'inicio': r.get('inicio'), 'espera': r.get('espera'), 'segundos': r.get('segundos'),
+        })
+        if detalle or r['estado'] != 'ok':
+            print(f"\n--- {nombre} ({estado}) ---\n{r.get('log', '').rstrip()}")
+
+    resumen = pd.DataFrame(filas).sort_values(['inicio', 'paso'], na_position='last').reset_index(drop=True)
+    print("\nTiempos por paso (segundos desde el inicio de la reconstrucción):")
+    print(resumen.to_string(index=False))
+
+    if (resumen['db'] == 'sí').any() and os.path.exists(DB_PATH):
+        compactar_registro(DB_PATH, lote_inicial)
+        compactar_wal(DB_PATH)
+
+    camino, duracion = camino_critico(pasos, resultados)
+    suma = sum(r.get('segundos', 0.0) for r in resultados.values())
+    print(f"\nCamino crítico ({duracion}s): {' -> '.join(camino)}")
+    print(f"Tiempo total: {total:.2f}s (suma de los pasos: {suma:.2f}s)")
+    return resumen
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reconstruye la base de datos ejecutando limpiadores e importadores según sus dependencias.')
+    parser.add_argument('--pasos', nargs='+', help='Ejecuta solo estos pasos (y sus dependencias).')
+    parser.add_argument('--procesos', type=int, default=4, help='Cantidad máxima de pasos simultáneos.')
+    parser.add_argument('--force', action='store_true', help='Reprocesa aunque las entradas no hayan cambiado.')
+    parser.add_argument('--detalle', action='store_true', help='Muestra la salida de todos los pasos, no solo la de los fallidos.')
+    parser.add_argument('--plan', action='store_true', help='Solo muestra el orden de los pasos, sin ejecutarlos.')
+    parser.add_argument('--resumen', help='Ruta opcional de un CSV donde guardar el resumen.')
+    parser.add_argument('--publicar', action='store_true', help='Si todo terminó bien, publica una versión nueva de la base para el dashboard.')
+    args = parser.parse_args()
+
+    try:
+        pasos = seleccionar_pasos(args.pasos) if args.pasos else PASOS
+        orden = orden_topologico(pasos)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.plan:
+        for nombre in orden:
+            deps = ', '.join(pasos[nombre].get('depende_de', [])) or '-'
+            print(f"{nombre:<32} {'[db]' if pasos[nombre].get('escribe_db') else '    '} depende de: {deps}")
+        sys.exit(0)
+
+    resumen = reconstruir(pasos, args.procesos, args.force, args.detalle)
+    if args.resumen:
+        resumen.to_csv(args.resumen, index=False, encoding='utf-8')
+        print(f"\nResumen guardado en '{args.resumen}'.")
+
+    if (resumen['estado'].isin(['error', 'bloqueado'])).any():
+        sys.exit(1)
+
+    # El dashboard sigue con la versión publicada anterior hasta que la nueva se valida.
+    if args.publicar and not publicar_version(DB_PATH):
+        sys.exit(1)
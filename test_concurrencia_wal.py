@@ -0,0 +1,151 @@
+import argparse
+import contextlib
+import glob
+import io
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+# Prueba de concurrencia: importa inscripciones a carreras (como el cargador de
+# Streamlit) en un proceso aparte mientras varios hilos ejecutan sin parar las consultas
+# del dashboard sobre la misma base. Con WAL, busy timeout y reintentos ninguna consulta
+# debería fallar ni devolver un resultado vacío durante la importación.
+#
+# Trabaja sobre una copia de academica.db, así que primero hay que construir la base:
+#   python reconstruir_base.py
+#   python test_concurrencia_wal.py --lectores 4
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from dash_dashboard.data import loader
+from utils.conexion import conectar
+from utils.pipeline_carga import ejecutar_pipeline
+
+DB_FILEPATH = os.path.join(BASE_DIR, 'data', 'base_de_datos', 'academica.db')
+CONSULTAS_DIR = os.path.join(BASE_DIR, 'data', 'base_de_datos', 'consultas')
+
+# Consultas del dashboard que se ejecutan durante la importación. Las primeras leen la
+# tabla que se está escribiendo.
+CONSULTAS = [
+    loader.cargar_inscriptos_grado_por_dia,
+    loader.cargar_inscripciones_por_anio_carrera,
+    loader.cargar_inscriptos_grado_y_pregrado_por_dia,
+    loader.cargar_nuevos_inscriptos_historico,
+    loader.cargar_total_egresados_por_tipo,
+    loader.cargar_estudiantes_activos,
+]
+
+
+def importar(archivos, db_filepath, resultado):
+    """Importa los reportes de inscripciones a carreras, uno por año, en la base de prueba."""
+    for archivo in archivos:
+        anio = int(re.search(r'(20\d{2})', os.path.basename(archivo)).group(1))
+        salida = ejecutar_pipeline('carreras', archivo, anio, guardar_csv=False, db_filepath=db_filepath,
+                                   log=lambda etapa, texto: None)
+        resultado.put((anio, salida['ok'], salida['segundos']))
+
+
+def martillar(consulta, detener, estadisticas, bloqueo):
+    """Ejecuta `consulta` en un ciclo hasta que se pida detener, registrando fallas y tiempos."""
+    while not detener.is_set():
+        inicio = time.perf_counter()
+        datos = consulta()
+        segundos = time.perf_counter() - inicio
+        with bloqueo:
+            estadisticas['consultas'] += 1
+            estadisticas['max_segundos'] = max(estadisticas['max_segundos'], segundos)
+            if len(datos) == 0:
+                estadisticas['vacias'] += 1
+                estadisticas['fallidas'].add(consulta.__name__)
+
+
+def preparar_copia(directorio):
+    """
+    Copia la base (y las consultas SQL del dashboard) y altera una columna de todas las
+    inscripciones a carreras, para que la importación tenga que reescribir cada fila
+    mientras las consultas siguen encontrando datos.
+    """
+    destino = os.path.join(directorio, 'data', 'base_de_datos')
+    os.makedirs(destino)
+    conn = conectar(DB_FILEPATH)
+    try:
+        # La copia con la API de backup incluye lo que todavía esté en el WAL.
+        copia = conectar(os.path.join(destino, 'academica.db'))
+        conn.backup(copia)
+        copia.execute("UPDATE inscripciones_carreras SET estado_insc = 'pendiente'")
+        copia.commit()
+        copia.close()
+    finally:
+        conn.close()
+    shutil.copytree(CONSULTAS_DIR, os.path.join(destino, 'consultas'))
+    return os.path.join(destino, 'academica.db')
+
+
+def correr_prueba(lectores, patron):
+    archivos = sorted(glob.glob(os.path.join(BASE_DIR, patron)))
+    if not os.path.exists(DB_FILEPATH) or not archivos:
+        print(f"Error: hace falta la base construida y al menos un reporte ({patron}).")
+        return False
+
+    with tempfile.TemporaryDirectory() as directorio:
+        db_prueba = preparar_copia(directorio)
+        loader.project_root = directorio
+
+        # Solo se controlan las consultas que devuelven datos antes de importar.
+        with contextlib.redirect_stdout(io.StringIO()):
+            con_datos = [consulta for consulta in CONSULTAS if len(consulta()) > 0]
+        print(f"-> {len(con_datos)} de {len(CONSULTAS)} consultas devuelven datos antes de importar.")
+        print(f"-> Importando {len(archivos)} reportes con {lectores} lectores por consulta...")
+
+        # 'spawn': un fork con los hilos lectores corriendo puede heredar bloqueos tomados.
+        contexto = multiprocessing.get_context('spawn')
+        resultado = contexto.Queue()
+        proceso = contexto.Process(target=importar, args=(archivos, db_prueba, resultado))
+        detener = threading.Event()
+        bloqueo = threading.Lock()
+        estadisticas = {'consultas': 0, 'vacias': 0, 'max_segundos': 0.0, 'fallidas': set()}
+        hilos = [threading.Thread(target=martillar, args=(consulta, detener, estadisticas, bloqueo))
+                 for consulta in con_datos for _ in range(lectores)]
+
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()) as salida:
+            for hilo in hilos:
+                hilo.start()
+            proceso.start()
+            proceso.join()
+            detener.set()
+            for hilo in hilos:
+                hilo.join()
+        total = time.perf_counter() - inicio
+
+        importados = [resultado.get() for _ in archivos]
+        errores = [linea for linea in salida.getvalue().splitlines() if 'Error' in linea]
+
+    importacion_ok = proceso.exitcode == 0 and all(ok for _, ok, _ in importados)
+    for anio, ok, segundos in importados:
+        print(f"   {anio}: {'ok' if ok else 'ERROR'} {segundos}")
+    print(f"-> Importación {'completa' if importacion_ok else 'con errores'} en {total:.2f}s.")
+    print(f"-> {estadisticas['consultas']} consultas durante la importación; "
+          f"{estadisticas['vacias']} vacías o fallidas; la más lenta tardó {estadisticas['max_segundos']:.2f}s.")
+    for linea in errores[:10]:
+        print(f"   {linea}")
+
+    exito = importacion_ok and estadisticas['vacias'] == 0
+    print("\nPRUEBA SUPERADA" if exito else f"\nPRUEBA FALLIDA: {sorted(estadisticas['fallidas'])}")
+    return exito
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Importa inscripciones mientras se ejecutan las consultas del dashboard en paralelo.')
+    parser.add_argument('--lectores', type=int, default=2, help='Hilos que repiten cada consulta.')
+    parser.add_argument('--patron', default='data/crudos/insc_carreras_20*.xlsx', help='Reportes a importar.')
+    args = parser.parse_args()
+
+    if not correr_prueba(args.lectores, args.patron):
+        sys.exit(1)
@@ -0,0 +1,75 @@
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+
+# Prueba del registro de cambios: importar dos veces el mismo CSV, sin tocarlo, tiene que
+# dejar un segundo lote de importación sin llaves insertadas, actualizadas ni eliminadas,
+# aunque el archivo repita alguna llave (como pasa en los reportes de SIU Guaraní).
+#
+# Trabaja sobre una base temporal, así que no hace falta construir academica.db:
+#   python test_reimportacion_sin_cambios.py
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from utils.cambios import TABLA_CAMBIOS, TABLA_LOTES
+from utils.importacion import importar_tabla
+
+# Planes de estudio con una llave repetida (propuesta 'CP', plan '2019') cuyas filas difieren:
+# si se escribiera una vez por copia, cada reimportación la contaría como actualizada.
+CSV_PLANES = """propuesta,plan,actualizado,nombre_largo,total_materias
+CP,2019,2023-03-01,Contador Público,36
+CP,2019,2024-03-01,Contador Público,38
+LA,2019,2023-03-01,Licenciatura en Administración,34
+LE,2020,2022-08-01,Licenciatura en Economía,35
+"""
+
+
+def leer_lote(db_filepath, lote_id):
+    conn = sqlite3.connect(db_filepath)
+    try:
+        insertados, actualizados, eliminados = conn.execute(
+            f"SELECT insertados, actualizados, eliminados FROM {TABLA_LOTES} WHERE lote_id = ?", (lote_id,)).fetchone()
+        operaciones = dict(conn.execute(
+            f"SELECT operacion, COUNT(*) FROM {TABLA_CAMBIOS} WHERE lote_id = ? GROUP BY operacion", (lote_id,)).fetchall())
+        guardado = conn.execute("SELECT total_materias FROM planes WHERE propuesta = 'CP' AND plan = '2019'").fetchone()[0]
+    finally:
+        conn.close()
+    return (insertados, actualizados, eliminados), operaciones, guardado
+
+
+def correr_prueba():
+    with tempfile.TemporaryDirectory() as directorio:
+        csv_filepath = os.path.join(directorio, 'planes.csv')
+        db_filepath = os.path.join(directorio, 'academica.db')
+        with open(csv_filepath, 'w', encoding='utf-8') as f:
+            f.write(CSV_PLANES)
+
+        resultados = []
+        with contextlib.redirect_stdout(io.StringIO()) as salida:
+            for _ in range(2):
+                resultados.append(importar_tabla(csv_filepath, db_filepath, 'planes'))
+        if not all(resultados):
+            print(salida.getvalue())
+            print("\nPRUEBA FALLIDA: la importación no terminó bien.")
+            return False
+
+        primero, _, _ = leer_lote(db_filepath, resultados[0]['lote'])
+        segundo, operaciones, guardado = leer_lote(db_filepath, resultados[1]['lote'])
+
+    print(f"-> Primera importación: {primero[0]} insertadas, {primero[1]} actualizadas y {primero[2]} eliminadas.")
+    print(f"-> Reimportación: {segundo[0]} insertadas, {segundo[1]} actualizadas y {segundo[2]} eliminadas; "
+          f"{sum(operaciones.values())} llaves en el registro de cambios.")
+    print(f"-> Materias del plan repetido: {guardado} (se conserva la última fila).")
+
+    exito = primero == (3, 0, 0) and segundo == (0, 0, 0) and not operaciones and guardado == 38
+    print("\nPRUEBA SUPERADA" if exito else "\nPRUEBA FALLIDA")
+    return exito
+
+
+if __name__ == '__main__':
+    if not correr_prueba():
+        sys.exit(1)
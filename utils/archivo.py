@@ -0,0 +1,274 @@
+import datetime
+import os
+import re
+import sqlite3
+
+import pandas as pd
+
+from utils.conexion import checkpoint, conectar
+
+# Archivo de años cerrados. Las tablas de TABLAS_ARCHIVADAS guardan todos los años desde
+# 1994 o 2006, pero la mayoría de las consultas del dashboard solo leen los últimos. Con
+# `archivar`, las filas de los años anteriores al corte se mueven de academica.db (la
+# base caliente) a academica_archivo.db, y la base caliente queda chica y entra en la
+# caché del sistema operativo.
+#
+# Las filas de una persona (estudiantes y aspirantes) se archivan solo si ninguna de sus
+# filas es del corte en adelante: así las consultas de años recientes que cruzan por
+# persona (primer ingreso, cohortes) siguen viendo su historia completa sin el archivo.
+#
+# Una consulta que necesita años viejos lo pide con `adjuntar_archivo(conn, db_path,
+# desde)`: si algún corte es posterior a `desde`, se adjunta el archivo y se crean vistas
+# temporales con el nombre de cada tabla (main UNION ALL archivo) que tapan a las de la
+# base caliente, así que la consulta no cambia. Los importadores actualizan en el archivo
+# las filas que ya están ahí (ver `separar_archivadas`).
+#
+#     python db_scripts/archivar_anios.py                 # conserva ANIOS_CALIENTES años
+#     python db_scripts/archivar_anios.py --corte 2020
+
+SUFIJO_ARCHIVO = '_archivo'
+ESQUEMA = 'archivo'
+TABLA_CORTES = 'archivo_cortes'
+
+# Años que quedan en la base caliente, contando el año académico en curso.
+ANIOS_CALIENTES = 5
+
+# Para `adjuntar_archivo`: la consulta necesita todos los años.
+TODOS_LOS_ANIOS = 0
+
+# Tablas que se archivan: expresión SQL del año de cada fila y, si corresponde, la
+# columna de la persona (las filas de una persona con años recientes no se archivan).
+TABLAS_ARCHIVADAS = {
+    'inscripciones_cursadas': {'anio': 'CAST(substr("periodo", 1, 4) AS INTEGER)'},
+    'egresados': {'anio': '"anio_academico"'},
+    'estudiantes': {'anio': '"ano_ingreso"', 'persona': 'tipo_y_n_documento'},
+    'aspirantes': {'anio': '"ano_ingreso"', 'persona': 'tipo_y_n_documento'},
+}
+
+
+def ruta_archivo(db_path):
+    """Archivo de una base: academica.db -> academica_archivo.db (también para las versiones publicadas)."""
+    base, extension = os.path.splitext(db_path)
+    return f"{base}{SUFIJO_ARCHIVO}{extension}"
+
+
+def leer_cortes(conn):
+    """Tabla -> primer año que queda en la base caliente; vacío si nunca se archivó."""
+    try:
+        return dict(conn.execute(f"SELECT tabla, corte FROM main.{TABLA_CORTES}").fetchall())
+    except sqlite3.OperationalError:
+        return {}
+
+
+def columnas(conn, tabla, esquema='main'):
+    return [fila[1] for fila in conn.execute(f"PRAGMA {esquema}.table_info({tabla})").fetchall()]
+
+
+def adjuntar(conn, db_path):
+    """ATTACH del archivo de `db_path` como ESQUEMA (fuera de una transacción)."""
+    if ESQUEMA not in [fila[1] for fila in conn.execute("PRAGMA database_list").fetchall()]:
+        conn.execute(f"ATTACH DATABASE ? AS {ESQUEMA}", (ruta_archivo(db_path),))
+
+
+def adjuntar_archivo(conn, db_path, desde=TODOS_LOS_ANIOS):
+    """
+    Si la consulta necesita años anteriores a algún corte, adjunta el archivo y tapa
+    cada tabla archivada con una vista temporal que une la base caliente y el archivo.
+
+    Args:
+        conn (sqlite3.Connection): Conexión de lectura sobre `db_path`.
+        db_path (str): Base abierta por la conexión (la de trabajo o una versión publicada).
+        desde (int): Primer año que lee la consulta.
+
+    Returns:
+        bool: True si se adjuntó el archivo.
+    """
+    tablas = [tabla for tabla, corte in leer_cortes(conn).items() if corte is not None and desde < corte]
+    if not tablas:
+        return False
+    if not os.path.exists(ruta_archivo(db_path)):
+        print(f"Advertencia: No se encontró el archivo '{ruta_archivo(db_path)}'; se leen solo los años recientes.")
+        return False
+    adjuntar(conn, db_path)
+    for tabla in tablas:
+        cols = ', '.join(f'"{col}"' for col in columnas(conn, tabla))
+        conn.execute(f"CREATE TEMP VIEW IF NOT EXISTS {tabla} AS "
+                     f"SELECT {cols} FROM main.{tabla} UNION ALL SELECT {cols} FROM {ESQUEMA}.{tabla}")
+    return True
+
+
+def asegurar_tabla_archivo(cursor, tabla):
+    """
+    Crea la tabla en el archivo con el esquema de la base caliente (sin índices
+    secundarios) y le agrega las columnas que le falten.
+    """
+    sql = cursor.execute("SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (tabla,)).fetchone()[0]
+    cursor.execute(re.sub(r'^CREATE TABLE\s+("?)\w+\1', f'CREATE TABLE IF NOT EXISTS {ESQUEMA}."{tabla}"', sql))
+    existentes = set(columnas(cursor, tabla, ESQUEMA))
+    for _, col, tipo, *_ in cursor.execute(f"PRAGMA main.table_info({tabla})").fetchall():
+        if col not in existentes:
+            cursor.execute(f'ALTER TABLE {ESQUEMA}."{tabla}" ADD COLUMN "{col}" {tipo}')
+
+
+def separar_archivadas(conn, db_path, tabla, df, llave):
+    """
+    Separa los registros a importar cuyas llaves ya están en el archivo, para que una
+    reimportación los actualice ahí y no vuelvan a la base caliente. Adjunta el archivo
+    a la conexión si la tabla tiene filas archivadas (llamar fuera de una transacción).
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame | None]: Los registros de la base caliente y los
+        del archivo (None si la tabla no tiene filas archivadas).
+    """
+    if tabla not in leer_cortes(conn) or not os.path.exists(ruta_archivo(db_path)):
+        return df, None
+    adjuntar(conn, db_path)
+    cursor = conn.cursor()
+    asegurar_tabla_archivo(cursor, tabla)
+    conn.commit()
+    cols = ', '.join(f'"{col}"' for col in llave)
+    archivadas = pd.read_sql_query(f"SELECT {cols} FROM {ESQUEMA}.{tabla}", conn)
+    en_archivo = pd.MultiIndex.from_frame(df[llave].astype(str)).isin(pd.MultiIndex.from_frame(archivadas.astype(str)))
+    return df[~en_archivo], df[en_archivo]
+
+
+def anio_en_curso(cursor):
+    """Año académico en curso según la tabla anio_academico (o el año calendario)."""
+    try:
+        fila = cursor.execute(
+            "SELECT MAX(anio) FROM anio_academico WHERE inicio <= date('now', 'localtime')").fetchone()
+    except sqlite3.OperationalError:
+        fila = None
+    return fila[0] if fila and fila[0] else datetime.date.today().year
+
+
+def _condicion(tabla, corte):
+    """Condición SQL de las filas de `tabla` que van al archivo."""
+    config = TABLAS_ARCHIVADAS[tabla]
+    condicion = f"{config['anio']} < {int(corte)}"
+    if 'persona' in config:
+        condicion += f' AND "{config["persona"]}" NOT IN (SELECT persona FROM temp._personas_activas)'
+    return condicion
+
+
+def _personas_activas(cursor, tablas, corte):
+    """Tabla temporal con las personas que tienen alguna fila del corte en adelante."""
+    cursor.execute("DROP TABLE IF EXISTS temp._personas_activas")
+    cursor.execute("CREATE TEMP TABLE _personas_activas (persona TEXT PRIMARY KEY) WITHOUT ROWID")
+    for tabla in tablas:
+        config = TABLAS_ARCHIVADAS[tabla]
+        if 'persona' not in config:
+            continue
+        for esquema in ('main', ESQUEMA):
+            cursor.execute(f"""
+                INSERT OR IGNORE INTO temp._personas_activas
+                SELECT "{config['persona']}" FROM {esquema}.{tabla}
+                WHERE {config['anio']} >= {int(corte)} AND "{config['persona']}" IS NOT NULL
+            """)
+
+
+def archivar(db_path, corte=None, vacuum=True):
+    """
+    Mueve al archivo las filas de los años anteriores a `corte` y devuelve a la base
+    caliente las archivadas que ya no corresponden (por ejemplo, con un corte menor o de
+    una persona que volvió a inscribirse). Todo en una transacción; después se compactan
+    los dos archivos con VACUUM.
+
+    Args:
+        db_path (str): Ruta a la base de datos caliente.
+        corte (int, optional): Primer año que queda en la base caliente. Por defecto,
+            el año académico en curso menos ANIOS_CALIENTES - 1. No puede ser posterior
+            al año en curso: solo se archivan años cerrados.
+        vacuum (bool): Compacta las dos bases si se movieron filas.
+
+    Returns:
+        dict | None: Tabla -> {'archivadas', 'restauradas', 'calientes', 'en_archivo'},
+        o None si hubo un error.
+    """
+    print(f"Iniciando el archivo de años cerrados de '{db_path}'...")
+    if not os.path.exists(db_path):
+        print(f"Error: No se encontró la base de datos en {db_path}")
+        return None
+
+    try:
+        conn = conectar(db_path)
+        cursor = conn.cursor()
+    except Exception as e:
+        print(f"Ocurrió un error al conectar con la base de datos: {e}")
+        return None
+
+    try:
+        en_curso = anio_en_curso(cursor)
+        corte = en_curso - ANIOS_CALIENTES + 1 if corte is None else int(corte)
+        if corte > en_curso:
+            print(f"Error: El corte ({corte}) no puede ser posterior al año académico en curso ({en_curso}).")
+            return None
+        tablas = [fila[0] for fila in cursor.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")
+                  if fila[0] in TABLAS_ARCHIVADAS]
+        print(f"-> Se archivan los años anteriores a {corte} de: {', '.join(tablas)}.")
+
+        # Una transacción sobre dos archivos no es atómica en modo WAL: primero se copian
+        # las filas a su destino y después, en otra transacción, se borran del origen. Si
+        # algo se corta en el medio quedan filas repetidas (la próxima ejecución las
+        # resuelve), nunca filas perdidas.
+        adjuntar(conn, db_path)
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS main.{TABLA_CORTES} (
+                tabla TEXT PRIMARY KEY,
+                corte INTEGER NOT NULL,
+                actualizado TEXT NOT NULL
+            )
+        """)
+        for tabla in tablas:
+            asegurar_tabla_archivo(cursor, tabla)
+        _personas_activas(cursor, tablas, corte)
+        for tabla in tablas:
+            cols = ', '.join(f'"{col}"' for col in columnas(conn, tabla))
+            condicion = _condicion(tabla, corte)
+            # La base caliente tiene la versión más nueva de una fila repetida. Con años
+            # NULL la condición es NULL: esas filas quedan en la base caliente.
+            cursor.execute(f"INSERT OR REPLACE INTO {ESQUEMA}.{tabla} ({cols}) SELECT {cols} FROM main.{tabla} WHERE {condicion}")
+            cursor.execute(f"INSERT OR IGNORE INTO main.{tabla} ({cols}) SELECT {cols} FROM {ESQUEMA}.{tabla} WHERE NOT COALESCE({condicion}, 0)")
+        conn.commit()
+
+        cursor.execute("BEGIN IMMEDIATE")
+        resultados = {}
+        for tabla in tablas:
+            condicion = _condicion(tabla, corte)
+            cursor.execute(f"DELETE FROM main.{tabla} WHERE {condicion}")
+            archivadas = cursor.rowcount
+            cursor.execute(f"DELETE FROM {ESQUEMA}.{tabla} WHERE NOT COALESCE({condicion}, 0)")
+            restauradas = cursor.rowcount
+            cursor.execute(f"INSERT OR REPLACE INTO main.{TABLA_CORTES} VALUES (?, ?, datetime('now', 'localtime'))", (tabla, corte))
+            resultados[tabla] = {
+                'archivadas': archivadas,
+                'restauradas': restauradas,
+                'calientes': cursor.execute(f"SELECT COUNT(*) FROM main.{tabla}").fetchone()[0],
+                'en_archivo': cursor.execute(f"SELECT COUNT(*) FROM {ESQUEMA}.{tabla}").fetchone()[0],
+            }
+            print(f"-> {tabla}: {archivadas} filas archivadas y {restauradas} restauradas "
+                  f"({resultados[tabla]['calientes']} en la base, {resultados[tabla]['en_archivo']} en el archivo).")
+        conn.commit()
+        cursor.execute("DROP TABLE IF EXISTS temp._personas_activas")
+        cursor.execute(f"DETACH DATABASE {ESQUEMA}")
+
+        if vacuum and any(r['archivadas'] or r['restauradas'] for r in resultados.values()):
+            for ruta in (db_path, ruta_archivo(db_path)):
+                antes = os.path.getsize(ruta)
+                compactar = conectar(ruta)
+                try:
+                    compactar.execute("VACUUM")
+                    checkpoint(compactar, 'TRUNCATE')
+                finally:
+                    compactar.close()
+                print(f"-> VACUUM de '{ruta}': {antes / 1e6:.1f} MB -> {os.path.getsize(ruta) / 1e6:.1f} MB.")
+        return resultados
+    except Exception as e:
+        if conn.in_transaction:
+            conn.rollback()
+        print(f"Ocurrió un error durante el archivo: {e}")
+        return None
+    finally:
+        conn.close()
+        print("-> Conexión con la base de datos cerrada.")
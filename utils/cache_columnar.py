@@ -0,0 +1,174 @@
+import datetime
+import glob
+import importlib.util
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.manifiesto import hash_archivo
+
+# La primera lectura de cada archivo crudo se guarda en formato columnar (Parquet) en
+# data/cache/, con el hash del contenido en el nombre. Las lecturas siguientes cargan
+# el Parquet en milisegundos; si el Excel cambia, cambia el hash y se vuelve a leer.
+# Requiere `pyarrow`; si no está instalado, se lee siempre el archivo original.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, 'data', 'cache')
+
+# Permite desactivar la caché sin tocar el código, ej: EEYN_SIN_CACHE=1
+VARIABLE_SIN_CACHE = 'EEYN_SIN_CACHE'
+
+# Los reportes leídos con header=None tienen columnas de tipo object que mezclan textos,
+# enteros, decimales (NaN en las celdas vacías) y fechas. Parquet no admite columnas
+# mixtas, así que cada una se separa en una columna por tipo y se recompone al leer.
+TIPOS_SOPORTADOS = {str: 'str', int: 'int', float: 'float', datetime.datetime: 'fecha'}
+SEPARADOR = '__'
+
+
+def cache_disponible():
+    """Indica si se puede usar la caché (pyarrow instalado y no desactivada por variable)."""
+    if os.environ.get(VARIABLE_SIN_CACHE):
+        return False
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def _prefijo_cache(filepath, variante):
+    """Prefijo de los archivos de caché de un archivo de origen, derivado de su ruta."""
+    try:
+        relativa = os.path.relpath(os.path.abspath(filepath), BASE_DIR)
+    except ValueError:
+        relativa = os.path.abspath(filepath)
+    nombre = re.sub(r'[^A-Za-z0-9_.-]+', '_', relativa)
+    return os.path.join(CACHE_DIR, f"{nombre}.{variante}")
+
+
+def _separar_por_tipo(df):
+    """
+    Convierte el DataFrame en uno apto para Parquet. Devuelve None si alguna columna
+    tiene valores de un tipo que no se sabe recomponer.
+    """
+    columnas = {}
+    for i in range(df.shape[1]):
+        serie = df.iloc[:, i]
+        clave = str(i)
+        if serie.dtype != object:
+            columnas[f"{clave}{SEPARADOR}directo"] = serie.to_numpy()
+            continue
+
+        tipos = serie.map(type)
+        if not set(tipos.unique()) <= set(TIPOS_SOPORTADOS):
+            return None
+        datos = serie.to_numpy()
+        for tipo, sufijo in TIPOS_SOPORTADOS.items():
+            mascara = (tipos == tipo).to_numpy()
+            # La parte 'float' se guarda siempre: es la base sobre la que se recompone la columna.
+            if sufijo != 'float' and not mascara.any():
+                continue
+            valores = np.where(mascara, datos, None)
+            if sufijo == 'float':
+                valores = valores.astype(float)
+            elif sufijo == 'int':
+                valores = pd.array(valores, dtype='Int64')
+            elif sufijo == 'fecha':
+                valores = pd.to_datetime(valores)
+            columnas[f"{clave}{SEPARADOR}{sufijo}"] = valores
+
+    return pd.DataFrame(columnas).reset_index(drop=True)
+
+
+def _recomponer(df_cache, indice):
+    """Vuelve a armar las columnas originales a partir de las columnas separadas por tipo."""
+    grupos = {}
+    for columna in df_cache.columns:
+        posicion, sufijo = columna.split(SEPARADOR)
+        grupos.setdefault(int(posicion), {})[sufijo] = df_cache[columna]
+
+    resultado = {}
+    for posicion, partes in sorted(grupos.items()):
+        if 'directo' in partes:
+            resultado[posicion] = partes['directo'].to_numpy()
+            continue
+        valores = partes['float'].to_numpy(dtype=object)
+        for sufijo in ('int', 'fecha', 'str'):
+            if sufijo not in partes:
+                continue
+            parte = partes[sufijo]
+            mascara = parte.notna().to_numpy()
+            if sufijo == 'int':
+                valores[mascara] = parte[mascara].to_numpy(dtype='int64').astype(object)
+            elif sufijo == 'fecha':
+                valores[mascara] = parte[mascara].dt.to_pydatetime()
+            else:
+                valores[mascara] = parte[mascara].to_numpy()
+        resultado[posicion] = valores
+
+    return pd.DataFrame(resultado, index=indice)
+
+
+def leer_con_cache(filepath, lector, variante='reporte'):
+    """
+    Lee `filepath` con `lector(filepath)` la primera vez y guarda el resultado en la
+    caché columnar; las siguientes veces, mientras el contenido del archivo no cambie,
+    devuelve el DataFrame desde la caché.
+
+    Args:
+        filepath (str): Archivo de origen (Excel o CSV).
+        lector (callable): Función que lee el archivo y devuelve un DataFrame.
+        variante (str): Distingue lecturas distintas del mismo archivo (ej: 'reporte', 'csv').
+
+    Returns:
+        pd.DataFrame: El mismo resultado que `lector(filepath)`.
+    """
+    if not cache_disponible():
+        return lector(filepath)
+
+    prefijo = _prefijo_cache(filepath, variante)
+    ruta = f"{prefijo}.{hash_archivo(filepath)[:16]}.parquet"
+
+    if os.path.exists(ruta):
+        try:
+            df_cache = pd.read_parquet(ruta)
+            columnas = df_cache.attrs.get('columnas')
+            df = _recomponer(df_cache, pd.RangeIndex(len(df_cache)))
+            if columnas is not None:
+                df.columns = columnas
+            return df
+        except Exception as e:
+            print(f"Advertencia: No se pudo leer la caché '{ruta}' ({e}). Se leerá el archivo original.")
+
+    df = lector(filepath)
+    _guardar_cache(df, prefijo, ruta)
+    return df
+
+
+def _guardar_cache(df, prefijo, ruta):
+    """Guarda el DataFrame en la caché y borra las versiones anteriores del mismo archivo."""
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        return
+    try:
+        df_cache = _separar_por_tipo(df)
+        if df_cache is None:
+            return
+        df_cache.attrs['columnas'] = list(df.columns)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        df_cache.to_parquet(temporal, index=False)
+        os.replace(temporal, ruta)
+    except Exception as e:
+        print(f"Advertencia: No se pudo guardar la caché '{ruta}' ({e}).")
+        return
+
+    for anterior in glob.glob(glob.escape(prefijo) + '.*.parquet'):
+        if anterior != ruta:
+            os.remove(anterior)
+
+
+def limpiar_cache():
+    """Borra todos los archivos de la caché columnar."""
+    borrados = 0
+    for archivo in glob.glob(os.path.join(CACHE_DIR, '*.parquet')):
+        os.remove(archivo)
+        borrados += 1
+    return borrados
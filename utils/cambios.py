@@ -0,0 +1,239 @@
+import contextlib
+import datetime
+import json
+
+import pandas as pd
+
+# Registro de cambios de las importaciones. Cada ejecución de un importador sobre una
+# tabla es un lote de importación (una fila en TABLA_LOTES, con su origen, horarios y
+# conteos) y cada llave primaria insertada, actualizada o eliminada queda en
+# TABLA_CAMBIOS con su operación. Los cambios se capturan con triggers temporales que
+# solo existen mientras dura la importación, dentro de la misma transacción que los
+# datos: si la importación se deshace, su registro también.
+#
+# Así, quien mantiene datos derivados (tablas de resumen, cachés del dashboard) puede
+# recalcular solo los años, carreras o períodos afectados:
+#
+#     cambios = cambios_desde(conn, 'inscripciones_cursadas', ultimo_lote_procesado)
+#     periodos = cambios['periodo'].unique()
+
+TABLA_LOTES = 'lotes_importacion'
+TABLA_CAMBIOS = 'registro_cambios'
+
+# Operaciones del registro: 'I' inserción, 'U' actualización y 'D' eliminación.
+OPERACIONES = {'INSERT': 'I', 'UPDATE': 'U', 'DELETE': 'D'}
+
+# Lotes que se conservan por tabla; los cambios de los anteriores se borran.
+LOTES_CONSERVADOS = 30
+
+
+def asegurar_tablas(cursor):
+    """Crea las tablas del registro de cambios si no existen."""
+    # AUTOINCREMENT: los números de lote no se reutilizan aunque se borren lotes viejos.
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {TABLA_LOTES} (
+        lote_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tabla TEXT NOT NULL,
+        llave TEXT NOT NULL,
+        origen TEXT,
+        completo INTEGER NOT NULL DEFAULT 0,
+        inicio TEXT NOT NULL,
+        fin TEXT,
+        insertados INTEGER,
+        actualizados INTEGER,
+        eliminados INTEGER
+    )
+    """)
+    # Una fila por llave y lote (sin rowid: la llave primaria es el único índice).
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {TABLA_CAMBIOS} (
+        lote_id INTEGER NOT NULL,
+        llave TEXT NOT NULL,
+        operacion TEXT NOT NULL,
+        PRIMARY KEY (lote_id, llave)
+    ) WITHOUT ROWID
+    """)
+
+
+def _ahora():
+    return datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _crear_triggers(cursor, tabla, llave, lote_id):
+    """
+    Triggers temporales que anotan en TABLA_CAMBIOS la llave de cada fila modificada.
+    Si la llave ya figura en el lote, las operaciones se combinan: una fila borrada y
+    vuelta a insertar (ej: un período que se reemplaza completo) queda como
+    actualización, una insertada y después actualizada sigue como inserción y una
+    insertada y después borrada queda marcada con 'X' para descartarla al cerrar el lote.
+    """
+    for evento, operacion in OPERACIONES.items():
+        fila = 'OLD' if evento == 'DELETE' else 'NEW'
+        valores = ', '.join(f'{fila}."{col}"' for col in llave)
+        cursor.execute(f"""
+        CREATE TEMP TRIGGER IF NOT EXISTS _cambios_{tabla}_{operacion} AFTER {evento} ON main.{tabla}
+        BEGIN
+            INSERT INTO {TABLA_CAMBIOS} (lote_id, llave, operacion) VALUES ({lote_id}, json_array({valores}), '{operacion}')
+            ON CONFLICT (lote_id, llave) DO UPDATE SET operacion = CASE
+                WHEN excluded.operacion = 'D' THEN IIF(operacion = 'I', 'X', 'D')
+                WHEN excluded.operacion = 'I' THEN IIF(operacion = 'X', 'I', 'U')
+                ELSE operacion END;
+        END
+        """)
+
+
+def _borrar_triggers(cursor, tabla):
+    for operacion in OPERACIONES.values():
+        cursor.execute(f"DROP TRIGGER IF EXISTS temp._cambios_{tabla}_{operacion}")
+
+
+def _cerrar_lote(cursor, tabla, lote_id, completo):
+    """
+    Descarta las filas insertadas y borradas dentro del lote, guarda sus conteos y borra
+    los lotes viejos de la tabla. En un lote completo se cuentan las filas de la tabla.
+    """
+    if completo:
+        conteos = {'I': cursor.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]}
+    else:
+        cursor.execute(f"DELETE FROM {TABLA_CAMBIOS} WHERE lote_id = ? AND operacion = 'X'", (lote_id,))
+        conteos = dict(cursor.execute(
+            f"SELECT operacion, COUNT(*) FROM {TABLA_CAMBIOS} WHERE lote_id = ? GROUP BY operacion", (lote_id,)).fetchall())
+    cursor.execute(
+        f"UPDATE {TABLA_LOTES} SET fin = ?, insertados = ?, actualizados = ?, eliminados = ? WHERE lote_id = ?",
+        (_ahora(), conteos.get('I', 0), conteos.get('U', 0), conteos.get('D', 0), lote_id))
+
+    viejos = f"SELECT lote_id FROM {TABLA_LOTES} WHERE tabla = ? ORDER BY lote_id DESC LIMIT -1 OFFSET {LOTES_CONSERVADOS}"
+    cursor.execute(f"DELETE FROM {TABLA_CAMBIOS} WHERE lote_id IN ({viejos})", (tabla,))
+    cursor.execute(f"DELETE FROM {TABLA_LOTES} WHERE lote_id IN ({viejos})", (tabla,))
+    return conteos
+
+
+@contextlib.contextmanager
+def registrar_cambios(conn, tabla, llave, origen=None):
+    """
+    Registra como un lote de importación los cambios que se hagan sobre `tabla` dentro
+    del bloque. Si la conexión ya tiene una transacción abierta (ej: dentro de
+    `carga_masiva`), el registro se confirma junto con ella; si no, se confirma al salir
+    del bloque. Si hay un error, el lote se descarta y la excepción se propaga. El código
+    del bloque no tiene que confirmar la transacción: la cabecera del lote quedaría sin
+    cerrar (sin 'fin') y `cambios_desde` no vería nunca sus cambios.
+
+    Si la tabla está vacía al empezar (la primera carga), el lote se marca como completo
+    y no se anotan las llaves: todo lo que tiene la tabla es nuevo.
+
+        with carga_masiva(conn, 'egresados') as cursor:
+            with registrar_cambios(conn, 'egresados', ['documento', 'propuesta', 'plan'], csv):
+                upsert_lotes(cursor, ...)
+
+    Args:
+        conn (sqlite3.Connection): Conexión con la que se modifica la tabla.
+        tabla (str): Tabla cuyos cambios se registran.
+        llave (list[str]): Columnas de la llave primaria que se anotan por cada cambio.
+        origen (str, optional): Archivo o proceso que originó la importación.
+
+    Yields:
+        int: El número de lote.
+    """
+    cursor = conn.cursor()
+    transaccion_externa = conn.in_transaction
+    asegurar_tablas(cursor)
+    completo = cursor.execute(f"SELECT NOT EXISTS (SELECT 1 FROM {tabla})").fetchone()[0]
+    cursor.execute(f"INSERT INTO {TABLA_LOTES} (tabla, llave, origen, completo, inicio) VALUES (?, ?, ?, ?, ?)",
+                   (tabla, json.dumps(llave), origen, completo, _ahora()))
+    lote_id = cursor.lastrowid
+    if not completo:
+        _crear_triggers(cursor, tabla, llave, lote_id)
+    try:
+        yield lote_id
+        conteos = _cerrar_lote(cursor, tabla, lote_id, completo)
+        if not transaccion_externa:
+            conn.commit()
+        if completo:
+            print(f"-> Lote de importación {lote_id}: carga completa de {conteos['I']} registros.")
+        else:
+            print(f"-> Lote de importación {lote_id}: {conteos.get('I', 0)} llaves insertadas, "
+                  f"{conteos.get('U', 0)} actualizadas y {conteos.get('D', 0)} eliminadas en el registro de cambios.")
+    except BaseException:
+        if not transaccion_externa:
+            conn.rollback()
+        raise
+    finally:
+        _borrar_triggers(cursor, tabla)
+
+
+def ultimo_lote(conn, tabla=None):
+    """
+    Número del último lote de importación terminado de la tabla (de cualquier tabla si
+    no se indica), o 0 si no hay ninguno.
+    """
+    try:
+        fila = conn.execute(f"SELECT MAX(lote_id) FROM {TABLA_LOTES} WHERE (? IS NULL OR tabla = ?) AND fin IS NOT NULL",
+                            (tabla, tabla)).fetchone()
+    except Exception:
+        return 0
+    return fila[0] or 0
+
+
+def compactar_lotes(conn, desde_lote):
+    """
+    Marca como completos los lotes posteriores a `desde_lote` que siguen a una carga
+    completa de su tabla en ese rango, y borra sus llaves. En una reconstrucción desde
+    cero solo el primer archivo de cada tabla la encuentra vacía; las llaves de los
+    demás no le sirven a nadie, porque `cambios_desde` devuelve None para cualquier
+    rango que incluya la carga completa.
+
+    Returns:
+        int: Cantidad de llaves borradas del registro.
+    """
+    lotes = f"""
+        SELECT l.lote_id FROM {TABLA_LOTES} AS l
+        JOIN (SELECT tabla, MIN(lote_id) AS primero FROM {TABLA_LOTES}
+              WHERE lote_id > ? AND completo GROUP BY tabla) AS c
+          ON c.tabla = l.tabla AND l.lote_id > c.primero
+        WHERE NOT l.completo AND l.fin IS NOT NULL
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DELETE FROM {TABLA_CAMBIOS} WHERE lote_id IN ({lotes})", (desde_lote,))
+        borradas = cursor.rowcount
+        cursor.execute(f"UPDATE {TABLA_LOTES} SET completo = 1 WHERE lote_id IN ({lotes})", (desde_lote,))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return borradas
+
+
+def cambios_desde(conn, tabla, desde_lote=0):
+    """
+    Llaves de la tabla que cambiaron en los lotes terminados posteriores a `desde_lote`,
+    con una columna por cada columna de la llave.
+
+    Returns:
+        pd.DataFrame | None: 'lote_id', 'operacion' y las columnas de la llave. None si
+        alguno de esos lotes fue una carga completa o si `desde_lote` es anterior a los
+        lotes conservados: hay que recalcular todo lo que depende de la tabla.
+    """
+    try:
+        lotes = conn.execute(
+            f"SELECT llave, completo FROM {TABLA_LOTES} WHERE tabla = ? AND lote_id > ? AND fin IS NOT NULL ORDER BY lote_id",
+            (tabla, desde_lote)).fetchall()
+        primero, cantidad = conn.execute(f"SELECT MIN(lote_id), COUNT(*) FROM {TABLA_LOTES} WHERE tabla = ?", (tabla,)).fetchone()
+    except Exception:
+        return None
+    # Si ya se borraron lotes viejos, los cambios anteriores al primero conservado se perdieron.
+    descartados = cantidad >= LOTES_CONSERVADOS and desde_lote < primero
+    if descartados or any(completo for _, completo in lotes):
+        return None
+    if not lotes:
+        return pd.DataFrame(columns=['lote_id', 'operacion'])
+
+    columnas = ', '.join(f"json_extract(c.llave, '$[{i}]') AS \"{col}\"" for i, col in enumerate(json.loads(lotes[-1][0])))
+    query = f"""
+        SELECT c.lote_id, c.operacion, {columnas}
+        FROM {TABLA_CAMBIOS} AS c
+        JOIN {TABLA_LOTES} AS l ON l.lote_id = c.lote_id
+        WHERE l.tabla = ? AND c.lote_id > ? AND l.fin IS NOT NULL
+        ORDER BY c.lote_id
+    """
+    return pd.read_sql_query(query, conn, params=(tabla, desde_lote))
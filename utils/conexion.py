@@ -0,0 +1,112 @@
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+# Conexiones a academica.db compartidas por importadores y dashboard. La base usa
+# write-ahead logging (WAL): las lecturas no bloquean a la escritura ni la escritura a
+# las lecturas, que siguen viendo la última versión confirmada mientras dura una
+# importación. Lo único que se sigue serializando son dos escrituras simultáneas, que
+# esperan su turno con el busy timeout en lugar de fallar con "database is locked".
+
+# Segundos que una conexión espera un bloqueo antes de fallar.
+TIMEOUT_ESCRITURA = 30.0
+TIMEOUT_LECTURA = 5.0
+
+# Reintentos de las consultas del dashboard que igual encuentran la base bloqueada
+# (por ejemplo, mientras una importación vieja cambia el modo de journal a WAL).
+REINTENTOS_LECTURA = 3
+ESPERA_REINTENTO = 0.25  # Segundos; se duplica en cada reintento.
+
+
+# Adaptadores de los tipos de numpy y pandas que sqlite3 no conoce. Sin ellos, un
+# numpy.int64 se guarda como BLOB con sus 8 bytes (así quedó aspirantes.ano_ingreso en
+# las bases viejas) y un Timestamp no se puede insertar. Los vacíos de pandas se guardan
+# como NULL.
+ADAPTADORES = {
+    **{tipo: int for tipo in (np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64)},
+    **{tipo: float for tipo in (np.float16, np.float32, np.float64)},
+    np.bool_: int,
+    np.str_: str,
+    pd.Timestamp: lambda valor: valor.isoformat(sep=' '),
+    type(pd.NaT): lambda valor: None,
+    type(pd.NA): lambda valor: None,
+}
+
+
+def registrar_adaptadores():
+    """Registra ADAPTADORES en sqlite3 (vale para todas las conexiones del proceso)."""
+    for tipo, adaptador in ADAPTADORES.items():
+        sqlite3.register_adapter(tipo, adaptador)
+
+
+registrar_adaptadores()
+
+
+def conectar(db_filepath, timeout=TIMEOUT_ESCRITURA):
+    """
+    Abre una conexión con busy timeout y la base en modo WAL. El modo WAL queda
+    guardado en el archivo, así que solo la primera conexión hace el cambio; si en ese
+    momento otra conexión tiene la base bloqueada, el cambio queda para la próxima.
+
+    Returns:
+        sqlite3.Connection: La conexión abierta.
+    """
+    conn = sqlite3.connect(db_filepath, timeout=timeout)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+    except sqlite3.OperationalError:
+        pass
+    return conn
+
+
+def es_bloqueo(error):
+    """Indica si el error es por la base bloqueada u ocupada por otra conexión."""
+    mensaje = str(error).lower()
+    return 'database is locked' in mensaje or 'database is busy' in mensaje or 'database table is locked' in mensaje
+
+
+def consultar(db_filepath, query, params=None, reintentos=REINTENTOS_LECTURA, timeout=TIMEOUT_LECTURA, preparar=None):
+    """
+    Ejecuta una consulta de lectura y devuelve el resultado como DataFrame. Si la base
+    está bloqueada, reintenta con esperas crecientes; los demás errores se propagan.
+    `preparar(conn)`, si se indica, se llama con la conexión antes de la consulta (ej:
+    para adjuntar el archivo de años cerrados).
+
+    Returns:
+        pd.DataFrame: El resultado de la consulta.
+    """
+    espera = ESPERA_REINTENTO
+    for intento in range(reintentos + 1):
+        try:
+            conn = conectar(db_filepath, timeout)
+            try:
+                if preparar:
+                    preparar(conn)
+                return pd.read_sql_query(query, conn, params=params)
+            finally:
+                conn.close()
+        # pandas envuelve los errores de sqlite3 en su propio DatabaseError.
+        except (sqlite3.OperationalError, pd.errors.DatabaseError) as e:
+            if not es_bloqueo(e) or intento == reintentos:
+                raise
+            time.sleep(espera)
+            espera *= 2
+
+
+def checkpoint(conn, modo='PASSIVE'):
+    """
+    Pasa al archivo principal las páginas del WAL. Se llama al terminar cada
+    importación para que el WAL no crezca sin límite mientras el dashboard lo lee.
+    'PASSIVE' no espera a los lectores (copia lo que puede); 'TRUNCATE' espera a que
+    terminen y deja el WAL vacío, por eso se usa al final de una reconstrucción.
+
+    Returns:
+        tuple | None: (ocupado, páginas del WAL, páginas copiadas), o None si la base no
+        está en modo WAL.
+    """
+    ocupado, paginas, copiadas = conn.execute(f"PRAGMA wal_checkpoint({modo})").fetchone()
+    if paginas < 0:
+        return None
+    return ocupado, paginas, copiadas
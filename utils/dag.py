@@ -0,0 +1,138 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Ejecución de pasos con dependencias (un DAG). Cada paso se describe con un dict:
+#   'depende_de': nombres de los pasos que tienen que terminar antes.
+#   'escribe_db': si es True, el paso se serializa con los demás que escriben en la base
+#                 de datos (SQLite admite un solo escritor a la vez).
+# Los pasos independientes corren en paralelo en un pool de hilos; cada paso suele
+# lanzar un script en su propio proceso, por lo que los hilos solo esperan. Los pasos
+# que escriben en la base van a un ejecutor aparte de un solo hilo, así que mientras
+# esperan su turno no ocupan lugares del pool que podrían usar los limpiadores.
+
+
+def orden_topologico(pasos):
+    """
+    Ordena los pasos de forma que cada uno quede después de sus dependencias.
+
+    Args:
+        pasos (dict): Pasos por nombre.
+
+    Returns:
+        list[str]: Nombres de los pasos en orden de ejecución.
+
+    Raises:
+        ValueError: Si un paso depende de otro que no existe o si hay un ciclo.
+    """
+    for nombre, paso in pasos.items():
+        faltantes = [d for d in paso.get('depende_de', []) if d not in pasos]
+        if faltantes:
+            raise ValueError(f"El paso '{nombre}' depende de pasos inexistentes: {faltantes}")
+
+    pendientes = {nombre: set(paso.get('depende_de', [])) for nombre, paso in pasos.items()}
+    orden = []
+    while pendientes:
+        listos = sorted(n for n, deps in pendientes.items() if not deps)
+        if not listos:
+            raise ValueError(f"Hay un ciclo entre los pasos: {sorted(pendientes)}")
+        for nombre in listos:
+            del pendientes[nombre]
+            orden.append(nombre)
+        for deps in pendientes.values():
+            deps.difference_update(listos)
+    return orden
+
+
+def ejecutar_dag(pasos, ejecutar_paso, procesos=4):
+    """
+    Ejecuta todos los pasos respetando sus dependencias. Un paso empieza en cuanto
+    terminaron las suyas; si alguna falló, el paso no se ejecuta y queda bloqueado.
+
+    Args:
+        pasos (dict): Pasos por nombre.
+        ejecutar_paso (callable): Recibe (nombre, paso) y devuelve un dict con al menos
+            'ok' (bool). Se llama desde los hilos del pool.
+        procesos (int): Cantidad máxima de pasos simultáneos que no escriben en la base;
+            los que escriben corren de a uno en un hilo aparte.
+
+    Returns:
+        dict: Por paso, el dict devuelto por `ejecutar_paso` completado con 'estado'
+        ('ok', 'error' o 'bloqueado'), 'inicio', 'fin', 'segundos' y 'espera' (tiempo
+        desde que el paso quedó listo hasta que empezó: un lugar en el pool o el turno
+        para escribir en la base), relativos al inicio del DAG.
+    """
+    orden = orden_topologico(pasos)
+    inicio_dag = time.perf_counter()
+    resultados = {}
+
+    def correr(nombre, llegada):
+        paso = pasos[nombre]
+        inicio = time.perf_counter()
+        try:
+            resultado = ejecutar_paso(nombre, paso)
+        except Exception as e:
+            resultado = {'ok': False, 'log': f"Error inesperado: {e}"}
+        fin = time.perf_counter()
+        resultado.update(
+            estado='ok' if resultado.get('ok') else 'error',
+            inicio=round(inicio - inicio_dag, 2),
+            fin=round(fin - inicio_dag, 2),
+            segundos=round(fin - inicio, 2),
+            espera=round(inicio - llegada, 2),
+        )
+        return resultado
+
+    with ThreadPoolExecutor(max_workers=procesos) as pool, ThreadPoolExecutor(max_workers=1) as escritor:
+        en_curso = {}
+        sin_lanzar = list(orden)
+        while sin_lanzar or en_curso:
+            for nombre in list(sin_lanzar):
+                deps = pasos[nombre].get('depende_de', [])
+                if any(resultados.get(d, {}).get('estado') in ('error', 'bloqueado') for d in deps):
+                    fallidas = [d for d in deps if resultados.get(d, {}).get('estado') != 'ok']
+                    resultados[nombre] = {'ok': False, 'estado': 'bloqueado', 'log': f"Dependencias fallidas: {fallidas}"}
+                    sin_lanzar.remove(nombre)
+                elif all(resultados.get(d, {}).get('estado') == 'ok' for d in deps):
+                    ejecutor = escritor if pasos[nombre].get('escribe_db') else pool
+                    en_curso[ejecutor.submit(correr, nombre, time.perf_counter())] = nombre
+                    sin_lanzar.remove(nombre)
+            if not en_curso:
+                # Quedan pasos bloqueados por pasos que se marcaron en esta misma vuelta.
+                continue
+            terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                resultados[en_curso.pop(futuro)] = futuro.result()
+
+    return {nombre: resultados[nombre] for nombre in orden}
+
+
+def camino_critico(pasos, resultados):
+    """
+    Calcula el camino crítico: la cadena de dependencias cuya suma de duraciones es
+    la mayor. Es el tiempo mínimo de la reconstrucción aunque hubiera procesadores de
+    sobra, y los pasos que conviene acelerar primero.
+
+    Args:
+        pasos (dict): Pasos por nombre.
+        resultados (dict): Resultados de `ejecutar_dag` (se usa 'segundos' de cada paso).
+
+    Returns:
+        tuple[list[str], float]: Los pasos del camino, en orden, y su duración total.
+    """
+    fin_temprano, previo = {}, {}
+    for nombre in orden_topologico(pasos):
+        deps = pasos[nombre].get('depende_de', [])
+        anterior = max(deps, key=lambda d: fin_temprano[d], default=None)
+        previo[nombre] = anterior
+        base = fin_temprano[anterior] if anterior else 0.0
+        fin_temprano[nombre] = base + resultados.get(nombre, {}).get('segundos', 0.0)
+
+    if not fin_temprano:
+        return [], 0.0
+    nombre = max(fin_temprano, key=fin_temprano.get)
+    total = fin_temprano[nombre]
+    camino = []
+    while nombre:
+        camino.append(nombre)
+        nombre = previo[nombre]
+    return camino[::-1], round(total, 2)
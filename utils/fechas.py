@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# Las columnas de fechas de los reportes son muy repetitivas (miles de inscripciones
+# con unos pocos cientos de fechas distintas) y siempre vienen en unos pocos formatos
+# conocidos. En lugar de dejar que pandas infiera el formato en cada llamada, se detecta
+# una vez por columna, se parsea con formato explícito y solo sobre los valores únicos.
+
+# Formatos candidatos, en orden de preferencia. Todos son día/mes (formato argentino).
+FORMATOS_FECHA = [
+    '%d/%m/%Y',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%d-%m-%Y',
+]
+
+FORMATO_ISO = '%Y-%m-%d'
+
+# Cantidad de valores únicos con los que se prueba cada formato candidato.
+TAMANO_MUESTRA = 500
+
+
+def detectar_formato(valores, formatos=FORMATOS_FECHA, muestra=TAMANO_MUESTRA):
+    """
+    Detecta el formato de una colección de fechas en texto probando cada formato
+    candidato sobre una muestra de valores únicos.
+
+    Returns:
+        str | None: El primer formato que interpreta toda la muestra o, si ninguno lo
+        logra, el que interpreta más valores. None si no hay valores o ninguno sirve.
+    """
+    textos = pd.Series(valores, dtype=object).dropna()
+    textos = textos[textos.map(lambda v: isinstance(v, str))].str.strip().drop_duplicates()
+    if textos.empty:
+        return None
+    textos = textos.iloc[:muestra]
+
+    mejor_formato, mejor_cantidad = None, 0
+    for formato in formatos:
+        cantidad = pd.to_datetime(textos, format=formato, errors='coerce').notna().sum()
+        if cantidad == len(textos):
+            return formato
+        if cantidad > mejor_cantidad:
+            mejor_formato, mejor_cantidad = formato, cantidad
+    return mejor_formato
+
+
+def _incluye_hora(formato):
+    return any(directiva in formato for directiva in ('%H', '%M', '%S'))
+
+
+def _parsear_unicos(textos, formato):
+    """Interpreta con `formato` solo los valores distintos de `textos` y repite el resultado."""
+    codigos, unicos = pd.factorize(textos)
+    fechas = pd.to_datetime(pd.Series(unicos, dtype=object), format=formato, errors='coerce').to_numpy()
+    return pd.Series(np.where(codigos >= 0, fechas[codigos], np.datetime64('NaT')), index=textos.index)
+
+
+def normalizar_fechas(serie, formato=None, formato_salida=FORMATO_ISO):
+    """
+    Convierte una columna de fechas a texto ISO ('YYYY-MM-DD'). Cada valor distinto
+    se interpreta una sola vez. Los valores vacíos o que no respetan el formato quedan
+    como NaN (NULL al insertarlos en la base de datos). Si la salida no incluye la hora,
+    de las marcas de tiempo se interpreta solo la parte de la fecha.
+
+    Args:
+        serie (pd.Series): Fechas como texto y/o como objetos fecha (celdas de Excel).
+        formato (str, optional): Formato de entrada. Si no se indica, se detecta.
+        formato_salida (str): Formato de los textos resultantes.
+
+    Returns:
+        pd.Series: Las fechas como texto, con el mismo índice que `serie`.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.dt.strftime(formato_salida)
+
+    codigos, unicos = pd.factorize(serie)
+    unicos = pd.Series(unicos, dtype=object)
+    es_texto = unicos.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+
+    if formato is None:
+        formato = detectar_formato(unicos[es_texto])
+
+    fechas = pd.Series(pd.NaT, index=unicos.index, dtype='datetime64[ns]')
+    if es_texto.any() and formato is not None:
+        textos = unicos[es_texto].str.strip()
+        if ' ' in formato and not _incluye_hora(formato_salida):
+            # Si la salida es solo la fecha, basta con interpretar la parte de la fecha:
+            # las marcas de tiempo son casi todas distintas, pero los días se repiten mucho.
+            formato, textos = formato.split(' ')[0], textos.str.split(' ', n=1).str[0]
+        fechas[es_texto] = _parsear_unicos(textos, formato).to_numpy()
+    if (~es_texto).any():
+        # Celdas que Excel ya entregó como fecha.
+        fechas[~es_texto] = pd.to_datetime(unicos[~es_texto], errors='coerce')
+
+    textos_unicos = fechas.dt.strftime(formato_salida).to_numpy(dtype=object)
+    if len(textos_unicos) == 0:
+        return pd.Series(np.nan, index=serie.index, name=serie.name, dtype=object)
+    # factorize marca los vacíos con -1: se reemplazan por NaN después de indexar.
+    resultado = np.where(codigos >= 0, textos_unicos[codigos], np.nan)
+    return pd.Series(resultado, index=serie.index, name=serie.name, dtype=object)
@@ -0,0 +1,207 @@
+import re
+import unicodedata
+
+import pandas as pd
+
+# Resolución de identidades: la misma persona aparece en varias tablas con el documento
+# escrito de distintas formas ('DNI 40123456', 'CUIL 20401234569', '40.123.456') y a
+# veces con errores de tipeo. Primero se normalizan los documentos (coincidencia exacta)
+# y después se buscan coincidencias aproximadas solo dentro de bloques: registros que
+# comparten un prefijo del documento o las primeras palabras del nombre. Así no hace
+# falta comparar todos contra todos.
+
+# Tipos de documento que usan la numeración del DNI. El CUIL/CUIT lleva el DNI entre un
+# prefijo de 2 dígitos y un dígito verificador.
+TIPOS_DNI = {'DNI', 'DNT', 'DOC', 'LE', 'LC', 'CUIL', 'CUIT'}
+
+# Parámetros de las coincidencias aproximadas.
+LARGO_PREFIJO = 5        # Dígitos del documento que forman el bloque por documento.
+MAX_BLOQUE = 200         # Los bloques más grandes se descartan (no discriminan).
+MAX_DISTANCIA_DOC = 1    # Ediciones permitidas en el documento (incluye transposiciones).
+MIN_SIMILITUD_NOMBRE = 0.6  # Proporción de palabras del nombre en común.
+
+
+def normalizar_documentos(serie):
+    """
+    Normaliza documentos a una clave comparable: 'DNI:40123456' para los documentos con
+    numeración de DNI (incluido el DNI dentro de un CUIL) y 'TIPO:NUMERO' para el resto
+    (pasaportes, cédulas extranjeras). Los documentos sin tipo se toman como DNI.
+
+    Returns:
+        pd.Series: Las claves, con NaN si el documento está vacío.
+    """
+    texto = serie.astype('string').str.upper().str.strip()
+    partes = texto.str.extract(r'^(?:([A-Z]+)\s+)?(.*)$')
+    tipo = partes[0].fillna('DNI')
+    numero = partes[1].str.replace(r'[^0-9A-Z]', '', regex=True)
+
+    es_cuil = tipo.isin(['CUIL', 'CUIT']) & numero.str.fullmatch(r'\d{11}').fillna(False)
+    numero = numero.mask(es_cuil, numero.str[2:10])
+    numero = numero.str.lstrip('0')
+
+    clase = tipo.where(~tipo.isin(TIPOS_DNI), 'DNI')
+    claves = clase + ':' + numero
+    return claves.where(numero.fillna('').str.len() > 0).astype(object)
+
+
+def palabras_nombre(nombre):
+    """
+    Palabras de un nombre en mayúsculas y sin acentos, separadas en apellidos y nombres
+    si el texto tiene la forma 'APELLIDO, NOMBRES' ('Pérez, José' -> (['PEREZ'], ['JOSE'])).
+    Si no hay coma, todas las palabras quedan como apellidos.
+    """
+    if not isinstance(nombre, str):
+        return [], []
+    texto = unicodedata.normalize('NFKD', nombre.upper())
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    apellidos, _, nombres = texto.partition(',')
+    return re.findall(r'[A-Z]+', apellidos), re.findall(r'[A-Z]+', nombres)
+
+
+def distancia_edicion(a, b, maximo=MAX_DISTANCIA_DOC):
+    """
+    Distancia de edición entre dos textos cortos contando la transposición de dos
+    caracteres vecinos como un solo error. Corta apenas se supera `maximo`.
+    """
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    anterior2, anterior = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        actual = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            costo = 0 if a[i - 1] == b[j - 1] else 1
+            actual[j] = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + costo)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                actual[j] = min(actual[j], anterior2[j - 2] + 1)
+        if min(actual) > maximo:
+            return maximo + 1
+        anterior2, anterior = anterior, actual
+    return anterior[-1]
+
+
+def similitud_nombres(a, b):
+    """
+    Proporción de palabras en común respecto del nombre más corto (0 a 1). Si los dos
+    nombres distinguen apellidos y nombres, tienen que compartir al menos una palabra de
+    cada parte: hermanos con el mismo apellido y documentos parecidos no se unen.
+    """
+    (apellidos_a, nombres_a), (apellidos_b, nombres_b) = a, b
+    if nombres_a and nombres_b and not (set(apellidos_a) & set(apellidos_b) and set(nombres_a) & set(nombres_b)):
+        return 0.0
+    a, b = set(apellidos_a + nombres_a), set(apellidos_b + nombres_b)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+class _Conjuntos:
+    """Unión de conjuntos (union-find) sobre claves de documento."""
+
+    def __init__(self):
+        self.padre = {}
+
+    def raiz(self, x):
+        self.padre.setdefault(x, x)
+        while self.padre[x] != x:
+            self.padre[x] = self.padre[self.padre[x]]
+            x = self.padre[x]
+        return x
+
+    def unir(self, a, b):
+        ra, rb = self.raiz(a), self.raiz(b)
+        if ra != rb:
+            self.padre[max(ra, rb)] = min(ra, rb)
+
+
+def _bloques(identidades):
+    """
+    Claves de bloqueo de cada identidad: el prefijo del número de documento y las dos
+    primeras palabras del nombre (en general, primer apellido y primer nombre).
+    """
+    numero = identidades['clave'].str.split(':', n=1).str[1]
+    por_documento = identidades['clave'].str.split(':', n=1).str[0] + ':' + numero.str[:LARGO_PREFIJO]
+    primeras = identidades['palabras'].map(lambda p: (p[0] + p[1])[:2])
+    por_nombre = primeras.map(lambda p: ' '.join(p) if len(p) == 2 else None)
+    return pd.concat([
+        pd.DataFrame({'bloque': 'doc:' + por_documento, 'clave': identidades['clave']}),
+        pd.DataFrame({'bloque': 'nom:' + por_nombre, 'clave': identidades['clave']}).dropna(),
+    ], ignore_index=True)
+
+
+def pares_candidatos(identidades):
+    """
+    Pares de claves distintas que comparten algún bloque. Los bloques con más de
+    MAX_BLOQUE claves se descartan para no volver a la comparación cuadrática.
+
+    Returns:
+        pd.DataFrame: Columnas 'clave_a' y 'clave_b' (con clave_a < clave_b), sin repetidos.
+    """
+    bloques = _bloques(identidades).drop_duplicates()
+    tamanos = bloques.groupby('bloque')['clave'].transform('size')
+    bloques = bloques[(tamanos > 1) & (tamanos <= MAX_BLOQUE)]
+    pares = bloques.merge(bloques, on='bloque', suffixes=('_a', '_b'))
+    pares = pares[pares['clave_a'] < pares['clave_b']]
+    return pares[['clave_a', 'clave_b']].drop_duplicates().reset_index(drop=True)
+
+
+def resolver(registros, existentes=None):
+    """
+    Asigna un identificador de persona a cada documento.
+
+    Dos documentos con la misma clave normalizada son la misma persona. Además, dos
+    claves que comparten un bloque se unen si los números difieren en a lo sumo
+    MAX_DISTANCIA_DOC ediciones y los nombres comparten al menos MIN_SIMILITUD_NOMBRE
+    de sus palabras.
+
+    Args:
+        registros (pd.DataFrame): Columnas 'documento' (tal como figura en las tablas) y
+            'nombre' (puede ser NaN).
+        existentes (dict, optional): persona_id ya asignado a cada clave normalizada en una
+            ejecución anterior. Se conservan para que los identificadores no cambien.
+
+    Returns:
+        pd.DataFrame: Un registro por documento con 'documento', 'documento_normalizado',
+        'persona_id', 'metodo' ('exacto' o 'aproximado') y 'nombre'.
+    """
+    existentes = existentes or {}
+    registros = registros.dropna(subset=['documento']).drop_duplicates(['documento', 'nombre']).copy()
+    registros['clave'] = normalizar_documentos(registros['documento'])
+    registros = registros.dropna(subset=['clave'])
+
+    # Una identidad por clave, con el nombre más frecuente.
+    frecuencias = registros.dropna(subset=['nombre']).groupby(['clave', 'nombre']).size().sort_values(ascending=False, kind='stable')
+    nombres = frecuencias.reset_index().drop_duplicates('clave').set_index('clave')['nombre']
+    identidades = pd.DataFrame({'clave': registros['clave'].unique()})
+    identidades['nombre'] = identidades['clave'].map(nombres)
+    identidades['palabras'] = identidades['nombre'].map(palabras_nombre)
+
+    conjuntos = _Conjuntos()
+    for clave in identidades['clave']:
+        conjuntos.raiz(clave)
+
+    palabras = dict(zip(identidades['clave'], identidades['palabras']))
+    aproximadas = set()
+    for a, b in pares_candidatos(identidades).itertuples(index=False, name=None):
+        if similitud_nombres(palabras[a], palabras[b]) < MIN_SIMILITUD_NOMBRE:
+            continue
+        if distancia_edicion(a.split(':', 1)[1], b.split(':', 1)[1]) <= MAX_DISTANCIA_DOC:
+            conjuntos.unir(a, b)
+            aproximadas.update((a, b))
+
+    # Identificador por grupo: el menor ya asignado a alguna de sus claves, o uno nuevo.
+    grupos = pd.Series({clave: conjuntos.raiz(clave) for clave in identidades['clave']})
+    ids = {}
+    for raiz, claves in grupos.groupby(grupos).groups.items():
+        previos = [existentes[c] for c in claves if c in existentes]
+        if previos:
+            ids[raiz] = min(previos)
+    siguiente = max(list(existentes.values()) + list(ids.values()) + [0]) + 1
+    for raiz in sorted(set(grupos) - set(ids)):
+        ids[raiz] = siguiente
+        siguiente += 1
+
+    resultado = registros.drop_duplicates('documento')[['documento', 'clave']].rename(columns={'clave': 'documento_normalizado'})
+    resultado['persona_id'] = resultado['documento_normalizado'].map(grupos).map(ids).astype('int64')
+    resultado['metodo'] = resultado['documento_normalizado'].isin(aproximadas).map({True: 'aproximado', False: 'exacto'})
+    resultado['nombre'] = resultado['documento_normalizado'].map(nombres)
+    return resultado.reset_index(drop=True)
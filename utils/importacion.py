@@ -0,0 +1,351 @@
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.archivo import ESQUEMA, separar_archivadas
+from utils.cambios import registrar_cambios
+from utils.conexion import conectar
+from utils.fechas import normalizar_fechas
+from utils.intercambio import AFINIDADES, ESQUEMAS, leer_procesado
+from utils.lotes import iterar_lotes, upsert_lotes, resumen_upsert, carga_masiva
+from utils.text_utils import to_snake_case
+from utils.validacion import REGLAS, aprobar_importacion
+
+# Importación de las tablas que se cargan completas desde un CSV procesado. Cada tabla
+# se declara en ESPECIFICACIONES y `importar_tabla` hace siempre lo mismo: lee el CSV,
+# valida, normaliza nombres, tipos y fechas, crea la tabla y sus índices si no existen y
+# carga los registros con un upsert dentro de `carga_masiva`.
+#
+# Claves de cada especificación:
+#   - 'columnas': columna de la tabla -> tipo ('texto', 'fecha', 'entero' o 'decimal'),
+#     en el orden de la tabla. Las columnas del CSV que no figuran se descartan.
+#   - 'llave': columnas de la llave primaria.
+#   - 'conflicto': 'actualizar' (las filas existentes que cambiaron se actualizan) o
+#     'ignorar' (se mantienen como están).
+#   - 'dataset' (opcional): clave de ESQUEMAS para leer el CSV (o su Parquet) con
+#     `leer_procesado` y de REGLAS para validarlo. Sin dataset, se lee el CSV como texto.
+#   - 'renombrar' (opcional): nombres del CSV -> columnas de la tabla. Las columnas que
+#     no figuran se pasan a snake_case con `to_snake_case`.
+#   - 'formato_fechas' (opcional): formato de las columnas 'fecha' (si no, se detecta).
+#   - 'repetidos' (opcional): 'primero' conserva la primera fila de cada llave repetida
+#     dentro del archivo. Si no se indica, se conserva la última (como hacía INSERT OR
+#     REPLACE), salvo con conflicto 'ignorar', donde la que queda es la primera.
+#   - 'indices' (opcional): listas de columnas con un índice secundario cada una.
+#   - 'derivadas' y 'derivar' (opcionales): columnas de la tabla que no vienen en el CSV
+#     (columna -> tipo) y la función `derivar(df, cursor)` que las calcula antes de la
+#     carga, con la base ya abierta. Si la tabla existe sin alguna de ellas, se agrega.
+#
+# Las llaves que cambian en cada importación quedan en el registro de cambios
+# (utils/cambios.py), con el CSV como origen del lote. Si la tabla tiene años archivados
+# (utils/archivo.py), las filas que ya están en el archivo se actualizan ahí.
+
+
+def _anio_academico(fechas, cursor):
+    """
+    Año académico de cada fecha ISO según la tabla anio_academico, con una búsqueda
+    binaria sobre los inicios en lugar de cruzar por rango. Las fechas vacías o fuera
+    de todos los años quedan vacías.
+    """
+    anios = cursor.execute("SELECT anio, inicio, fin FROM anio_academico ORDER BY inicio").fetchall()
+    resultado = pd.Series(pd.NA, index=fechas.index, dtype='Int64')
+    validas = fechas.notna()
+    if not anios or not validas.any():
+        return resultado
+    anio, inicio, fin = (np.array(columna) for columna in zip(*anios))
+    valores = fechas[validas].to_numpy(dtype=str)
+    # El último año que empieza antes de la fecha (o el mismo día), si todavía no terminó.
+    posicion = np.searchsorted(inicio, valores, side='right') - 1
+    dentro = (posicion >= 0) & (valores <= fin[posicion.clip(0)])
+    resultado[validas] = np.where(dentro, anio[posicion.clip(0)], None)
+    return resultado
+
+
+def derivar_egresados(df, cursor):
+    """
+    Agrega a los egresados el año académico de egreso, el tipo de certificado y la
+    etiqueta del plan, para que las consultas del dashboard agrupen sin cruzar con
+    anio_academico, certificados y planes. Si falta alguna de esas tablas, la columna
+    queda vacía.
+    """
+    df = df.copy()
+    fuentes = {
+        'anio_academico': lambda: _anio_academico(df['fecha_egreso'], cursor),
+        'tipo_certificado': lambda: df['certificado'].map(dict(cursor.execute(
+            "SELECT codigo, tipo_de_certificado FROM certificados").fetchall())),
+        'plan_etiqueta': lambda: pd.Series(
+            list(zip(df['propuesta'], df['plan'])), index=df.index, dtype=object).map(
+            {(propuesta, plan): etiqueta for propuesta, plan, etiqueta in cursor.execute(
+                "SELECT propuesta, plan, actualizado FROM planes").fetchall()}),
+    }
+    for columna, calcular in fuentes.items():
+        try:
+            df[columna] = calcular()
+        except sqlite3.OperationalError as e:
+            print(f"Advertencia: No se pudo calcular '{columna}' ({e}); queda vacía.")
+            df[columna] = None
+        print(f"-> Columna derivada '{columna}': {df[columna].notna().sum()} de {len(df)} registros con valor.")
+    return df
+
+
+ESPECIFICACIONES = {
+    'propuestas': {
+        'columnas': {'codigo': 'texto', 'nombre': 'texto', 'tipo': 'texto', 'estado': 'texto'},
+        'llave': ['codigo'],
+        'conflicto': 'actualizar',
+    },
+    'certificados': {
+        'columnas': {
+            'codigo': 'texto',
+            'nombre': 'texto',
+            'nombre_femenino': 'texto',
+            'nombre_no_binario': 'texto',
+            'tipo_de_certificado': 'texto',
+            'nivel_de_titulo': 'texto',
+            'titulo_araucano': 'texto',
+            'estado': 'texto',
+        },
+        'llave': ['codigo'],
+        'conflicto': 'actualizar',
+    },
+    'planes': {
+        'columnas': {
+            'propuesta': 'texto',
+            'plan': 'texto',
+            'actualizado': 'texto',
+            'nombre_largo': 'texto',
+            'total_materias': 'entero',
+        },
+        'llave': ['propuesta', 'plan'],
+        'conflicto': 'actualizar',
+    },
+    'egresados': {
+        'columnas': {
+            'apellido_y_nombres': 'texto',
+            'documento': 'texto',
+            'legajo': 'texto',
+            'fecha_inscripcion': 'fecha',
+            'fecha_ingreso': 'fecha',
+            'fecha_egreso': 'fecha',
+            'certificado': 'texto',
+            'propuesta': 'texto',
+            'plan': 'texto',
+        },
+        'llave': ['documento', 'propuesta', 'plan'],
+        'conflicto': 'actualizar',
+        'renombrar': {
+            'Inscripción': 'fecha_inscripcion',
+            'Ingreso': 'fecha_ingreso',
+            'Egreso': 'fecha_egreso',
+        },
+        'formato_fechas': '%d/%m/%Y',
+        # De las filas con la misma llave se conserva la primera (por ejemplo, el título
+        # intermedio y el final de la misma carrera y plan).
+        'repetidos': 'primero',
+        # Calculadas al importar: las consultas de egresados agrupan por estas columnas.
+        'derivadas': {
+            'anio_academico': 'entero',
+            'tipo_certificado': 'texto',
+            'plan_etiqueta': 'texto',
+        },
+        'derivar': derivar_egresados,
+        # Las consultas del dashboard cruzan egresados con propuestas y filtran por tipo
+        # de certificado.
+        'indices': [['propuesta'], ['tipo_certificado', 'anio_academico']],
+    },
+    # También se usa para 'aspirantes', que tiene las mismas columnas.
+    'estudiantes': {
+        'columnas': ESQUEMAS['estudiantes'],
+        'llave': ['tipo_y_n_documento', 'carrera'],
+        'conflicto': 'actualizar',
+        'dataset': 'estudiantes',
+    },
+    # Una inscripción única se define por la persona, la comisión, la carrera y el período.
+    'inscripciones_cursadas': {
+        'columnas': {
+            'alumno': 'texto',
+            'identificacion': 'texto',
+            'comision': 'texto',
+            'estado_insc': 'texto',
+            'fecha_inscripcion': 'fecha',
+            'carrera': 'texto',
+            'periodo': 'texto',
+        },
+        'llave': ['identificacion', 'comision', 'carrera', 'periodo'],
+        'conflicto': 'actualizar',
+        'dataset': 'inscripciones_cursadas',
+        'renombrar': {'Estado Insc.': 'estado_insc'},
+    },
+}
+
+
+def columnas_tabla(especificacion):
+    """Columnas de la tabla (las del CSV y las derivadas) con su tipo."""
+    return {**especificacion['columnas'], **especificacion.get('derivadas', {})}
+
+
+def sql_crear_tabla(tabla, especificacion):
+    """CREATE TABLE IF NOT EXISTS con las columnas, afinidades y llave de la especificación."""
+    definiciones = [f'"{col}" {AFINIDADES[tipo]}' for col, tipo in columnas_tabla(especificacion).items()]
+    definiciones.append("PRIMARY KEY (" + ", ".join(f'"{col}"' for col in especificacion['llave']) + ")")
+    return f"CREATE TABLE IF NOT EXISTS {tabla} ({', '.join(definiciones)})"
+
+
+def sql_indices(tabla, especificacion):
+    """CREATE INDEX IF NOT EXISTS para cada índice secundario de la especificación."""
+    return [
+        f"CREATE INDEX IF NOT EXISTS idx_{tabla}_{'_'.join(columnas)} ON {tabla} ("
+        + ", ".join(f'"{col}"' for col in columnas) + ")"
+        for columnas in especificacion.get('indices', [])
+    ]
+
+
+def sql_agregar_columnas(cursor, tabla, especificacion):
+    """ALTER TABLE ADD COLUMN para las columnas de la especificación que le faltan a la tabla."""
+    existentes = {fila[1] for fila in cursor.execute(f"PRAGMA table_info({tabla})")}
+    return [
+        f'ALTER TABLE {tabla} ADD COLUMN "{col}" {AFINIDADES[tipo]}'
+        for col, tipo in columnas_tabla(especificacion).items() if col not in existentes
+    ]
+
+
+def preparar_datos(df, especificacion, conflicto=None):
+    """
+    Normaliza un DataFrame leído del CSV según la especificación: nombres de columna,
+    tipos, fechas ISO y filas repetidas. De cada llave repetida dentro del archivo queda
+    una sola fila, así el upsert no reescribe la misma llave una vez por copia (y una
+    reimportación sin cambios no cuenta ni registra actualizaciones).
+
+    Returns:
+        pd.DataFrame: Las columnas de la tabla, en su orden.
+
+    Raises:
+        ValueError: Si al CSV le falta alguna columna de la tabla.
+    """
+    renombrar = especificacion.get('renombrar', {})
+    df = df.rename(columns={col: renombrar.get(col, to_snake_case(col)) for col in df.columns})
+
+    columnas = especificacion['columnas']
+    faltantes = [col for col in columnas if col not in df.columns]
+    if faltantes:
+        raise ValueError(f"Faltan las columnas {faltantes} en el archivo.")
+    sobrantes = [col for col in df.columns if col not in columnas]
+    if sobrantes:
+        print(f"-> Se descartan las columnas que no son de la tabla: {sobrantes}")
+    df = df[list(columnas)].copy()
+
+    for col, tipo in columnas.items():
+        if tipo in ('entero', 'decimal'):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        elif tipo == 'fecha':
+            # Las fechas inválidas o vacías quedan como NaN, que se inserta como NULL.
+            df[col] = normalizar_fechas(df[col], formato=especificacion.get('formato_fechas'))
+
+    conflicto = conflicto or especificacion['conflicto']
+    conservar = 'first' if especificacion.get('repetidos') == 'primero' or conflicto == 'ignorar' else 'last'
+    repetidos = df.duplicated(especificacion['llave'], keep=conservar)
+    if repetidos.any():
+        fila = 'primera' if conservar == 'first' else 'última'
+        print(f"-> Se ignoraron {repetidos.sum()} registros con la llave repetida dentro del archivo (se conserva la {fila}).")
+        df = df[~repetidos]
+    return df
+
+
+def importar_tabla(csv_filepath, db_filepath, nombre, tabla=None, conflicto=None):
+    """
+    Importa un CSV procesado a la tabla según ESPECIFICACIONES[nombre].
+
+    Args:
+        csv_filepath (str): CSV procesado.
+        db_filepath (str): Ruta a la base de datos SQLite.
+        nombre (str): Clave de ESPECIFICACIONES.
+        tabla (str, optional): Tabla destino, si no se llama como la especificación.
+        conflicto (str, optional): 'actualizar' o 'ignorar', en lugar del de la especificación.
+
+    Returns:
+        dict | bool | None: Los conteos de `upsert_lotes` con los 'segundos' de la carga
+        y el número de 'lote' del registro de cambios si la importación terminó bien; False si los datos no pasaron la validación y
+        None si hubo un error.
+    """
+    especificacion = ESPECIFICACIONES[nombre]
+    tabla = tabla or nombre
+    conflicto = conflicto or especificacion['conflicto']
+    dataset = especificacion.get('dataset')
+    print(f"Iniciando la importación de '{csv_filepath}' a la tabla '{tabla}' ({conflicto} existentes)...")
+
+    # --- Paso 1: Leer, validar y normalizar el archivo ---
+    try:
+        if dataset:
+            df = leer_procesado(csv_filepath, dataset)
+        else:
+            df = pd.read_csv(csv_filepath, encoding='utf-8', dtype=str)
+        df.dropna(how='all', inplace=True)
+        print(f"-> Archivo procesado cargado. Se encontraron {len(df)} registros.")
+        if dataset in REGLAS and not aprobar_importacion(df, dataset):
+            return False
+        df = preparar_datos(df, especificacion, conflicto)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo CSV en la ruta: {csv_filepath}")
+        return None
+    except Exception as e:
+        print(f"Ocurrió un error al procesar el DataFrame: {e}")
+        return None
+
+    # --- Paso 2: Conectarse y asegurar la tabla y sus índices ---
+    try:
+        conn = conectar(db_filepath)
+        cursor = conn.cursor()
+        print(f"-> Conexión con la base de datos '{db_filepath}' establecida.")
+    except Exception as e:
+        print(f"Ocurrió un error al conectar con la base de datos: {e}")
+        return None
+
+    try:
+        cursor.execute(sql_crear_tabla(tabla, especificacion))
+        for sql in sql_agregar_columnas(cursor, tabla, especificacion):
+            print(f"-> {sql}")
+            cursor.execute(sql)
+        for sql in sql_indices(tabla, especificacion):
+            cursor.execute(sql)
+        conn.commit()
+        print(f"-> Tabla '{tabla}' asegurada y lista para la inserción.")
+    except Exception as e:
+        print(f"Ocurrió un error al crear la tabla: {e}")
+        conn.close()
+        return None
+
+    if 'derivar' in especificacion:
+        try:
+            df = especificacion['derivar'](df, cursor)
+        except Exception as e:
+            print(f"Ocurrió un error al calcular las columnas derivadas: {e}")
+            conn.close()
+            return None
+
+    # --- Paso 3: Upsert en lotes dentro de una carga masiva ---
+    try:
+        inicio = time.perf_counter()
+        df, archivadas = separar_archivadas(conn, db_filepath, tabla, df, especificacion['llave'])
+        with carga_masiva(conn, tabla) as carga, registrar_cambios(conn, tabla, especificacion['llave'], csv_filepath) as lote:
+            conteos = upsert_lotes(carga, tabla, list(df.columns), especificacion['llave'],
+                                   iterar_lotes(df, como_texto=False), actualizar=(conflicto == 'actualizar'))
+            if archivadas is not None:
+                # Las filas del archivo no pasan por el registro de cambios (sus años están cerrados).
+                en_archivo = upsert_lotes(carga, f'{ESQUEMA}.{tabla}', list(archivadas.columns), especificacion['llave'],
+                                          iterar_lotes(archivadas, como_texto=False), actualizar=(conflicto == 'actualizar'))
+                print(f"-> Archivo: {resumen_upsert(en_archivo)}.")
+                conteos = {clave: conteos[clave] + en_archivo[clave] for clave in conteos}
+        conteos['lote'] = lote
+        conteos['segundos'] = round(time.perf_counter() - inicio, 3)
+        filas_por_segundo = conteos['procesados'] / conteos['segundos'] if conteos['segundos'] else 0
+        print(f"-> {resumen_upsert(conteos)} en {conteos['segundos']}s ({filas_por_segundo:.0f} filas/s).")
+    except Exception as e:
+        print(f"Ocurrió un error durante la importación de datos: {e}")
+        conteos = None
+    finally:
+        conn.close()
+        print("-> Conexión con la base de datos cerrada.")
+
+    print(f"\n¡Proceso de importación para la tabla '{tabla}' completado!")
+    return conteos
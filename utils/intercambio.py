@@ -0,0 +1,237 @@
+import importlib.util
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.manifiesto import hash_archivo
+
+# Formato de intercambio entre limpiadores e importadores. Además del CSV (que queda
+# para consultarlo a mano), cada limpiador guarda un Parquet al lado con los tipos de
+# su esquema. Los importadores leen el Parquet si corresponde exactamente al CSV (el
+# hash del CSV queda en sus metadatos); si no, leen el CSV y le aplican el mismo
+# esquema. Así los tipos no dependen de lo que pandas infiera en cada archivo (ej: un
+# plan '2013' leído como número, o una versión '1' leída como 1.0 si hay vacíos).
+# Requiere `pyarrow`; si no está instalado, solo se usa el CSV.
+
+# Tipos de columna: 'texto' (los valores tal como se escriben en el CSV), 'fecha' (texto
+# ISO 'YYYY-MM-DD'), 'entero' y 'decimal'. Las columnas que no figuran en el esquema se
+# tratan como texto.
+TIPOS_ARROW = {'texto': 'string', 'fecha': 'string', 'entero': 'int64', 'decimal': 'float64'}
+
+# Tipo declarado de cada tipo de columna en las tablas de SQLite (define su afinidad).
+AFINIDADES = {'texto': 'TEXT', 'fecha': 'DATE', 'entero': 'INTEGER', 'decimal': 'REAL'}
+
+ESQUEMAS = {
+    'inscripciones_carreras': {
+        'apellido_y_nombre': 'texto',
+        'n_documento': 'texto',
+        'plan': 'texto',
+        'version': 'texto',
+        'fecha_insc': 'fecha',
+        'fecha_ingreso': 'fecha',
+        'estado_insc': 'texto',
+        'tipo_ingreso': 'texto',
+        'modalidad': 'texto',
+        'carrera': 'texto',
+        'anio': 'entero',
+    },
+    'preinscriptos': {
+        'apellido_y_nombres': 'texto',
+        'identificacion': 'texto',
+        'genero': 'texto',
+        'nacionalidad': 'texto',
+        'telefono': 'texto',
+        'mail': 'texto',
+        'colegio': 'texto',
+        'ubicacion': 'texto',
+        'modalidad': 'texto',
+        'turno': 'texto',
+        'procesado': 'texto',
+        'origen': 'texto',
+        'estado': 'texto',
+        'atendido_por': 'texto',
+        'carrera': 'texto',
+        'anio': 'entero',
+    },
+    'inscripciones_cursadas': {
+        'Alumno': 'texto',
+        'Identificación': 'texto',
+        'Comisión': 'texto',
+        'Estado Insc.': 'texto',
+        'Fecha inscripción': 'texto',
+        'Carrera': 'texto',
+        'Período': 'texto',
+    },
+    'estudiantes': {
+        'apellido_y_nombre': 'texto',
+        'tipo_y_n_documento': 'texto',
+        'fecha_de_nacimiento': 'texto',
+        'email': 'texto',
+        'telefono': 'texto',
+        'legajo': 'texto',
+        'plan': 'texto',
+        'ano_ingreso': 'entero',
+        'fecha_ingreso': 'texto',
+        'ultimo_examen': 'texto',
+        'ultima_reinscripcion': 'texto',
+        'prom_con_aplazos': 'decimal',
+        'prom_sin_aplazos': 'decimal',
+        'actividades_aprobadas': 'entero',
+        'total_actividades': 'entero',
+        'estado_inscripcion': 'texto',
+        'carrera': 'texto',
+    },
+    'inscripciones_posgrado': {
+        'Alumno': 'texto',
+        'Identificación': 'texto',
+        'Legajo': 'texto',
+        'Comisión': 'texto',
+        'Estado Insc.': 'texto',
+        'Fecha inscripción': 'texto',
+        'Actividad': 'texto',
+        'Carrera': 'texto',
+        'Período': 'texto',
+        'Origen': 'texto',
+    },
+    # Las columnas salen de las preguntas del formulario; se fijan las que usa el dashboard.
+    'docu_inscripciones': {
+        'marca_temporal': 'texto',
+        'dni': 'texto',
+        'estado_documentacin': 'texto',
+    },
+}
+
+METADATO_HASH = b'eeyn_csv_sha256'
+
+
+def parquet_disponible():
+    """Indica si está instalado `pyarrow` para escribir y leer los Parquet."""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def ruta_parquet(csv_path):
+    """Ruta del Parquet que acompaña a un CSV procesado."""
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def tipos_columnas(columnas, dataset):
+    """Tipo de cada columna según el esquema del dataset (texto si no figura)."""
+    esquema = ESQUEMAS[dataset]
+    return {col: esquema.get(col, 'texto') for col in columnas}
+
+
+def definiciones_columnas(columnas, dataset):
+    """Definiciones para CREATE TABLE ('"col" TIPO, ...') con la afinidad del esquema."""
+    tipos = tipos_columnas(columnas, dataset)
+    return ", ".join(f'"{col}" {AFINIDADES[tipo]}' for col, tipo in tipos.items())
+
+
+def _como_texto(serie):
+    """Los valores como quedan escritos en el CSV, con NaN en los vacíos."""
+    resultado = pd.Series(np.nan, index=serie.index, dtype=object, name=serie.name)
+    mascara = serie.notna()
+    resultado[mascara] = serie[mascara].map(str)
+    return resultado
+
+
+def aplicar_esquema(df, dataset):
+    """
+    Convierte las columnas de `df` a los tipos del esquema. Los textos vacíos quedan
+    como NaN y los enteros con vacíos como decimales, igual que al leer un CSV con pandas.
+
+    Returns:
+        pd.DataFrame: Una copia con las columnas convertidas.
+    """
+    df = df.copy()
+    for col, tipo in tipos_columnas(df.columns, dataset).items():
+        if tipo in ('texto', 'fecha'):
+            df[col] = _como_texto(df[col])
+        else:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+            if tipo == 'entero' and df[col].notna().all():
+                df[col] = df[col].astype('int64')
+            elif tipo == 'decimal':
+                df[col] = df[col].astype('float64')
+    return df
+
+
+def guardar_procesado(df, csv_path, dataset):
+    """
+    Guarda el resultado de un limpiador como CSV y, si hay `pyarrow`, también como
+    Parquet tipado. Un error al escribir el Parquet no interrumpe la limpieza: los
+    importadores vuelven a leer el CSV.
+    """
+    df.to_csv(csv_path, index=False, encoding='utf-8')
+    if not parquet_disponible():
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    destino = ruta_parquet(csv_path)
+    temporal = f"{destino}.{os.getpid()}.tmp"
+    try:
+        tipos = tipos_columnas(df.columns, dataset)
+        esquema = pa.schema([(str(col), TIPOS_ARROW[tipo]) for col, tipo in tipos.items()])
+        tabla = pa.Table.from_pandas(aplicar_esquema(df, dataset), schema=esquema, preserve_index=False)
+        tabla = tabla.replace_schema_metadata({**(tabla.schema.metadata or {}), METADATO_HASH: hash_archivo(csv_path).encode()})
+        pq.write_table(tabla, temporal)
+        os.replace(temporal, destino)
+    except Exception as e:
+        print(f"Advertencia: No se pudo guardar el Parquet '{destino}' ({e}). Se usará solo el CSV.")
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def _parquet_vigente(csv_path):
+    """Devuelve la ruta del Parquet si existe y fue generado junto con el CSV actual."""
+    destino = ruta_parquet(csv_path)
+    if not parquet_disponible() or not os.path.exists(destino):
+        return None
+
+    import pyarrow.parquet as pq
+
+    try:
+        hash_csv = (pq.read_schema(destino).metadata or {}).get(METADATO_HASH)
+    except Exception:
+        return None
+    if not os.path.exists(csv_path) or (hash_csv and hash_csv.decode() == hash_archivo(csv_path)):
+        return destino
+    return None
+
+
+def leer_procesado(csv_path, dataset):
+    """
+    Lee el resultado de un limpiador con los tipos del esquema del dataset: desde el
+    Parquet si corresponde al CSV, o desde el CSV si no.
+
+    Args:
+        csv_path (str): CSV procesado.
+        dataset (str): Clave de ESQUEMAS.
+
+    Returns:
+        pd.DataFrame: Los datos, con NaN en los valores vacíos.
+
+    Raises:
+        FileNotFoundError: Si no existe ni el CSV ni su Parquet.
+    """
+    parquet = _parquet_vigente(csv_path)
+    if parquet:
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        tabla = pq.read_table(parquet)
+        df = tabla.to_pandas()
+        # pyarrow devuelve None en los textos vacíos; se pasan a NaN como en el CSV,
+        # usando la máscara de nulos de Arrow en lugar de recorrer los valores.
+        for col in tabla.column_names:
+            columna = tabla.column(col)
+            if columna.null_count and df[col].dtype == object:
+                valores = df[col].to_numpy(copy=True)
+                valores[pc.is_null(columna).to_numpy(zero_copy_only=False)] = np.nan
+                df[col] = valores
+        return df
+
+    df = pd.read_csv(csv_path, encoding='utf-8', dtype=str)
+    return aplicar_esquema(df, dataset)
@@ -0,0 +1,90 @@
+import importlib.util
+import os
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from utils.cache_columnar import leer_con_cache
+
+# Motores de lectura de Excel en orden de preferencia. 'calamine' es un lector nativo
+# (Rust) opcional que se usa solo si el paquete `python-calamine` está instalado;
+# 'openpyxl' es el motor por defecto de pandas y siempre está disponible.
+MOTORES = ['calamine', 'openpyxl']
+
+# Permite forzar un motor sin tocar el código, ej: EEYN_MOTOR_EXCEL=openpyxl
+VARIABLE_MOTOR = 'EEYN_MOTOR_EXCEL'
+
+
+def motor_disponible(motor):
+    """Indica si el motor de lectura está instalado en el entorno actual."""
+    if motor == 'calamine':
+        return importlib.util.find_spec('python_calamine') is not None
+    return motor == 'openpyxl'
+
+
+def motores_a_probar(motor=None):
+    """
+    Devuelve la lista de motores a intentar, en orden. Si se pide un motor
+    explícito (por argumento o por variable de entorno) se intenta primero y
+    luego se cae a openpyxl.
+    """
+    preferido = motor or os.environ.get(VARIABLE_MOTOR)
+    orden = [preferido] + MOTORES if preferido else MOTORES
+    motores = []
+    for m in orden:
+        if m in MOTORES and m not in motores and motor_disponible(m):
+            motores.append(m)
+    return motores
+
+
+def iterar_filas(filepath, hoja=0):
+    """
+    Recorre las filas de una hoja de Excel en modo de solo lectura, sin cargar el
+    libro completo en memoria. Cada fila se devuelve como una tupla de valores.
+
+    Args:
+        filepath (str): Ruta al archivo .xlsx.
+        hoja (int | str): Índice o nombre de la hoja a leer.
+    """
+    wb = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[hoja] if isinstance(hoja, int) else wb[hoja]
+        for fila in ws.iter_rows(values_only=True):
+            yield fila
+    finally:
+        wb.close()
+
+
+def _leer_con_motores(filepath, motor=None):
+    """Lee el Excel probando los motores en orden; si uno falla se intenta con el siguiente."""
+    ultimo_error = None
+    for m in motores_a_probar(motor):
+        try:
+            return pd.read_excel(filepath, header=None, engine=m)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            print(f"Advertencia: El motor '{m}' no pudo leer '{filepath}' ({e}). Se intentará con otro motor.")
+            ultimo_error = e
+    raise ultimo_error
+
+
+def leer_reporte(filepath, motor=None, usar_cache=True):
+    """
+    Lee un reporte de Excel sin encabezados, equivalente a
+    `pd.read_excel(filepath, header=None)`, usando el motor más rápido disponible.
+    Si un motor falla se intenta con el siguiente. Salvo que se indique lo contrario,
+    el resultado se guarda en la caché columnar (`utils/cache_columnar.py`) y las
+    lecturas siguientes del mismo contenido se sirven desde ahí.
+
+    Args:
+        filepath (str): Ruta al archivo .xlsx.
+        motor (str, optional): 'calamine' u 'openpyxl' para forzar un motor.
+        usar_cache (bool): Si es False, lee siempre el Excel.
+
+    Returns:
+        pd.DataFrame: El contenido crudo de la primera hoja.
+    """
+    if not usar_cache:
+        return _leer_con_motores(filepath, motor)
+    return leer_con_cache(filepath, lambda f: _leer_con_motores(f, motor))
@@ -0,0 +1,252 @@
+import contextlib
+
+from utils.cambios import registrar_cambios
+from utils.conexion import checkpoint
+
+# Tamaño de los lotes de registros que se envían a `executemany`. Con lotes acotados
+# la conversión a texto y la inserción se hacen por partes, sin duplicar en memoria
+# todo el DataFrame convertido.
+TAMANO_LOTE = 5000
+
+
+def iterar_lotes(df, tamano=TAMANO_LOTE, como_texto=True):
+    """
+    Recorre un DataFrame en lotes de tuplas listos para `cursor.executemany`.
+
+    Args:
+        df (pd.DataFrame): Datos a insertar.
+        tamano (int): Cantidad de filas por lote.
+        como_texto (bool): Convierte los valores con `astype(str)`, igual que hacían los
+            importadores con columnas TEXT (los vacíos quedan como 'nan').
+
+    Yields:
+        list[tuple]: Las filas del lote.
+    """
+    for inicio in range(0, len(df), tamano):
+        lote = df.iloc[inicio:inicio + tamano]
+        if como_texto:
+            lote = lote.astype(str)
+        yield list(lote.itertuples(index=False, name=None))
+
+
+def insertar_lotes(cursor, sql, lotes):
+    """Ejecuta `sql` para cada lote y devuelve la cantidad de filas enviadas."""
+    filas = 0
+    for lote in lotes:
+        cursor.executemany(sql, lote)
+        filas += len(lote)
+    return filas
+
+
+# Ajustes de la conexión para cargas grandes. Con WAL y synchronous=NORMAL cada
+# transacción escribe en el log sin forzar un fsync del archivo principal, y un corte
+# no deja la base inconsistente (a lo sumo se pierde la última transacción).
+PRAGMAS_CARGA = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    'cache_size': -64000,  # 64 MB para construir los índices.
+}
+
+
+def indices_secundarios(cursor, tabla):
+    """
+    Índices creados con CREATE INDEX sobre la tabla que no son UNIQUE, con su SQL. Los
+    índices de la llave primaria y los UNIQUE no se incluyen: definen qué es un duplicado.
+    """
+    indices = []
+    for _, nombre, unico, origen, _ in cursor.execute(f"PRAGMA index_list({tabla})").fetchall():
+        if origen == 'c' and not unico:
+            sql = cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", (nombre,)).fetchone()[0]
+            indices.append((nombre, sql))
+    return indices
+
+
+@contextlib.contextmanager
+def carga_masiva(conn, tabla):
+    """
+    Carga grande sobre `tabla` en una única transacción. Ajusta la conexión con
+    PRAGMAS_CARGA, quita los índices secundarios de la tabla y, al salir del bloque, los
+    vuelve a crear y confirma todo junto. Si hay un error, se deshace la transacción
+    completa (índices incluidos) y la excepción se propaga. Si la conexión ya tenía una
+    transacción abierta, la carga se suma a ella y se confirman juntas. Después de
+    confirmar se hace un checkpoint del WAL sin esperar a los lectores.
+
+    Se usa después de crear la tabla y antes de modificar datos:
+
+        with carga_masiva(conn, 'egresados') as cursor:
+            insertar_lotes(cursor, sql, iterar_lotes(df, como_texto=False))
+
+    Yields:
+        sqlite3.Cursor: Cursor dentro de la transacción.
+    """
+    cursor = conn.cursor()
+    if not conn.in_transaction:
+        # journal_mode no se puede cambiar dentro de una transacción.
+        for pragma, valor in PRAGMAS_CARGA.items():
+            cursor.execute(f"PRAGMA {pragma} = {valor}")
+        cursor.execute("BEGIN")
+    try:
+        indices = indices_secundarios(cursor, tabla)
+        for nombre, _ in indices:
+            cursor.execute(f'DROP INDEX "{nombre}"')
+        yield cursor
+        for _, sql in indices:
+            cursor.execute(sql)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    checkpoint(conn)
+
+
+def sql_upsert(tabla, columnas, llave, actualizar=True, condicion=None):
+    """
+    INSERT que resuelve los conflictos de llave sin borrar filas. Con `actualizar`, una
+    fila existente se actualiza solo si alguna de sus columnas fuera de la llave cambió
+    (a diferencia de INSERT OR REPLACE, que borra y vuelve a insertar siempre). Sin
+    `actualizar`, las filas existentes se mantienen como están (como INSERT OR IGNORE).
+
+    Args:
+        tabla (str): Nombre de la tabla.
+        columnas (list[str]): Columnas de los registros, en orden.
+        llave (list[str]): Columnas de la llave primaria (o de un índice UNIQUE).
+        actualizar (bool): Si se actualizan las filas existentes que cambiaron.
+        condicion (str, optional): Condición SQL adicional para actualizar una fila, con
+            `{tabla}.col` para la fila existente y `excluded.col` para la nueva.
+    """
+    cols = ', '.join(f'"{col}"' for col in columnas)
+    placeholders = ', '.join(['?'] * len(columnas))
+    conflicto = ', '.join(f'"{col}"' for col in llave)
+    resto = [col for col in columnas if col not in llave]
+    sql = f"INSERT INTO {tabla} ({cols}) VALUES ({placeholders}) ON CONFLICT ({conflicto}) DO "
+    if not actualizar or not resto:
+        return sql + "NOTHING"
+    asignaciones = ', '.join(f'"{col}" = excluded."{col}"' for col in resto)
+    # IS NOT compara también los NULL (NULL IS NOT NULL es falso).
+    cambios = ' OR '.join(f'{tabla}."{col}" IS NOT excluded."{col}"' for col in resto)
+    if condicion:
+        cambios = f"({condicion}) AND ({cambios})"
+    return sql + f"UPDATE SET {asignaciones} WHERE {cambios}"
+
+
+def upsert_lotes(cursor, tabla, columnas, llave, lotes, actualizar=True, condicion=None):
+    """
+    Inserta los lotes con `sql_upsert` y cuenta qué pasó con cada registro. Las filas
+    sin cambios no se escriben, así que reimportar un archivo casi igual escribe casi nada.
+    Las filas existentes que no cumplen `condicion` se cuentan como sin cambios.
+
+    Returns:
+        dict: 'procesados', 'insertados', 'actualizados' y 'sin_cambios'.
+    """
+    filas_antes = cursor.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+    sql = sql_upsert(tabla, columnas, llave, actualizar, condicion)
+    # rowcount cuenta solo las filas de la tabla, no las que escriben sus triggers (ej:
+    # el registro de cambios), a diferencia de conn.total_changes.
+    procesados = cambios = 0
+    for lote in lotes:
+        cursor.executemany(sql, lote)
+        procesados += len(lote)
+        cambios += cursor.rowcount
+    insertados = cursor.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0] - filas_antes
+    return {
+        'procesados': procesados,
+        'insertados': insertados,
+        'actualizados': cambios - insertados,
+        'sin_cambios': procesados - cambios,
+    }
+
+
+def resumen_upsert(conteos):
+    """Texto con los conteos de `upsert_lotes` para mostrar en los importadores."""
+    return (f"{conteos['insertados']} insertados, {conteos['actualizados']} actualizados y "
+            f"{conteos['sin_cambios']} sin cambios (de {conteos['procesados']} registros)")
+
+
+def fusionar_particion(conn, tabla, columnas, llave, lotes, columna_particion, valor, registrar=False, origen=None):
+    """
+    Reemplaza una partición de la tabla (ej: los preinscriptos de un año) por los lotes
+    recibidos, escribiendo solo las diferencias. Los lotes se cargan primero en una tabla
+    temporal, fuera de la transacción de la base; después, en una única transacción
+    corta, se calculan con operaciones de conjuntos las filas nuevas, modificadas y
+    eliminadas y se aplican. Quien lee la tabla ve la partición anterior o la nueva
+    completa, nunca una mezcla. Con `registrar`, las diferencias se anotan en el registro
+    de cambios (utils/cambios.py) como un lote que se confirma en esa misma transacción.
+
+    Args:
+        conn (sqlite3.Connection): Conexión sin transacción abierta.
+        tabla (str): Tabla destino. `llave` tiene que ser su llave primaria.
+        columnas (list[str]): Columnas de los registros, en orden.
+        llave (list[str]): Columnas de la llave primaria (incluida la de la partición).
+        lotes (iterable[list[tuple]]): Lotes de registros, ej: de `iterar_lotes`.
+        columna_particion (str): Columna que define la partición (ej: 'anio').
+        valor: Valor de la partición que se reemplaza.
+        registrar (bool): Si los cambios se anotan en el registro de cambios.
+        origen (str, optional): Archivo de origen del lote en el registro de cambios.
+
+    Returns:
+        dict: 'procesados', 'insertados', 'actualizados', 'eliminados' y 'sin_cambios'.
+    """
+    cursor = conn.cursor()
+    cols = ', '.join(f'"{col}"' for col in columnas)
+    entrantes, diferencias = f'_{tabla}_entrantes', f'_{tabla}_diferencias'
+
+    def misma_llave(a, b):
+        return ' AND '.join(f'{a}."{col}" = {b}."{col}"' for col in llave)
+
+    # --- Paso 1: Cargar los registros en una tabla temporal (no bloquea la base) ---
+    cursor.execute(f"DROP TABLE IF EXISTS temp.{entrantes}")
+    cursor.execute(f"CREATE TEMP TABLE {entrantes} AS SELECT {cols} FROM {tabla} WHERE 0")
+    procesados = insertar_lotes(cursor, f"INSERT INTO temp.{entrantes} ({cols}) VALUES ({', '.join(['?'] * len(columnas))})", lotes)
+    conn.commit()
+
+    # --- Paso 2: Calcular y aplicar las diferencias en una transacción corta ---
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        registro = registrar_cambios(conn, tabla, llave, origen) if registrar else contextlib.nullcontext()
+        with registro:
+            # Filas nuevas o con alguna columna distinta (EXCEPT considera iguales los NULL).
+            cursor.execute(f"DROP TABLE IF EXISTS temp.{diferencias}")
+            cursor.execute(f"""
+                CREATE TEMP TABLE {diferencias} AS
+                SELECT {cols} FROM temp.{entrantes}
+                EXCEPT
+                SELECT {cols} FROM {tabla} WHERE "{columna_particion}" = ?
+            """, (valor,))
+            cambios = cursor.execute(f"SELECT COUNT(*) FROM temp.{diferencias}").fetchone()[0]
+            insertados = cursor.execute(f"""
+                SELECT COUNT(*) FROM temp.{diferencias} d
+                WHERE NOT EXISTS (SELECT 1 FROM {tabla} t WHERE {misma_llave('t', 'd')})
+            """).fetchone()[0]
+
+            cursor.execute(f"""
+                DELETE FROM {tabla}
+                WHERE "{columna_particion}" = ?
+                  AND NOT EXISTS (SELECT 1 FROM temp.{entrantes} e WHERE {misma_llave('e', tabla)})
+            """, (valor,))
+            eliminados = cursor.rowcount
+
+            resto = [col for col in columnas if col not in llave]
+            asignaciones = ', '.join(f'"{col}" = excluded."{col}"' for col in resto)
+            conflicto = f"DO UPDATE SET {asignaciones}" if resto else "DO NOTHING"
+            # 'WHERE true' evita que SQLite lea ON CONFLICT como parte del SELECT.
+            cursor.execute(f"""
+                INSERT INTO {tabla} ({cols}) SELECT {cols} FROM temp.{diferencias} WHERE true
+                ON CONFLICT ({', '.join(f'"{col}"' for col in llave)}) {conflicto}
+            """)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        cursor.execute(f"DROP TABLE IF EXISTS temp.{entrantes}")
+        cursor.execute(f"DROP TABLE IF EXISTS temp.{diferencias}")
+    checkpoint(conn)
+
+    return {
+        'procesados': procesados,
+        'insertados': insertados,
+        'actualizados': cambios - insertados,
+        'eliminados': eliminados,
+        'sin_cambios': procesados - cambios,
+    }
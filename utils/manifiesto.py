@@ -0,0 +1,163 @@
+import contextlib
+import datetime
+import hashlib
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+from utils.conexion import conectar
+
+# El manifiesto guarda, para cada paso de limpieza o importación, el hash del contenido
+# de sus archivos de entrada y de salida, los parámetros usados y las tablas que cargó.
+# Si al volver a correr un paso nada de eso cambió, el paso se omite.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFIESTO_PATH = os.path.join(BASE_DIR, 'data', 'manifiesto.json')
+
+TAMANO_BLOQUE = 1024 * 1024
+
+
+def hash_archivo(filepath):
+    """Calcula el SHA-256 del contenido de un archivo, leyéndolo por bloques."""
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _ruta_relativa(filepath):
+    """Guarda las rutas relativas a la raíz del proyecto para que el manifiesto sea portable."""
+    return os.path.relpath(os.path.abspath(filepath), BASE_DIR)
+
+
+def _hashes(archivos):
+    """Devuelve {ruta_relativa: hash} o None si alguno de los archivos no existe."""
+    hashes = {}
+    for archivo in archivos:
+        if not os.path.exists(archivo):
+            return None
+        hashes[_ruta_relativa(archivo)] = hash_archivo(archivo)
+    return hashes
+
+
+@contextlib.contextmanager
+def _bloqueo(manifiesto_path):
+    """Bloquea el manifiesto mientras se lee y reescribe, por si corren varios procesos."""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(manifiesto_path), exist_ok=True)
+    with open(manifiesto_path + '.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def cargar_manifiesto(manifiesto_path=MANIFIESTO_PATH):
+    """Lee el manifiesto. Si no existe o está dañado, devuelve uno vacío."""
+    try:
+        with open(manifiesto_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'pasos': {}}
+
+
+def _guardar_manifiesto(manifiesto, manifiesto_path):
+    """Escribe el manifiesto en un archivo temporal y lo renombra, para no dejarlo a medias."""
+    os.makedirs(os.path.dirname(manifiesto_path), exist_ok=True)
+    temporal = manifiesto_path + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(temporal, manifiesto_path)
+
+
+def _tablas_existen(db_filepath, tablas):
+    """Verifica que las tablas registradas sigan existiendo en la base de datos."""
+    if not os.path.exists(db_filepath):
+        return False
+    conn = conectar(db_filepath)
+    try:
+        placeholders = ', '.join(['?'] * len(tablas))
+        cursor = conn.execute(
+            f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})", list(tablas)
+        )
+        return cursor.fetchone()[0] == len(set(tablas))
+    finally:
+        conn.close()
+
+
+def clave_limpieza(salida):
+    """Clave del paso de limpieza que genera el archivo `salida`."""
+    return f"limpieza:{_ruta_relativa(salida)}"
+
+
+def clave_importacion(tabla, csv_filepath):
+    """Clave del paso que importa `csv_filepath` a la tabla `tabla`."""
+    return f"importacion:{tabla}:{_ruta_relativa(csv_filepath)}"
+
+
+def esta_actualizado(clave, entradas, salidas=(), parametros=None, db_filepath=None, manifiesto_path=MANIFIESTO_PATH):
+    """
+    Indica si un paso ya se ejecutó con exactamente las mismas entradas y parámetros,
+    y sus salidas (archivos y tablas) siguen intactas.
+
+    Args:
+        clave (str): Identificador del paso, ej: 'limpieza:data/procesados/planes.csv'.
+        entradas (list[str]): Archivos que lee el paso.
+        salidas (list[str]): Archivos que genera el paso.
+        parametros (dict, optional): Parámetros que cambian el resultado (año, período...).
+        db_filepath (str, optional): Base de datos donde deben existir las tablas registradas.
+    """
+    paso = cargar_manifiesto(manifiesto_path)['pasos'].get(clave)
+    if paso is None:
+        return False
+    if paso.get('parametros') != (parametros or {}):
+        return False
+    if _hashes(entradas) != paso.get('entradas'):
+        return False
+    if salidas and _hashes(salidas) != paso.get('salidas'):
+        return False
+    if db_filepath and paso.get('tablas') and not _tablas_existen(db_filepath, paso['tablas']):
+        return False
+    return True
+
+
+def registrar(clave, entradas, salidas=(), tablas=(), parametros=None, manifiesto_path=MANIFIESTO_PATH):
+    """Registra en el manifiesto un paso ejecutado con éxito."""
+    paso = {
+        'entradas': _hashes(entradas) or {},
+        'salidas': _hashes(salidas) or {},
+        'tablas': sorted(tablas),
+        'parametros': parametros or {},
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+    }
+    with _bloqueo(manifiesto_path):
+        manifiesto = cargar_manifiesto(manifiesto_path)
+        manifiesto['pasos'][clave] = paso
+        _guardar_manifiesto(manifiesto, manifiesto_path)
+
+
+def ejecutar_si_hay_cambios(clave, funcion, *args, entradas, salidas=(), tablas=(), parametros=None,
+                            db_filepath=None, forzar=False):
+    """
+    Ejecuta `funcion(*args)` solo si cambiaron las entradas del paso (o si `forzar` es
+    True), y lo registra en el manifiesto si terminó bien (resultado distinto de None/False).
+
+    Returns:
+        El resultado de la función, o None si el paso se omitió.
+    """
+    if not forzar and esta_actualizado(clave, entradas, salidas, parametros, db_filepath):
+        print(f"-> Sin cambios en {', '.join(_ruta_relativa(e) for e in entradas)}: se omite '{clave}'. Use --force para reprocesar.")
+        return None
+
+    resultado = funcion(*args)
+    if resultado is not None and resultado is not False:
+        registrar(clave, entradas, salidas, tablas, parametros)
+    return resultado
@@ -0,0 +1,98 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+# Pipeline de limpieza e importación en el mismo proceso: el DataFrame que devuelve el
+# limpiador se pasa en lotes directamente al camino de inserción del importador, sin
+# lanzar intérpretes nuevos ni escribir y volver a leer el CSV procesado.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from limpiadores.limpiador_inscripciones_carreras import limpiar_inscripciones_carreras
+from limpiadores.limpiador_preinscriptos import limpiar_preinscriptos
+from db_scripts.importador_inscripciones_carreras import cargar_inscripciones_carreras
+from db_scripts.importador_preinscriptos import cargar_preinscriptos
+from utils.lotes import iterar_lotes
+from utils.validacion import validar, hay_errores
+
+DB_PATH = os.path.join(BASE_DIR, 'data', 'base_de_datos', 'academica.db')
+PROCESSED_DATA_DIR = os.path.join(BASE_DIR, 'data', 'procesados')
+
+PIPELINES = {
+    'carreras': {
+        'limpiar': limpiar_inscripciones_carreras,
+        'cargar': lambda columnas, lotes, anio, db, origen: cargar_inscripciones_carreras(columnas, lotes, db, origen),
+        'tabla': 'inscripciones_carreras',
+        'dataset': 'inscripciones_carreras',
+        'salida': 'inscripciones_carreras_procesado_{anio}.csv',
+    },
+    'preinscriptos': {
+        'limpiar': limpiar_preinscriptos,
+        'cargar': lambda columnas, lotes, anio, db, origen: cargar_preinscriptos(columnas, lotes, int(anio), db, origen),
+        'tabla': 'preinscriptos',
+        'dataset': 'preinscriptos',
+        'salida': 'preinscriptos_procesado_{anio}.csv',
+    },
+}
+
+
+def ruta_csv_procesado(tipo, anio):
+    """Ruta del CSV procesado que genera el pipeline si se pide guardarlo."""
+    return os.path.join(PROCESSED_DATA_DIR, PIPELINES[tipo]['salida'].format(anio=anio))
+
+
+def ejecutar_pipeline(tipo, archivo_entrada, anio, guardar_csv=True, db_filepath=DB_PATH, log=None):
+    """
+    Limpia un reporte y lo importa a la base de datos en el mismo proceso.
+
+    Args:
+        tipo (str): Clave de PIPELINES ('carreras' o 'preinscriptos').
+        archivo_entrada (str): Excel crudo a procesar.
+        anio (int): Año de los datos.
+        guardar_csv (bool): Si es True, también deja el CSV procesado en data/procesados/.
+        db_filepath (str): Ruta a la base de datos SQLite.
+        log (callable, optional): Recibe (etapa, texto) con la salida de cada etapa, por
+            ejemplo para mostrarla en Streamlit. Si no se indica, la salida se imprime.
+
+    Returns:
+        dict: 'ok', 'filas', 'csv' (ruta o None), 'segundos' por etapa y 'validacion'
+        (el reporte del control de calidad, o None si no se llegó a correr).
+    """
+    config = PIPELINES[tipo]
+    csv_salida = ruta_csv_procesado(tipo, anio) if guardar_csv else None
+    resultado = {'ok': False, 'filas': 0, 'csv': csv_salida, 'segundos': {}, 'validacion': None}
+
+    def correr(etapa, funcion, *args):
+        salida = io.StringIO()
+        inicio = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(salida), contextlib.redirect_stderr(salida):
+                valor = funcion(*args)
+        except Exception as e:
+            print(f"Error inesperado: {e}", file=salida)
+            valor = None
+        resultado['segundos'][etapa] = round(time.perf_counter() - inicio, 2)
+        (log or (lambda _etapa, texto: print(texto, end='')))(etapa, salida.getvalue())
+        return valor
+
+    df = correr('limpieza', config['limpiar'], archivo_entrada, csv_salida, anio)
+    if df is None:
+        return resultado
+    resultado['filas'] = len(df)
+
+    # Control de calidad: los errores bloquean la importación.
+    reporte = correr('validacion', validar, df, config['dataset'])
+    if reporte is None:
+        return resultado
+    resultado['validacion'] = reporte
+    if hay_errores(reporte):
+        return resultado
+
+    # Los valores se insertan con sus tipos; los vacíos quedan como NULL.
+    ok = correr('importacion', config['cargar'], list(df.columns), iterar_lotes(df, como_texto=False), anio, db_filepath,
+               os.path.basename(archivo_entrada))
+    resultado['ok'] = bool(ok)
+    return resultado
@@ -0,0 +1,80 @@
+import pandas as pd
+
+from utils.text_utils import to_snake_case
+
+# Los reportes exportados por el sistema de gestión académica tienen una estructura
+# jerárquica: una fila de encabezado de carrera "(CODIGO) Nombre", una fila con los
+# títulos de las columnas y luego las filas de datos de esa carrera. Este módulo
+# reemplaza los recorridos fila por fila (`iterrows`) de los limpiadores por
+# operaciones vectorizadas sobre columnas completas.
+
+PATRON_CODIGO_CARRERA = r'\((.*?)\)'
+
+
+def columna_texto(df_raw, posicion):
+    """
+    Devuelve la columna en la posición indicada convertida a texto, con el mismo
+    resultado que aplicar `str()` celda por celda (las celdas vacías quedan como 'nan').
+    """
+    return df_raw.iloc[:, posicion].astype(str)
+
+
+def extraer_codigos_carrera(df_raw):
+    """
+    Extrae el primer texto entre paréntesis de la primera columna de cada fila.
+    Las filas sin paréntesis quedan como NaN.
+    """
+    return columna_texto(df_raw, 0).str.extract(PATRON_CODIGO_CARRERA, expand=False)
+
+
+def propagar_carrera(filas_carrera, valores):
+    """
+    Propaga hacia abajo el valor de cada encabezado de carrera, de modo que cada fila
+    quede asociada a la última carrera detectada por encima de ella.
+    """
+    # Si no hay ninguna carrera, evitamos que pandas convierta la serie vacía a float.
+    with pd.option_context('future.no_silent_downcasting', True):
+        return valores.where(filas_carrera).ffill()
+
+
+def extraer_filas(df_raw, filas_datos, columnas):
+    """
+    Construye en bloque el DataFrame de salida a partir de las filas de datos.
+
+    Args:
+        df_raw (pd.DataFrame): Reporte leído con `header=None`.
+        filas_datos (pd.Series): Máscara booleana con las filas de datos.
+        columnas (dict): Mapeo {nombre_de_columna: posición_en_el_reporte}.
+
+    Returns:
+        pd.DataFrame: Las filas seleccionadas con los tipos inferidos como lo hacía
+        la construcción a partir de una lista de diccionarios. Conserva el índice del
+        reporte, por lo que se le pueden asignar directamente series como la carrera.
+    """
+    datos = df_raw.loc[filas_datos].iloc[:, list(columnas.values())]
+    datos.columns = list(columnas.keys())
+    return datos.infer_objects()
+
+
+def extraer_filas_con_encabezados(df_raw, filas_encabezado, filas_datos, normalizar=to_snake_case):
+    """
+    Extrae las filas de datos usando como nombres de columna los de la última fila de
+    encabezados que las precede. Cada encabezado toma solo sus celdas no vacías, que
+    se asignan posicionalmente a las primeras columnas del reporte.
+
+    Returns:
+        pd.DataFrame: Las filas de datos de todos los bloques, en el orden original y
+        con el índice del reporte.
+    """
+    segmento = pd.Series(df_raw.index.where(filas_encabezado), index=df_raw.index).ffill()
+    filas_datos = filas_datos & segmento.notna()
+    if not filas_datos.any():
+        return pd.DataFrame()
+
+    bloques = []
+    for inicio, filas in segmento[filas_datos].groupby(segmento[filas_datos], sort=False):
+        encabezados = [normalizar(str(h)) for h in df_raw.loc[int(inicio)] if pd.notna(h)]
+        bloque = df_raw.loc[filas.index].iloc[:, :len(encabezados)]
+        bloque.columns = encabezados
+        bloques.append(bloque)
+    return pd.concat(bloques, sort=False).infer_objects()
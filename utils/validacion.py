@@ -0,0 +1,222 @@
+import datetime
+import os
+import sqlite3
+
+import pandas as pd
+
+from utils.fechas import normalizar_fechas
+from utils.conexion import conectar
+
+# Control de calidad de los datos limpios antes de importarlos. Cada dataset (las
+# mismas claves que ESQUEMAS en utils/intercambio.py) declara sus reglas; todas se
+# evalúan con operaciones vectorizadas sobre columnas completas, así que el control
+# tarda milisegundos y se puede correr en cada carga desde el cargador de Streamlit.
+#
+# Tipos de regla:
+#   'unica':    las `columnas` (la llave primaria de la tabla) no se repiten.
+#   'carrera':  los códigos de `columna` existen en carreras.csv / propuestas. Con
+#               `patron`, el código se extrae del texto (ej: '(CP-CCCP-PC) CONTADOR').
+#   'fecha':    los valores de `columna` se pueden interpretar (con `formato` o detectándolo)
+#               y caen entre `desde` y `hasta`.
+#   'rango':    los valores numéricos de `columna` caen entre `minimo` y `maximo`.
+#   'nulos':    la proporción de vacíos de `columna` no supera `maximo`.
+# Las reglas con severidad 'error' bloquean la importación; las 'advertencia' solo se informan.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CARRERAS_FILE = os.path.join(BASE_DIR, 'data', 'procesados', 'carreras.csv')
+DB_PATH = os.path.join(BASE_DIR, 'data', 'base_de_datos', 'academica.db')
+
+FECHA_MINIMA = '1990-01-01'
+ANIO_MINIMO = 1990
+# Se admiten fechas y años hasta el año próximo (inscripciones anticipadas).
+ANIO_MAXIMO = datetime.date.today().year + 1
+FECHA_MAXIMA = f'{ANIO_MAXIMO}-12-31'
+
+# Cantidad de valores de ejemplo que se muestran por regla incumplida.
+EJEMPLOS = 3
+
+REGLAS = {
+    'inscripciones_carreras': [
+        {'tipo': 'nulos', 'columna': 'n_documento', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'nulos', 'columna': 'carrera', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'nulos', 'columna': 'anio', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'rango', 'columna': 'anio', 'minimo': ANIO_MINIMO, 'maximo': ANIO_MAXIMO, 'severidad': 'error'},
+        {'tipo': 'carrera', 'columna': 'carrera', 'severidad': 'error'},
+        {'tipo': 'fecha', 'columna': 'fecha_insc', 'formato': '%Y-%m-%d', 'severidad': 'error'},
+        {'tipo': 'fecha', 'columna': 'fecha_ingreso', 'formato': '%Y-%m-%d', 'severidad': 'error'},
+        # Una repetición dentro del archivo actualiza la fila anterior: conviene saberlo.
+        {'tipo': 'unica', 'columnas': ['n_documento', 'carrera'], 'severidad': 'advertencia'},
+        {'tipo': 'nulos', 'columna': 'fecha_insc', 'maximo': 0.05, 'severidad': 'advertencia'},
+    ],
+    'preinscriptos': [
+        {'tipo': 'nulos', 'columna': 'identificacion', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'nulos', 'columna': 'carrera', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'nulos', 'columna': 'anio', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'rango', 'columna': 'anio', 'minimo': ANIO_MINIMO, 'maximo': ANIO_MAXIMO, 'severidad': 'error'},
+        {'tipo': 'carrera', 'columna': 'carrera', 'severidad': 'error'},
+        {'tipo': 'unica', 'columnas': ['identificacion', 'carrera'], 'severidad': 'error'},
+        {'tipo': 'nulos', 'columna': 'estado', 'maximo': 0.05, 'severidad': 'advertencia'},
+    ],
+    'inscripciones_cursadas': [
+        {'tipo': 'nulos', 'columna': 'Identificación', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'nulos', 'columna': 'Carrera', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'nulos', 'columna': 'Período', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'carrera', 'columna': 'Carrera', 'severidad': 'error'},
+        {'tipo': 'fecha', 'columna': 'Fecha inscripción', 'severidad': 'error'},
+        # De las repeticiones queda la última (se actualiza la fila con cada una).
+        {'tipo': 'unica', 'columnas': ['Identificación', 'Comisión', 'Carrera', 'Período'], 'severidad': 'advertencia'},
+    ],
+    'estudiantes': [
+        {'tipo': 'nulos', 'columna': 'tipo_y_n_documento', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'nulos', 'columna': 'carrera', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'carrera', 'columna': 'carrera', 'patron': r'^\(([^)]+)\)', 'severidad': 'error'},
+        # 0 es el valor que usa el limpiador cuando el reporte no trae el año.
+        {'tipo': 'rango', 'columna': 'ano_ingreso', 'minimo': 0, 'maximo': ANIO_MAXIMO, 'severidad': 'error'},
+        {'tipo': 'fecha', 'columna': 'fecha_ingreso', 'formato': '%d/%m/%Y', 'severidad': 'error'},
+        {'tipo': 'rango', 'columna': 'prom_con_aplazos', 'minimo': 0, 'maximo': 10, 'severidad': 'error'},
+        {'tipo': 'rango', 'columna': 'prom_sin_aplazos', 'minimo': 0, 'maximo': 10, 'severidad': 'error'},
+        {'tipo': 'unica', 'columnas': ['tipo_y_n_documento', 'carrera'], 'severidad': 'advertencia'},
+        {'tipo': 'nulos', 'columna': 'fecha_ingreso', 'maximo': 0.2, 'severidad': 'advertencia'},
+    ],
+    'inscripciones_posgrado': [
+        {'tipo': 'nulos', 'columna': 'Identificación', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'nulos', 'columna': 'Carrera', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'nulos', 'columna': 'Período', 'maximo': 0.0, 'severidad': 'error'},
+        {'tipo': 'fecha', 'columna': 'Fecha inscripción', 'severidad': 'error'},
+        # carreras.csv solo tiene parte de las carreras de posgrado.
+        {'tipo': 'carrera', 'columna': 'Carrera', 'severidad': 'advertencia'},
+        {'tipo': 'unica', 'columnas': ['Identificación', 'Actividad', 'Comisión', 'Carrera', 'Período'], 'severidad': 'advertencia'},
+    ],
+    'docu_inscripciones': [
+        # El importador descarta las respuestas sin marca temporal válida.
+        {'tipo': 'fecha', 'columna': 'marca_temporal', 'formato': '%d/%m/%Y %H:%M:%S', 'severidad': 'advertencia'},
+        {'tipo': 'nulos', 'columna': 'dni', 'maximo': 0.0, 'severidad': 'advertencia'},
+    ],
+}
+
+
+def codigos_carrera(carreras_file=CARRERAS_FILE, db_filepath=DB_PATH):
+    """
+    Códigos de carrera válidos: los de carreras.csv o, si no está, los de la tabla
+    propuestas. Devuelve None si no hay ninguna de las dos fuentes.
+    """
+    if os.path.exists(carreras_file):
+        return set(pd.read_csv(carreras_file, encoding='utf-8', usecols=['Codigo'])['Codigo'].astype(str).str.strip())
+    if os.path.exists(db_filepath):
+        try:
+            with conectar(db_filepath) as conn:
+                return {str(fila[0]).strip() for fila in conn.execute("SELECT codigo FROM propuestas")}
+        except sqlite3.Error:
+            return None
+    return None
+
+
+def _ejemplos(valores):
+    return ', '.join(str(v) for v in pd.unique(valores)[:EJEMPLOS])
+
+
+def _unica(df, regla, codigos):
+    repetidas = df.duplicated(regla['columnas'], keep=False)
+    claves = df.loc[repetidas, regla['columnas']].astype(str).agg(' | '.join, axis=1)
+    return f"llave única ({', '.join(regla['columnas'])})", repetidas, claves
+
+
+def _carrera(df, regla, codigos):
+    valores = df[regla['columna']]
+    presentes = valores.notna()
+    texto = valores[presentes].astype(str).str.strip()
+    if 'patron' in regla:
+        texto = texto.str.extract(regla['patron'], expand=False)
+    invalidas = pd.Series(False, index=df.index)
+    invalidas[presentes] = ~texto.isin(codigos).to_numpy()
+    return f"carrera existente ({regla['columna']})", invalidas, valores[invalidas]
+
+
+def _fecha(df, regla, codigos):
+    valores = df[regla['columna']]
+    fechas = normalizar_fechas(valores, formato=regla.get('formato'))
+    desde, hasta = regla.get('desde', FECHA_MINIMA), regla.get('hasta', FECHA_MAXIMA)
+    # Las fechas normalizadas son textos ISO: se comparan como texto.
+    invalidas = valores.notna() & (fechas.isna() | (fechas < desde) | (fechas > hasta))
+    return f"fecha válida entre {desde} y {hasta} ({regla['columna']})", invalidas, valores[invalidas]
+
+
+def _rango(df, regla, codigos):
+    valores = df[regla['columna']]
+    numeros = pd.to_numeric(valores, errors='coerce')
+    invalidas = valores.notna() & ~numeros.between(regla['minimo'], regla['maximo'])
+    return f"valor entre {regla['minimo']} y {regla['maximo']} ({regla['columna']})", invalidas, valores[invalidas]
+
+
+def _nulos(df, regla, codigos):
+    vacias = df[regla['columna']].isna()
+    proporcion = vacias.mean() if len(df) else 0.0
+    descripcion = f"vacíos como máximo {regla['maximo']:.0%} ({regla['columna']})"
+    cantidad = int(vacias.sum())
+    if proporcion <= regla['maximo']:
+        vacias = pd.Series(False, index=df.index)
+    return descripcion, vacias, pd.Series([f"{cantidad} de {len(df)} vacíos"])
+
+
+VALIDADORES = {'unica': _unica, 'carrera': _carrera, 'fecha': _fecha, 'rango': _rango, 'nulos': _nulos}
+
+
+def validar(df, dataset, codigos=None):
+    """
+    Evalúa las reglas del dataset sobre los datos limpios.
+
+    Args:
+        df (pd.DataFrame): Datos con las columnas del esquema del dataset.
+        dataset (str): Clave de REGLAS.
+        codigos (set, optional): Códigos de carrera válidos. Por defecto, `codigos_carrera()`.
+
+    Returns:
+        pd.DataFrame: Una fila por regla incumplida con 'severidad', 'regla', 'filas' y
+        'ejemplos'. Vacío si los datos cumplen todas las reglas.
+    """
+    reglas = REGLAS.get(dataset, [])
+    if codigos is None and any(r['tipo'] == 'carrera' for r in reglas):
+        codigos = codigos_carrera()
+
+    violaciones = []
+    for regla in reglas:
+        columnas = regla.get('columnas', [regla.get('columna')])
+        faltantes = [c for c in columnas if c not in df.columns]
+        if faltantes:
+            violaciones.append({'severidad': regla['severidad'], 'regla': f"columnas presentes ({', '.join(faltantes)})",
+                                'filas': len(df), 'ejemplos': ''})
+            continue
+        if regla['tipo'] == 'carrera' and codigos is None:
+            violaciones.append({'severidad': 'advertencia', 'regla': f"carrera existente ({regla['columna']})",
+                                'filas': 0, 'ejemplos': 'no se encontró carreras.csv ni la tabla propuestas'})
+            continue
+
+        descripcion, incumplen, ejemplos = VALIDADORES[regla['tipo']](df, regla, codigos)
+        if incumplen.any():
+            violaciones.append({'severidad': regla['severidad'], 'regla': descripcion,
+                                'filas': int(incumplen.sum()), 'ejemplos': _ejemplos(ejemplos)})
+
+    return pd.DataFrame(violaciones, columns=['severidad', 'regla', 'filas', 'ejemplos'])
+
+
+def hay_errores(reporte):
+    """Indica si el reporte de `validar` tiene reglas que bloquean la importación."""
+    return bool((reporte['severidad'] == 'error').any())
+
+
+def aprobar_importacion(df, dataset):
+    """
+    Valida los datos, imprime el reporte de violaciones y devuelve False si hay
+    errores que bloquean la importación.
+    """
+    reporte = validar(df, dataset)
+    if reporte.empty:
+        print(f"-> Control de calidad: los {len(df)} registros cumplen todas las reglas de '{dataset}'.")
+        return True
+
+    print(f"-> Control de calidad de '{dataset}':")
+    print(reporte.to_string(index=False))
+    if hay_errores(reporte):
+        print("Error: Los datos no pasaron el control de calidad. No se importará nada.")
+        return False
+    return True
@@ -0,0 +1,294 @@
+import datetime
+import json
+import os
+import sqlite3
+
+from utils.archivo import SUFIJO_ARCHIVO, adjuntar_archivo, ruta_archivo
+from utils.conexion import conectar, TIMEOUT_LECTURA
+
+# Versiones publicadas de academica.db para el dashboard (despliegue azul/verde). Los
+# importadores siguen escribiendo en academica.db, que pasa a ser la base de trabajo; el
+# dashboard lee la última versión publicada, una copia que nadie modifica:
+#
+#   1. `crear_version` copia la base de trabajo con VACUUM INTO (una foto consistente
+#      aunque haya una importación en curso) a data/base_de_datos/versiones/.
+#   2. `validar_version` revisa la integridad de la copia y que las tablas del dashboard
+#      tengan datos y no hayan perdido la mayoría de sus filas.
+#   3. `publicar` reemplaza el puntero (versiones/actual.json) con un renombre atómico.
+#
+# Cada worker del dashboard relee el puntero antes de cada pedido (`actualizar_version`)
+# y las conexiones siguientes se abren sobre la versión nueva, así que un pedido nunca
+# mezcla dos versiones. Volver atrás es mover el puntero a la versión anterior
+# (`revertir`). Mientras no exista el puntero, todo sigue leyendo academica.db.
+#
+# Si la base tiene años archivados (utils/archivo.py), cada versión lleva su copia del
+# archivo al lado (academica-<fecha>_archivo.db), y las filas se cuentan con el archivo.
+
+DIRECTORIO_VERSIONES = 'versiones'
+PUNTERO = 'actual.json'
+
+# Versiones que se conservan (la publicada y las anteriores para volver atrás).
+VERSIONES_CONSERVADAS = 3
+
+# Tablas que tiene que tener con datos una versión para publicarse.
+TABLAS_REQUERIDAS = ['propuestas', 'anio_academico', 'estudiantes', 'egresados', 'inscripciones_cursadas']
+
+# Fracción máxima de filas que una tabla puede perder respecto de la versión publicada.
+CAIDA_MAXIMA = 0.5
+
+
+def directorio_versiones(db_path):
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), DIRECTORIO_VERSIONES)
+
+
+def ruta_puntero(db_path):
+    return os.path.join(directorio_versiones(db_path), PUNTERO)
+
+
+def leer_puntero(db_path):
+    """Contenido del puntero ('version', 'anterior', 'publicado'), o None si no se publicó ninguna."""
+    try:
+        with open(ruta_puntero(db_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def listar_versiones(db_path):
+    """Nombres de los archivos de versión, del más viejo al más nuevo."""
+    directorio = directorio_versiones(db_path)
+    if not os.path.isdir(directorio):
+        return []
+    prefijo = os.path.splitext(os.path.basename(db_path))[0] + '-'
+    return sorted(nombre for nombre in os.listdir(directorio)
+                  if nombre.startswith(prefijo) and nombre.endswith('.db') and not nombre.endswith(f'{SUFIJO_ARCHIVO}.db'))
+
+
+def contar_filas(db_path, tablas):
+    """Filas de cada tabla, con las archivadas (None si no existe)."""
+    conn = conectar(db_path, TIMEOUT_LECTURA)
+    try:
+        adjuntar_archivo(conn, db_path)
+        conteos = {}
+        for tabla in tablas:
+            try:
+                conteos[tabla] = conn.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+            except sqlite3.OperationalError:
+                conteos[tabla] = None
+        return conteos
+    finally:
+        conn.close()
+
+
+def _copiar(origen, destino):
+    """Copia una base con VACUUM INTO a un temporal, la pasa a modo WAL y la renombra."""
+    temporal = f"{destino}.{os.getpid()}.tmp"
+    try:
+        conn = conectar(origen)
+        try:
+            conn.execute("VACUUM INTO ?", (temporal,))
+        finally:
+            conn.close()
+        copia = sqlite3.connect(temporal)
+        try:
+            copia.execute("PRAGMA journal_mode = WAL")
+        finally:
+            copia.close()
+        os.replace(temporal, destino)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def crear_version(db_path):
+    """
+    Copia la base de trabajo (y su archivo de años cerrados, si tiene) a un archivo de
+    versión nuevo con VACUUM INTO. La copia queda compactada y en modo WAL, como la base
+    original.
+
+    Returns:
+        str: Ruta de la versión creada.
+    """
+    directorio = directorio_versiones(db_path)
+    os.makedirs(directorio, exist_ok=True)
+    nombre = f"{os.path.splitext(os.path.basename(db_path))[0]}-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.db"
+    destino = os.path.join(directorio, nombre)
+    # El archivo va primero: una versión nunca queda publicada sin su archivo.
+    if os.path.exists(ruta_archivo(db_path)):
+        _copiar(ruta_archivo(db_path), ruta_archivo(destino))
+    _copiar(db_path, destino)
+    return destino
+
+
+def borrar_version(ruta):
+    """Borra el archivo de una versión y el de su archivo de años cerrados."""
+    for base in (ruta, ruta_archivo(ruta)):
+        for sufijo in ('', '-wal', '-shm'):
+            if os.path.exists(base + sufijo):
+                os.remove(base + sufijo)
+
+
+def validar_version(ruta, db_path):
+    """
+    Revisa una versión antes de publicarla: PRAGMA integrity_check, que las tablas de
+    TABLAS_REQUERIDAS existan y tengan filas, y que ninguna haya perdido más de
+    CAIDA_MAXIMA de las filas de la versión publicada.
+
+    Returns:
+        list[str]: Los problemas encontrados (vacía si la versión se puede publicar).
+    """
+    problemas = []
+    for base in (ruta, ruta_archivo(ruta)):
+        if not os.path.exists(base):
+            continue
+        conn = conectar(base, TIMEOUT_LECTURA)
+        try:
+            resultado = [fila[0] for fila in conn.execute("PRAGMA integrity_check").fetchall()]
+        finally:
+            conn.close()
+        if resultado != ['ok']:
+            problemas.append(f"integrity_check de {os.path.basename(base)}: {'; '.join(resultado[:5])}")
+
+    conteos = contar_filas(ruta, TABLAS_REQUERIDAS)
+    publicada = ruta_publicada(db_path)
+    anteriores = contar_filas(publicada, TABLAS_REQUERIDAS) if publicada else {}
+    for tabla, filas in conteos.items():
+        if filas is None:
+            problemas.append(f"falta la tabla '{tabla}'")
+        elif filas == 0:
+            problemas.append(f"la tabla '{tabla}' está vacía")
+        elif anteriores.get(tabla) and filas < anteriores[tabla] * (1 - CAIDA_MAXIMA):
+            problemas.append(f"la tabla '{tabla}' pasó de {anteriores[tabla]} a {filas} filas")
+    return problemas
+
+
+def _escribir_puntero(db_path, version, anterior):
+    """Escribe el puntero en un temporal y lo renombra: los lectores ven el viejo o el nuevo."""
+    puntero = ruta_puntero(db_path)
+    temporal = f"{puntero}.{os.getpid()}.tmp"
+    contenido = {
+        'version': version,
+        'anterior': anterior,
+        'publicado': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(contenido, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, puntero)
+
+
+def publicar(db_path, version):
+    """Apunta el puntero a `version` (nombre de archivo en el directorio de versiones)."""
+    if not os.path.exists(os.path.join(directorio_versiones(db_path), version)):
+        raise FileNotFoundError(f"No existe la versión '{version}'.")
+    actual = leer_puntero(db_path)
+    anterior = actual['version'] if actual and actual['version'] != version else (actual or {}).get('anterior')
+    _escribir_puntero(db_path, version, anterior)
+
+
+def revertir(db_path):
+    """
+    Vuelve a publicar la versión anterior a la actual (revertir dos veces deja todo
+    como estaba).
+
+    Returns:
+        str | None: La versión publicada, o None si no hay una anterior.
+    """
+    actual = leer_puntero(db_path)
+    if not actual or not actual.get('anterior'):
+        return None
+    publicar(db_path, actual['anterior'])
+    return actual['anterior']
+
+
+def limpiar_versiones(db_path, conservar=VERSIONES_CONSERVADAS):
+    """
+    Borra las versiones más viejas, sin tocar la publicada ni la anterior. Un worker
+    que todavía tenga abierta una versión borrada la sigue leyendo hasta cerrarla.
+
+    Returns:
+        list[str]: Las versiones borradas.
+    """
+    puntero = leer_puntero(db_path) or {}
+    protegidas = {puntero.get('version'), puntero.get('anterior')}
+    versiones = listar_versiones(db_path)
+    borradas = [nombre for nombre in versiones[:-conservar] if nombre not in protegidas]
+    for nombre in borradas:
+        borrar_version(os.path.join(directorio_versiones(db_path), nombre))
+    return borradas
+
+
+def publicar_version(db_path):
+    """
+    Crea una versión de la base de trabajo, la valida y, si está bien, la publica.
+
+    Returns:
+        str | None: La versión publicada, o None si no pasó la validación o hubo un error.
+    """
+    print(f"Creando una versión de '{db_path}' para el dashboard...")
+    try:
+        ruta = crear_version(db_path)
+    except Exception as e:
+        print(f"Ocurrió un error al copiar la base de datos: {e}")
+        return None
+    version = os.path.basename(ruta)
+    print(f"-> Copia creada: {version} ({os.path.getsize(ruta) / 1e6:.1f} MB).")
+
+    try:
+        problemas = validar_version(ruta, db_path)
+    except Exception as e:
+        problemas = [str(e)]
+    if problemas:
+        print(f"Error: La versión no se publica: {'; '.join(problemas)}.")
+        borrar_version(ruta)
+        return None
+
+    publicar(db_path, version)
+    print(f"-> Versión {version} publicada.")
+    borradas = limpiar_versiones(db_path)
+    if borradas:
+        print(f"-> Versiones viejas borradas: {', '.join(borradas)}.")
+    return version
+
+
+# --- Lectura desde el dashboard ---
+
+# Versión que usa este proceso para cada base de trabajo: db_path -> (mtime del puntero, ruta).
+_versiones_en_uso = {}
+
+
+def ruta_publicada(db_path):
+    """Ruta de la versión publicada según el puntero, o None si no hay una publicada."""
+    puntero = leer_puntero(db_path)
+    if not puntero:
+        return None
+    ruta = os.path.join(directorio_versiones(db_path), puntero['version'])
+    return ruta if os.path.exists(ruta) else None
+
+
+def actualizar_version(db_path):
+    """
+    Relee el puntero si cambió desde la última vez (un stat por llamada). El dashboard
+    lo llama antes de cada pedido, así que la versión nunca cambia en medio de uno.
+
+    Returns:
+        str: La ruta que tienen que abrir las conexiones de lectura.
+    """
+    db_path = os.path.abspath(db_path)
+    try:
+        modificado = os.stat(ruta_puntero(db_path)).st_mtime_ns
+    except FileNotFoundError:
+        modificado = None
+    en_uso = _versiones_en_uso.get(db_path)
+    if en_uso and en_uso[0] == modificado:
+        return en_uso[1]
+    ruta = (ruta_publicada(db_path) if modificado else None) or db_path
+    if en_uso and en_uso[1] != ruta:
+        print(f"-> Versión de la base de datos: {os.path.basename(ruta)} (proceso {os.getpid()}).")
+    _versiones_en_uso[db_path] = (modificado, ruta)
+    return ruta
+
+
+def base_de_lectura(db_path):
+    """Ruta que usan las conexiones de lectura: la versión en uso, o `db_path` sin versiones publicadas."""
+    en_uso = _versiones_en_uso.get(os.path.abspath(db_path))
+    return en_uso[1] if en_uso else actualizar_version(db_path)